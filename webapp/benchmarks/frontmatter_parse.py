@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+Frontmatter parsing benchmark over the shipped template corpus.
+
+Compares the previous approach (split the whole document into lines, then
+yaml.safe_load) with FrontmatterParser, and checks both produce the same
+result for every template.
+
+Usage:
+    python benchmarks/frontmatter_parse.py [--repeat 20]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+import django
+import yaml
+
+# Setup Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bmad_forge.settings')
+django.setup()
+
+from forge.services.frontmatter import FrontmatterParser, UnsupportedSyntax
+
+TEMPLATE_ROOT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'forge', 'templates'
+)
+
+
+def split_lines_safe_load(content):
+    """The line-splitting, pure-Python YAML implementation being replaced."""
+    if not content.startswith('---'):
+        return {}, content
+    lines = content.split('\n')
+    end_index = -1
+    for i, line in enumerate(lines[1:], 1):
+        if line.strip() == '---':
+            end_index = i
+            break
+    if end_index == -1:
+        return {}, content
+    frontmatter = yaml.safe_load('\n'.join(lines[1:end_index])) or {}
+    return frontmatter, '\n'.join(lines[end_index + 1:]).strip()
+
+
+def frontmatter_parser(content):
+    split = FrontmatterParser.split(content)
+    if split is None:
+        return {}, content
+    frontmatter_text, remaining = split
+    return FrontmatterParser.load(frontmatter_text) or {}, remaining.strip()
+
+
+def time_per_document(parse, documents, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for content in documents:
+            parse(content)
+    return (time.perf_counter() - started) / (repeat * len(documents))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=20, help='Passes over the corpus')
+    args = parser.parse_args()
+
+    documents = []
+    for path in sorted(glob.glob(os.path.join(TEMPLATE_ROOT, '**', '*.md'), recursive=True)):
+        with open(path, encoding='utf-8') as f:
+            documents.append(f.read())
+
+    fast_path = 0
+    for content in documents:
+        assert frontmatter_parser(content) == split_lines_safe_load(content)
+        split = FrontmatterParser.split(content)
+        if split is not None:
+            try:
+                FrontmatterParser.parse_simple(split[0])
+                fast_path += 1
+            except UnsupportedSyntax:
+                pass
+    with_frontmatter = sum(1 for content in documents if FrontmatterParser.split(content))
+
+    baseline = time_per_document(split_lines_safe_load, documents, args.repeat)
+    current = time_per_document(frontmatter_parser, documents, args.repeat)
+    print(f'{len(documents)} documents, {with_frontmatter} with frontmatter, '
+          f'{fast_path} parsed by the fast path')
+    print(f'split lines + yaml.safe_load: {baseline * 1e6:10.1f} us/document')
+    print(f'FrontmatterParser:            {current * 1e6:10.1f} us/document')
+    print(f'speedup:                      {baseline / current:10.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+Peak memory benchmark for validating very large documents.
+
+Writes a document of the requested size to a temporary file, then validates
+it two ways: by reading the whole file and calling BMADValidator.validate(),
+and by streaming the file through BMADValidator.validate_stream(). Reports
+the peak traced allocation and wall-clock time of each, and checks that both
+produce the same report.
+
+Usage:
+    python benchmarks/streaming_validation.py [--size-mb 50]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import django
+
+# Setup Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bmad_forge.settings')
+django.setup()
+
+from forge.services.bmad_validator import BMADValidator
+from forge.services.validation_cache import ValidationCache
+
+SAMPLE_DOCUMENT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'BMAD_PRD.md'
+)
+
+HEADER = (
+    '# Generated Document\n\n'
+    '## Your Role\nYou are an experienced product manager writing a PRD.\n\n'
+    '## Input\nThe product brief and the {{PROJECT_NAME:demo}} backlog.\n\n'
+    '## Output Requirements\nReturn the PRD as markdown in the format below.\n\n'
+)
+
+
+def write_document(path, size_mb):
+    """Write the BMAD header followed by the sample document repeated to size_mb."""
+    with open(SAMPLE_DOCUMENT, encoding='utf-8') as f:
+        body = f.read()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(HEADER)
+        written = len(HEADER)
+        while written < size_mb * 1024 * 1024:
+            f.write(body)
+            written += len(body)
+
+
+def in_memory(path):
+    with open(path, encoding='utf-8') as f:
+        return BMADValidator.validate(f.read())
+
+
+def streaming(path):
+    with open(path, 'rb') as f:
+        return BMADValidator.validate_stream(f)
+
+
+def measure(handler, path):
+    """Return (report, peak bytes, seconds) for one validation."""
+    # Timed untraced, since tracing slows allocation-heavy code unevenly
+    ValidationCache.clear()
+    started = time.perf_counter()
+    report = handler(path)
+    elapsed = time.perf_counter() - started
+    ValidationCache.clear()
+    tracemalloc.start()
+    handler(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return report, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size-mb', type=int, default=50, help='Document size in megabytes')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'document.md')
+        write_document(path, args.size_mb)
+        print(f'{os.path.getsize(path) / 1024 / 1024:.1f} MB document')
+        print(f'{"method":<16}{"peak MB":>10}{"seconds":>10}')
+        reports = []
+        for name, handler in (('validate', in_memory), ('validate_stream', streaming)):
+            report, peak, seconds = measure(handler, path)
+            reports.append(report)
+            print(f'{name:<16}{peak / 1024 / 1024:>10.1f}{seconds:>10.2f}')
+        print('reports match' if reports[0] == reports[1] else 'REPORTS DIFFER')
+
+
+if __name__ == '__main__':
+    main()
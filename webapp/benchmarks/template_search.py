@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Template search latency benchmark.
+
+Creates a throwaway test database holding a catalogue of synthetic
+templates, then times one page of search results (count plus the first
+twelve rows, as the list views run them) with the substring filter the
+views used before and with TemplateSearch over the full-text index.
+
+Usage:
+    python benchmarks/template_search.py [--templates 2000] [--size-kb 40]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import django
+
+# Setup Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bmad_forge.settings')
+django.setup()
+
+from django.db import connection, models
+
+from forge.models import Template
+from forge.services.template_search import TemplateSearch
+
+WORDS = (
+    'the system shall provide a secure scalable service for users with data '
+    'format output structure api design review test deploy sprint backlog'
+).split()
+RARE_WORDS = ('authentication', 'kubernetes', 'accessibility', 'localization')
+QUERIES = ('auth', 'kubernetes deploy', 'accessibility review', 'nothingmatches')
+
+
+def build_templates(count, size_kb, seed=1):
+    rng = random.Random(seed)
+    for serial in range(count):
+        words = [rng.choice(WORDS) for _ in range(size_kb * 1024 // 7)]
+        words[rng.randrange(len(words))] = rng.choice(RARE_WORDS)
+        yield Template(
+            title=f'Template {serial}',
+            content='## Your Role\n' + ' '.join(words),
+            description=f'Synthetic template {serial}',
+            agent_role='developer',
+            workflow_phase='development',
+        )
+
+
+def substring_search(queryset, query):
+    return queryset.filter(
+        models.Q(title__icontains=query) |
+        models.Q(description__icontains=query) |
+        models.Q(content__icontains=query)
+    )
+
+
+def page(queryset):
+    """Run what a paginated list view runs: a count and the first page."""
+    return queryset.count(), list(Template.objects.catalogue(queryset)[:12])
+
+
+def timed(handler, repeat=5):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = handler()
+    return result, (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--templates', type=int, default=2000, help='Templates in the catalogue')
+    parser.add_argument('--size-kb', type=int, default=40, help='Size of each template body')
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        Template.objects.bulk_create(build_templates(args.templates, args.size_kb), batch_size=200)
+        # bulk_create bypasses the signals that maintain the index
+        backend = TemplateSearch.rebuild()
+        print(f'{args.templates} templates of {args.size_kb} KB, backend: {backend or "substring"}')
+        print(f'{"query":<24}{"matches":>9}{"icontains ms":>14}{"full-text ms":>14}')
+        active = Template.objects.filter(is_active=True)
+        for query in QUERIES:
+            (count, _), substring = timed(lambda: page(substring_search(active, query)))
+            (ranked, _), fulltext = timed(lambda: page(TemplateSearch.search(active, query)))
+            print(f'{query:<24}{f"{count}/{ranked}":>9}{substring * 1000:>14.1f}{fulltext * 1000:>14.1f}')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Memory benchmark for the wizard validation endpoints.
+
+Replays the service calls behind the real-time section validation, section
+guidance and variable validation endpoints against the bundled templates
+and reports, per request:
+
+- peak: the largest transient allocation while handling the request
+- retained: bytes still held by the result objects once the request is done
+- time: wall-clock time per request
+
+Usage:
+    python benchmarks/validation_memory.py [--iterations 200]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+import django
+
+# Setup Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bmad_forge.settings')
+django.setup()
+
+from forge.services.bmad_validator import MetadataAwareValidator
+from forge.services.document_generator import DocumentGenerator
+from forge.services.template_parser import TemplateParser
+
+TEMPLATE_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'forge', 'templates', 'templates'
+)
+
+
+def load_templates():
+    """Compile every bundled template and pair it with sample section content."""
+    cases = []
+    for filename in sorted(os.listdir(TEMPLATE_DIRECTORY)):
+        if not filename.endswith('.md'):
+            continue
+        with open(os.path.join(TEMPLATE_DIRECTORY, filename), encoding='utf-8') as f:
+            compiled = TemplateParser.compile(f.read())
+        for section in DocumentGenerator.extract_sections(compiled):
+            if section.level == 2:
+                cases.append((compiled, section.name, section.content))
+    return cases
+
+
+def realtime_validation(compiled, section_name, content):
+    return DocumentGenerator.validate_section_with_metadata(section_name, content, compiled)
+
+
+def section_guidance(compiled, section_name, content):
+    return TemplateParser.get_section_guidance(section_name)
+
+
+def variable_validation(compiled, section_name, content):
+    return [
+        MetadataAwareValidator.validate_variable(name, 'value', compiled)
+        for name in list(compiled.variable_metadata)[:3]
+    ]
+
+
+ENDPOINTS = [
+    ('validate_section_realtime', realtime_validation),
+    ('get_section_guidance', section_guidance),
+    ('validate_variable', variable_validation),
+]
+
+
+def measure(handler, cases, iterations):
+    """Return (peak bytes, retained bytes, seconds) per request for a handler."""
+    requests = [cases[i % len(cases)] for i in range(iterations)]
+    for case in cases:
+        handler(*case)  # Warm caches so only steady-state requests are measured
+
+    gc.collect()
+    tracemalloc.start()
+    peak_total = 0
+    kept = []
+    started = time.perf_counter()
+    for case in requests:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        kept.append(handler(*case))
+        peak_total += tracemalloc.get_traced_memory()[1] - before
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    count = len(requests)
+    del kept
+    return peak_total / count, retained / count, elapsed / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=200, help='Requests per endpoint')
+    args = parser.parse_args()
+
+    cases = load_templates()
+    print(f'{len(cases)} sections from {TEMPLATE_DIRECTORY}')
+    print(f'{"endpoint":<28}{"peak B/req":>12}{"retained B/req":>16}{"us/req":>10}')
+    for name, handler in ENDPOINTS:
+        peak, retained, seconds = measure(handler, cases, args.iterations)
+        print(f'{name:<28}{peak:>12.0f}{retained:>16.0f}{seconds * 1e6:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+Validation throughput benchmark for large generated documents.
+
+Builds synthetic BMAD documents of a given size (a handful of top-level
+sections followed by many detail subsections) and reports the time per
+document for each validator entry point, plus the share spent building
+the DocumentAnalysis they all evaluate their rules over.
+
+Usage:
+    python benchmarks/validation_throughput.py [--size-kb 120] [--documents 20]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import django
+
+# Setup Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bmad_forge.settings')
+django.setup()
+
+from django.conf import settings
+
+from forge.services.bmad_validator import BMADValidator, MetadataAwareValidator
+from forge.services.document_analysis import DocumentAnalysis
+from forge.services.template_parser import TemplateParser
+
+TEMPLATE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'forge', 'templates', 'agents', 'phase1.md',
+)
+
+WORDS = (
+    'the system shall provide a secure scalable service for users with data '
+    'format output structure api design review test deploy'
+).split()
+
+
+def paragraph(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def build_document(rng, size_kb, serial):
+    """Build a BMAD document of roughly size_kb kilobytes."""
+    parts = [
+        '# Generated Document\n',
+        '## Your Role\nYou are an experienced developer. ' + paragraph(rng, 30) + '\n',
+        '## Input\n' + paragraph(rng, 40) + ' {{PROJECT_NAME:demo}}\n',
+        '## Output Requirements\n' + paragraph(rng, 40) + '\n',
+        '## Context\n' + paragraph(rng, 50) + '\n',
+        '## Constraints\n' + paragraph(rng, 30) + '\n',
+    ]
+    size = sum(map(len, parts))
+    detail = 0
+    while size < size_kb * 1024:
+        detail += 1
+        bullets = '\n'.join('- ' + paragraph(rng, 12) for _ in range(8))
+        part = f'### Detail {detail}\n{bullets}\n{paragraph(rng, 80)}\n'
+        parts.append(part)
+        size += len(part)
+    # Distinct documents, so nothing is served from a per-content cache
+    parts.append(f'<!-- document {serial} -->\n')
+    return '\n'.join(parts)
+
+
+def time_per_document(handler, documents, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for content in documents:
+            handler(content)
+    return (time.perf_counter() - started) / (repeat * len(documents))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size-kb', type=int, default=120, help='Approximate document size')
+    parser.add_argument('--documents', type=int, default=20, help='Distinct documents')
+    parser.add_argument('--repeat', type=int, default=5, help='Passes over the documents')
+    args = parser.parse_args()
+
+    # Time the rules themselves, not ValidationCache hits on later passes
+    settings.VALIDATION_CACHE_ENABLED = False
+
+    rng = random.Random(0)
+    documents = [build_document(rng, args.size_kb, i) for i in range(args.documents)]
+    with open(TEMPLATE, encoding='utf-8') as f:
+        compiled = TemplateParser.compile(f.read())
+
+    handlers = [
+        ('DocumentAnalysis', DocumentAnalysis),
+        ('validate', BMADValidator.validate),
+        ('quick_validate', BMADValidator.quick_validate),
+        ('validate_for_role', lambda content: BMADValidator.validate_for_role(content, 'developer')),
+        ('validate_with_metadata',
+         lambda content: MetadataAwareValidator.validate_with_metadata(content, compiled)),
+    ]
+    print(f'{len(documents)} documents of {len(documents[0]) / 1024:.0f} KB')
+    print(f'{"entry point":<24}{"ms/document":>14}{"documents/s":>14}')
+    for name, handler in handlers:
+        seconds = time_per_document(handler, documents, args.repeat)
+        print(f'{name:<24}{seconds * 1e3:>14.3f}{1 / seconds:>14.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -153,6 +153,31 @@ BMAD_REQUIRED_SECTIONS = [
     '## Output Requirements',
 ]
 
+# Validation result cache: a process-local LRU in front of this Django cache
+VALIDATION_CACHE_ENABLED = True
+VALIDATION_CACHE_ALIAS = 'default'
+VALIDATION_CACHE_TIMEOUT = 60 * 60 * 24
+VALIDATION_CACHE_LOCAL_SIZE = 512
+
+# Seconds a risky frontmatter validation pattern may spend matching one value
+VALIDATION_PATTERN_TIMEOUT = 0.5
+
+# Sections whose real-time validation state each process keeps in memory
+SECTION_VALIDATION_LOCAL_SIZE = 512
+
+# Seconds the dashboard snapshot is cached; template and prompt changes drop it sooner
+DASHBOARD_STATS_CACHE_TIMEOUT = 60 * 10
+
+# Worker processes the sync_templates command lints the corpus with (None: CPU count);
+# syncs started from the web UI always lint in process
+TEMPLATE_LINT_WORKERS = None
+
+# Age in days after which archive_prompts moves prompts to the archive table
+PROMPT_ARCHIVE_AFTER_DAYS = 180
+
+# Cache holding the typeahead index generation stamp shared by all processes
+TYPEAHEAD_CACHE_ALIAS = 'default'
+
 # Logging configuration (base configuration, environments can extend)
 LOGGING = {
     'version': 1,
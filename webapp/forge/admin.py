@@ -3,13 +3,37 @@ Admin configuration for BMAD Forge models.
 """
 
 from django.contrib import admin
-from .models import Template, GeneratedPrompt
+from django.contrib.admin.views.main import ChangeList
+from .models import Template, TemplateHealth, GeneratedPrompt, ArchivedPrompt
+from .services.template_search import TemplateSearch
+
+
+class TemplateHealthInline(admin.StackedInline):
+    model = TemplateHealth
+    can_delete = False
+    extra = 0
+    readonly_fields = ['status', 'errors', 'warnings', 'content_hash', 'linter_version', 'checked_at']
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+class TemplateCatalogueChangeList(ChangeList):
+    """Changelist that loads only the catalogue columns of each template."""
+
+    def get_queryset(self, request, exclude_parameters=None):
+        return Template.objects.catalogue(
+            super().get_queryset(request, exclude_parameters), extra_fields=('health__status',)
+        )
 
 
 @admin.register(Template)
 class TemplateAdmin(admin.ModelAdmin):
-    list_display = ['title', 'agent_role', 'workflow_phase', 'version', 'is_active', 'created_at', 'last_updated']
-    list_filter = ['agent_role', 'workflow_phase', 'is_active', 'created_at']
+    list_display = [
+        'title', 'agent_role', 'workflow_phase', 'version', 'is_active', 'get_health_status',
+        'created_at', 'last_updated',
+    ]
+    list_filter = ['agent_role', 'workflow_phase', 'is_active', 'health__status', 'created_at']
     search_fields = ['title', 'content', 'description']
     readonly_fields = ['created_at', 'last_updated', 'variables']
     
@@ -32,13 +56,43 @@ class TemplateAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+    inlines = [TemplateHealthInline]
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('health')
+    
+    def get_changelist(self, request, **kwargs):
+        return TemplateCatalogueChangeList
+    
+    def get_search_results(self, request, queryset, search_term):
+        """Search through the full-text index instead of scanning every body."""
+        if not search_term:
+            return queryset, False
+        return TemplateSearch.search(queryset, search_term, ordered=False), False
+    
+    def get_health_status(self, obj):
+        """Show the status of the template's latest lint."""
+        health = getattr(obj, 'health', None)
+        return health.get_status_display() if health else 'Not linted'
+    
+    get_health_status.short_description = 'Health'
+    get_health_status.admin_order_field = 'health__status'
+
+
+@admin.register(TemplateHealth)
+class TemplateHealthAdmin(admin.ModelAdmin):
+    list_display = ['template', 'status', 'linter_version', 'checked_at']
+    list_filter = ['status', 'linter_version']
+    search_fields = ['template__title']
+    readonly_fields = ['template', 'status', 'errors', 'warnings', 'content_hash', 'linter_version', 'checked_at']
 
 
 @admin.register(GeneratedPrompt)
 class GeneratedPromptAdmin(admin.ModelAdmin):
     list_display = ['template', 'is_valid', 'created_at', 'get_input_summary']
     list_filter = ['is_valid', 'template__agent_role', 'created_at']
-    search_fields = ['final_output']
+    # Outputs are stored compressed, so they cannot be searched in the database
+    search_fields = ['template__title']
     readonly_fields = ['created_at', 'input_data', 'final_output', 'validation_notes', 'missing_variables']
     
     fieldsets = (
@@ -65,3 +119,22 @@ class GeneratedPromptAdmin(admin.ModelAdmin):
         return str(obj.input_data)[:50]
     
     get_input_summary.short_description = 'Input Data'
+
+
+@admin.register(ArchivedPrompt)
+class ArchivedPromptAdmin(admin.ModelAdmin):
+    list_display = ['id', 'template', 'is_valid', 'created_at', 'archived_at']
+    list_filter = ['is_valid', 'created_at']
+    search_fields = ['template__title']
+    readonly_fields = [
+        'id', 'template', 'final_output', 'input_data', 'is_valid', 'validation_notes',
+        'missing_variables', 'created_at', 'archived_at',
+    ]
+    fields = readonly_fields
+    
+    def has_add_permission(self, request):
+        # Prompts are archived by the archive_prompts command
+        return False
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('template')
@@ -0,0 +1,15 @@
+"""
+Application configuration for BMAD Forge.
+"""
+
+from django.apps import AppConfig
+
+
+class ForgeConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'forge'
+    verbose_name = 'BMAD Forge'
+
+    def ready(self):
+        # Connect the dashboard statistics signal handlers
+        from . import signals  # noqa: F401
@@ -5,6 +5,7 @@ Forms for BMAD Forge application.
 from django import forms
 from django.conf import settings
 from .models import Template, GeneratedPrompt
+from .services.keyword_matcher import KeywordMatcher
 
 
 class DynamicPromptForm(forms.Form):
@@ -12,6 +13,9 @@ class DynamicPromptForm(forms.Form):
     Dynamic form that generates fields based on template variables.
     """
     
+    # Variables whose names contain any of these get a textarea
+    LONG_VARIABLE_KEYWORDS = ('description', 'context', 'details', 'requirements', 'content', 'instructions')
+    
     def __init__(self, *args, template=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.template = template
@@ -23,8 +27,7 @@ class DynamicPromptForm(forms.Form):
                 field_name = var.lower().replace(' ', '_')
                 
                 # Determine if this should be a textarea (long content)
-                long_vars = ['description', 'context', 'details', 'requirements', 'content', 'instructions']
-                is_long = any(long_var in var.lower() for long_var in long_vars)
+                is_long = KeywordMatcher.get(self.LONG_VARIABLE_KEYWORDS).contains_any(var)
                 
                 if is_long:
                     field_class = forms.CharField(widget=forms.Textarea(attrs={
@@ -120,6 +123,14 @@ class GeneratedPromptForm(forms.ModelForm):
     Form for manually creating or editing generated prompts.
     """
     
+    # Not a model column: outputs are stored as chunks behind GeneratedPrompt.final_output
+    final_output = forms.CharField(
+        widget=forms.Textarea(attrs={
+            'class': 'form-control',
+            'rows': 10,
+        }),
+    )
+    
     class Meta:
         model = GeneratedPrompt
         fields = ['template', 'input_data', 'final_output', 'is_valid', 'validation_notes']
@@ -129,13 +140,18 @@ class GeneratedPromptForm(forms.ModelForm):
                 'class': 'form-control',
                 'rows': 4,
             }),
-            'final_output': forms.Textarea(attrs={
-                'class': 'form-control',
-                'rows': 10,
-            }),
             'is_valid': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
             'validation_notes': forms.Textarea(attrs={
                 'class': 'form-control',
                 'rows': 3,
             }),
         }
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.initial.setdefault('final_output', self.instance.final_output)
+    
+    def save(self, commit=True):
+        self.instance.final_output = self.cleaned_data['final_output']
+        return super().save(commit=commit)
@@ -0,0 +1,64 @@
+"""
+Management command to move old generated prompts into the archive table.
+
+Prompts older than PROMPT_ARCHIVE_AFTER_DAYS (or --days) are copied to
+ArchivedPrompt and deleted from GeneratedPrompt in batched transactions.
+They stay viewable at their original URLs. Run it periodically, e.g. from
+cron; an interrupted run can simply be repeated.
+
+Usage:
+    python manage.py archive_prompts
+    python manage.py archive_prompts --days 90 --batch-size 1000
+    python manage.py archive_prompts --dry-run
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from forge.models import GeneratedPrompt
+from forge.services.prompt_archive import PromptArchive
+
+
+class Command(BaseCommand):
+    help = 'Archive generated prompts older than a given age'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Archive prompts older than this many days (default: PROMPT_ARCHIVE_AFTER_DAYS)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=PromptArchive.BATCH_SIZE,
+            help=f'Prompts moved per transaction (default: {PromptArchive.BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many prompts would be archived',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+        if options['days'] is not None and options['days'] < 0:
+            raise CommandError('--days must not be negative')
+
+        before = PromptArchive.cutoff(options['days'])
+        if options['dry_run']:
+            count = GeneratedPrompt.objects.filter(created_at__lt=before).count()
+            self.stdout.write(f'{count} prompt(s) created before {before:%Y-%m-%d %H:%M} would be archived')
+            return
+
+        stats = PromptArchive.archive(
+            before,
+            batch_size=options['batch_size'],
+            progress=lambda total: self.stdout.write(f'  Archived {total} prompt(s)...'),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {stats["archived"]} prompt(s) created before {before:%Y-%m-%d %H:%M} '
+            f'in {stats["batches"]} batch(es)'
+        ))
+        if stats['deleted_chunks']:
+            self.stdout.write(f'  Deleted {stats["deleted_chunks"]} unused output chunk(s)')
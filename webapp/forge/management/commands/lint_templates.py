@@ -0,0 +1,91 @@
+"""
+Management command to lint templates and refresh their health records.
+
+Only templates whose content changed since they were last linted are
+checked, on a process pool; --force re-lints everything.
+
+Usage:
+    python manage.py lint_templates
+    python manage.py lint_templates --force --workers 4 --verbose
+"""
+
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from forge.models import Template, TemplateHealth
+from forge.services import TemplateLinter
+
+
+class Command(BaseCommand):
+    help = 'Lint templates and store per-template health records'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--template',
+            type=int,
+            action='append',
+            dest='templates',
+            help='Only this template id (repeatable)',
+        )
+        parser.add_argument(
+            '--include-inactive',
+            action='store_true',
+            help='Also lint inactive templates',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-lint templates whose health record is current',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Worker processes for linting; 1 lints in-process (default: CPU count)',
+        )
+        parser.add_argument(
+            '--verbose',
+            action='store_true',
+            help='List the problems found in each unhealthy template',
+        )
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1:
+            raise CommandError('--workers must be positive')
+
+        queryset = Template.objects.all()
+        if not options['include_inactive']:
+            queryset = queryset.filter(is_active=True)
+        if options['templates']:
+            queryset = queryset.filter(pk__in=options['templates'])
+
+        started = time.monotonic()
+        stats = TemplateLinter.lint_corpus(
+            queryset, workers=options['workers'], force=options['force']
+        )
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Linted {stats["checked"]} template(s) in {elapsed:.1f}s '
+            f'({stats["skipped"]} unchanged, skipped)'
+        ))
+        self.stdout.write(
+            f'  OK: {stats["ok"]}, Warnings: {stats["warning"]}, Errors: {stats["error"]}'
+        )
+
+        if options['verbose']:
+            unhealthy = (
+                TemplateHealth.objects.filter(template__in=queryset)
+                .exclude(status='ok')
+                .select_related('template')
+                .order_by('template__title')
+            )
+            for health in unhealthy:
+                self.stdout.write('')
+                self.stdout.write(f'{health.template.title}:')
+                for error in health.errors:
+                    self.stdout.write(self.style.ERROR(f'  Error: {error}'))
+                for warning in health.warnings:
+                    self.stdout.write(self.style.WARNING(f'  Warning: {warning}'))
@@ -0,0 +1,55 @@
+"""
+Management command to report the space generated outputs take.
+
+Outputs are stored as shared, compressed section chunks (see OutputStore).
+The report compares that with storing every output whole, and can delete
+chunks no prompt uses any more.
+
+Usage:
+    python manage.py output_storage_report
+    python manage.py output_storage_report --delete-unused
+"""
+
+from django.core.management.base import BaseCommand
+
+from forge.services.output_store import OutputStore
+
+
+class Command(BaseCommand):
+    help = 'Report the space saved by chunked, compressed output storage'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--delete-unused',
+            action='store_true',
+            help='Delete stored chunks that no prompt refers to before reporting',
+        )
+
+    def handle(self, *args, **options):
+        if options['delete_unused']:
+            deleted = OutputStore.delete_unused()
+            self.stdout.write(f'Deleted {deleted} unused chunk(s)')
+
+        stats = OutputStore.report()
+        logical = stats['logical_bytes']
+        stored = stats['stored_bytes']
+        saved = logical - stored
+
+        self.stdout.write(self.style.SUCCESS('Output storage'))
+        self.stdout.write(
+            f'  Prompts: {stats["prompts"]}, chunks: {stats["chunks"]}, distinct chunks: {stats["blobs"]}'
+        )
+        self.stdout.write(f'  Uncompressed outputs: {self.format_size(logical)}')
+        self.stdout.write(f'  After deduplication: {self.format_size(stats["unique_bytes"])}')
+        self.stdout.write(f'  Stored (compressed): {self.format_size(stored)}')
+        if logical:
+            self.stdout.write(f'  Saved: {self.format_size(saved)} ({saved / logical:.1%})')
+
+    @staticmethod
+    def format_size(size):
+        """Format a byte count for display."""
+        for unit in ('B', 'KiB', 'MiB'):
+            if abs(size) < 1024:
+                return f'{size:.0f} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+            size /= 1024
+        return f'{size:.1f} GiB'
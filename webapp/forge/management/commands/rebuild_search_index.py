@@ -0,0 +1,36 @@
+"""
+Management command to rebuild the template full-text search index.
+
+On SQLite the FTS5 table is kept current by model signals; run this to
+repair it after bulk changes that bypass signals (queryset.update(), raw
+SQL, fixtures loaded with loaddata). PostgreSQL maintains its index itself.
+
+Usage:
+    python manage.py rebuild_search_index
+"""
+
+from django.core.management.base import BaseCommand
+
+from forge.services.template_search import TemplateSearch
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index over templates'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Database alias (default: default)',
+        )
+
+    def handle(self, *args, **options):
+        backend = TemplateSearch.rebuild(options['database'])
+        if backend == 'sqlite':
+            self.stdout.write(self.style.SUCCESS('Rebuilt the SQLite FTS5 search index'))
+        elif backend == 'postgresql':
+            self.stdout.write('PostgreSQL maintains the search index itself; nothing to rebuild')
+        else:
+            self.stdout.write(self.style.WARNING(
+                'No full-text index on this database; searches use substring matching'
+            ))
@@ -0,0 +1,28 @@
+"""
+Management command to rebuild the materialized dashboard counters.
+
+Counters are normally kept current by model signals; run this to repair
+them after bulk changes that bypass signals (queryset.update(), raw SQL).
+
+Usage:
+    python manage.py recount_dashboard_stats
+"""
+
+from django.core.management.base import BaseCommand
+
+from forge.services.dashboard_stats import DashboardStats
+
+
+class Command(BaseCommand):
+    help = 'Recount the dashboard statistics from the templates and prompts tables'
+
+    def handle(self, *args, **options):
+        counts = DashboardStats.recount()
+
+        self.stdout.write(self.style.SUCCESS('Dashboard statistics recounted'))
+        self.stdout.write(f'  Active templates: {counts[("templates", "active")]}')
+        self.stdout.write(f'  Generated prompts: {counts[("prompts", "total")]}')
+        for group, label in (('role', 'Roles'), ('phase', 'Phases')):
+            values = sorted((key, count) for (g, key), count in counts.items() if g == group)
+            if values:
+                self.stdout.write(f'  {label}: ' + ', '.join(f'{key} {count}' for key, count in values))
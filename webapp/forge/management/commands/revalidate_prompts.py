@@ -0,0 +1,213 @@
+"""
+Management command to re-run BMAD validation over stored generated prompts.
+
+Rows are streamed in primary key order and validated in batches on a
+process pool; only rows whose results changed are written back. The last
+processed id is reported (and optionally written to a checkpoint file) so an
+interrupted run can be resumed.
+
+Usage:
+    python manage.py revalidate_prompts --role developer --since 2026-01-01
+    python manage.py revalidate_prompts --checkpoint-file /tmp/revalidate.ckpt
+"""
+
+import os
+import time
+from datetime import datetime, time as dt_time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from forge.models import Template, GeneratedPrompt
+from forge.services import BMADValidator
+from forge.services.caching import content_hash
+
+
+class Command(BaseCommand):
+    help = 'Re-validate stored generated prompts against the current BMAD rules'
+
+    UPDATE_FIELDS = [
+        'is_valid', 'validation_notes', 'missing_variables', 'validation_report', 'validator_version',
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--template',
+            type=int,
+            action='append',
+            dest='templates',
+            help='Only prompts generated from this template id (repeatable)',
+        )
+        parser.add_argument(
+            '--role',
+            type=str,
+            help='Only prompts whose template is associated with this agent role',
+        )
+        parser.add_argument(
+            '--since',
+            type=str,
+            help='Only prompts created on or after this date (YYYY-MM-DD)',
+        )
+        parser.add_argument(
+            '--until',
+            type=str,
+            help='Only prompts created on or before this date (YYYY-MM-DD)',
+        )
+        parser.add_argument(
+            '--after-id',
+            type=int,
+            help='Resume after this prompt id',
+        )
+        parser.add_argument(
+            '--checkpoint-file',
+            type=str,
+            help='File recording the last processed id; resumed from when it exists',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Rows fetched, validated and written per batch (default: 500)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Worker processes for validation; 1 validates in-process (default: CPU count)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate and report without writing results',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        workers = options['workers']
+        checkpoint_file = options['checkpoint_file']
+        dry_run = options['dry_run']
+        if batch_size < 1 or workers < 1:
+            raise CommandError('--batch-size and --workers must be positive')
+
+        after_id = options['after_id']
+        if after_id is None and checkpoint_file and os.path.exists(checkpoint_file):
+            with open(checkpoint_file) as f:
+                content = f.read().strip()
+            after_id = int(content) if content else None
+            if after_id is not None:
+                self.stdout.write(f'Resuming from checkpoint after id {after_id}')
+
+        queryset = self.get_queryset(options)
+        if after_id is not None:
+            queryset = queryset.filter(pk__gt=after_id)
+        rows = (
+            queryset.order_by('pk')
+            .only('pk', *self.UPDATE_FIELDS)
+            .iterator(chunk_size=batch_size)
+        )
+
+        pool = BMADValidator.create_pool(workers) if workers > 1 else None
+        stats = {'processed': 0, 'changed': 0, 'valid': 0, 'invalid': 0}
+        last_id = after_id
+        started = time.monotonic()
+        try:
+            batch = []
+            for prompt in rows:
+                batch.append(prompt)
+                if len(batch) >= batch_size:
+                    last_id = self.process_batch(batch, pool, workers, dry_run, stats)
+                    self.save_checkpoint(checkpoint_file, last_id, dry_run)
+                    self.report_progress(stats, started)
+                    batch = []
+            if batch:
+                last_id = self.process_batch(batch, pool, workers, dry_run, stats)
+                self.save_checkpoint(checkpoint_file, last_id, dry_run)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING(
+                f'Interrupted. Resume with --after-id {last_id}' if last_id is not None
+                else 'Interrupted before the first batch completed.'
+            ))
+            raise
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+        elapsed = time.monotonic() - started
+        rate = stats['processed'] / elapsed if elapsed > 0 else 0.0
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(
+            f'Re-validated {stats["processed"]} prompt(s) in {elapsed:.1f}s ({rate:.1f} prompts/s)'
+        ))
+        self.stdout.write(f'  Valid: {stats["valid"]}, Invalid: {stats["invalid"]}')
+        self.stdout.write(
+            f'  Changed: {stats["changed"]}' + (' (dry run, nothing written)' if dry_run else '')
+        )
+        if last_id is not None:
+            self.stdout.write(f'  Last processed id: {last_id}')
+
+    def get_queryset(self, options):
+        """Build the prompt queryset from the filter options."""
+        queryset = GeneratedPrompt.objects.all()
+        if options['templates']:
+            queryset = queryset.filter(template_id__in=options['templates'])
+        if options['role']:
+            templates = Template.objects.filter_by_role(Template.objects.all(), options['role'])
+            queryset = queryset.filter(template__in=templates)
+        if options['since']:
+            queryset = queryset.filter(created_at__gte=self.parse_date(options['since'], dt_time.min))
+        if options['until']:
+            queryset = queryset.filter(created_at__lte=self.parse_date(options['until'], dt_time.max))
+        return queryset
+
+    def parse_date(self, value, at):
+        """Parse a YYYY-MM-DD option into an aware datetime at the given time of day."""
+        try:
+            day = datetime.strptime(value, '%Y-%m-%d').date()
+        except ValueError:
+            raise CommandError(f'Invalid date "{value}". Expected YYYY-MM-DD')
+        return timezone.make_aware(datetime.combine(day, at))
+
+    def process_batch(self, batch, pool, workers, dry_run, stats):
+        """Validate a batch, write back changed rows and return the last id."""
+        GeneratedPrompt.prefetch_final_outputs(batch)
+        reports = BMADValidator.validate_many(
+            [prompt.final_output for prompt in batch], executor=pool, workers=workers
+        )
+
+        changed = []
+        for prompt, report in zip(batch, reports):
+            is_valid = report.is_valid
+            notes = report.get_validation_notes()
+            missing = report.unreplaced_variables
+            snapshot = BMADValidator.snapshot(report, content_hash(prompt.final_output))
+            stats['valid' if is_valid else 'invalid'] += 1
+            if (
+                (prompt.is_valid, prompt.validation_notes, prompt.missing_variables, prompt.validation_report)
+                != (is_valid, notes, missing, snapshot)
+            ):
+                prompt.is_valid = is_valid
+                prompt.validation_notes = notes
+                prompt.missing_variables = missing
+                prompt.validation_report = snapshot
+                prompt.validator_version = BMADValidator.VALIDATOR_VERSION
+                changed.append(prompt)
+
+        if changed and not dry_run:
+            GeneratedPrompt.objects.bulk_update(changed, self.UPDATE_FIELDS)
+        stats['processed'] += len(batch)
+        stats['changed'] += len(changed)
+        return batch[-1].pk
+
+    def save_checkpoint(self, checkpoint_file, last_id, dry_run):
+        """Record the last processed id so an interrupted run can resume."""
+        if checkpoint_file and not dry_run:
+            with open(checkpoint_file, 'w') as f:
+                f.write(str(last_id))
+
+    def report_progress(self, stats, started):
+        """Write a throughput line after each full batch."""
+        elapsed = time.monotonic() - started
+        rate = stats['processed'] / elapsed if elapsed > 0 else 0.0
+        self.stdout.write(
+            f'  {stats["processed"]} processed, {stats["changed"]} changed ({rate:.1f} prompts/s)'
+        )
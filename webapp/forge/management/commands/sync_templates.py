@@ -65,7 +65,10 @@ class Command(BaseCommand):
         
         # Perform sync
         service = GitHubSyncService()
-        results = service.sync_templates(owner, repo, branch, path)
+        results = service.sync_templates(
+            owner, repo, branch, path,
+            lint_workers=getattr(settings, 'TEMPLATE_LINT_WORKERS', None),
+        )
         
         if results['success']:
             self.stdout.write(self.style.SUCCESS(f'Sync completed successfully!'))
@@ -84,6 +87,21 @@ class Command(BaseCommand):
             for error in results['errors']:
                 self.stdout.write(f'  Error: {error}')
         
+        # Show unsafe validation patterns
+        if results.get('warnings'):
+            self.stdout.write('')
+            for warning in results['warnings']:
+                self.stdout.write(self.style.WARNING(f'Pattern: {warning}'))
+        
+        # Show template health after the post-sync lint
+        health = results.get('health')
+        if health:
+            self.stdout.write('')
+            self.stdout.write(
+                f'Template health: {health["ok"]} ok, {health["warning"]} with warnings, '
+                f'{health["error"]} with errors ({health["checked"]} re-linted)'
+            )
+        
         # Show any errors
         if results.get('errors'):
             self.stdout.write('')
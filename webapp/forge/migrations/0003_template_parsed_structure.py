@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forge', '0002_add_agent_roles_field'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='template',
+            name='parsed_structure',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Parsed sections, headings, variables and metadata, built on save'),
+        ),
+        migrations.AddField(
+            model_name='template',
+            name='parser_version',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Template parser version that produced parsed_structure'),
+        ),
+    ]
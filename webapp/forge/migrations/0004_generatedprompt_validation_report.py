@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forge', '0003_template_parsed_structure'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generatedprompt',
+            name='validation_report',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Full BMAD validation report of final_output, built on save'),
+        ),
+        migrations.AddField(
+            model_name='generatedprompt',
+            name='validator_version',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='BMAD validator version that produced validation_report'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+"""
+Validation report snapshots for existing generated prompts.
+
+The snapshots are built by the BMAD validator, which cannot be frozen into a
+migration the way a model can; running the live validator here would make
+this migration's result depend on whatever the rules are when it is applied.
+The migration therefore writes nothing. A prompt without a snapshot has one
+built and stored the first time GeneratedPrompt.get_validation_report() reads
+it, and `manage.py revalidate_prompts` fills them in bulk.
+"""
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forge', '0004_generatedprompt_validation_report'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, migrations.RunPython.noop),
+    ]
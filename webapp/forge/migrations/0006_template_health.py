@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:35
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forge', '0005_backfill_validation_reports'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TemplateHealth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('ok', 'OK'), ('warning', 'Warnings'), ('error', 'Errors')], help_text='Worst severity found when the template was linted', max_length=10)),
+                ('errors', models.JSONField(blank=True, default=list, help_text='Problems that stop the template from working as intended')),
+                ('warnings', models.JSONField(blank=True, default=list, help_text='Problems worth reviewing')),
+                ('content_hash', models.CharField(help_text='SHA-256 of the content that was linted', max_length=64)),
+                ('linter_version', models.PositiveSmallIntegerField(default=0, help_text='Template linter version that produced this record')),
+                ('checked_at', models.DateTimeField(default=django.utils.timezone.now, help_text='When the template was last linted')),
+                ('template', models.OneToOneField(help_text='Template this health record describes', on_delete=django.db.models.deletion.CASCADE, related_name='health', to='forge.template')),
+            ],
+            options={
+                'verbose_name': 'template health',
+                'verbose_name_plural': 'template health',
+                'indexes': [models.Index(fields=['status'], name='forge_templ_status_f59890_idx')],
+            },
+        ),
+    ]
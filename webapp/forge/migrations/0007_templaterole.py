@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forge', '0006_template_health'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TemplateRole',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(help_text='BMAD agent role', max_length=50)),
+                ('template', models.ForeignKey(help_text='Template associated with the role', on_delete=django.db.models.deletion.CASCADE, related_name='role_links', to='forge.template')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('role', 'template'), name='unique_template_role')],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+"""
+Backfill TemplateRole rows from each template's agent_role and agent_roles.
+
+Historical models do not have Template.save(), so the roles are derived here
+the same way Template.get_roles_list() does. Templates are read in primary
+key order in fixed-size batches; reruns only insert missing rows.
+"""
+
+from django.db import migrations
+
+BATCH_SIZE = 500
+
+
+def backfill_template_roles(apps, schema_editor):
+    Template = apps.get_model('forge', 'Template')
+    TemplateRole = apps.get_model('forge', 'TemplateRole')
+    rows = (
+        Template.objects.order_by('pk')
+        .only('pk', 'agent_role', 'agent_roles')
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+
+    links = []
+    for template in rows:
+        roles = template.agent_roles or ([template.agent_role] if template.agent_role else [])
+        links.extend(
+            TemplateRole(template_id=template.pk, role=role)
+            for role in dict.fromkeys(roles)
+        )
+        if len(links) >= BATCH_SIZE:
+            TemplateRole.objects.bulk_create(links, ignore_conflicts=True)
+            links = []
+    if links:
+        TemplateRole.objects.bulk_create(links, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forge', '0007_templaterole'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_template_roles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forge', '0008_backfill_template_roles'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('group', models.CharField(help_text='Counter group: templates, role, phase or prompts', max_length=20)),
+                ('key', models.CharField(help_text='Counter key within the group', max_length=100)),
+                ('count', models.IntegerField(default=0, help_text='Current count')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('group', 'key'), name='unique_dashboard_stat')],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+"""
+Fill the dashboard counters from the existing templates and prompts.
+
+Counters are adjusted incrementally from here on, so they must start from
+the true totals. The counts are aggregate queries; no rows are loaded. They
+are written out here against the historical models, as
+DashboardStats.count() was when this migration was made, so later changes
+to the service do not change what the migration does.
+"""
+
+from django.db import migrations, models
+
+
+def backfill_dashboard_stats(apps, schema_editor):
+    Template = apps.get_model('forge', 'Template')
+    TemplateRole = apps.get_model('forge', 'TemplateRole')
+    GeneratedPrompt = apps.get_model('forge', 'GeneratedPrompt')
+    DashboardStat = apps.get_model('forge', 'DashboardStat')
+
+    active = Template.objects.filter(is_active=True)
+    counts = {
+        ('templates', 'active'): active.count(),
+        ('prompts', 'total'): GeneratedPrompt.objects.count(),
+    }
+    phases = active.order_by().values('workflow_phase').annotate(n=models.Count('pk'))
+    for row in phases:
+        counts[('phase', row['workflow_phase'])] = row['n']
+    roles = (
+        TemplateRole.objects.filter(template__is_active=True)
+        .order_by().values('role').annotate(n=models.Count('pk'))
+    )
+    for row in roles:
+        counts[('role', row['role'])] = row['n']
+
+    DashboardStat.objects.all().delete()
+    DashboardStat.objects.bulk_create(
+        DashboardStat(group=group, key=key, count=count)
+        for (group, key), count in counts.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forge', '0009_dashboardstat'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_dashboard_stats, migrations.RunPython.noop),
+    ]
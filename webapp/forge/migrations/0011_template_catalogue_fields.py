@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forge', '0010_backfill_dashboard_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='template',
+            name='excerpt',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Plain-text preview of the content, built on save', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='template',
+            name='variable_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Distinct variables in the content, built on save'),
+        ),
+        migrations.AddField(
+            model_name='template',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Words in the content after the frontmatter, built on save'),
+        ),
+    ]
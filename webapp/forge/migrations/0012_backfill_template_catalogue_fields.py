@@ -0,0 +1,46 @@
+"""
+Backfill the catalogue excerpt, word count and variable count of templates.
+
+Historical models do not have Template.save(), so the values are computed
+here the same way it does. Templates are processed in primary key order in
+fixed-size batches, so memory stays bounded however many there are.
+"""
+
+from django.db import migrations
+
+BATCH_SIZE = 200
+
+
+def backfill_catalogue_fields(apps, schema_editor):
+    from forge.services.template_parser import TemplateParser
+
+    Template = apps.get_model('forge', 'Template')
+    rows = (
+        Template.objects.order_by('pk')
+        .only('pk', 'content')
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+
+    batch = []
+    for template in rows:
+        compiled = TemplateParser.compile(template.content or '')
+        template.excerpt = TemplateParser.excerpt(compiled)
+        template.word_count = len(compiled.body.split())
+        template.variable_count = len(TemplateParser.extract_variables_simple(compiled.content))
+        batch.append(template)
+        if len(batch) >= BATCH_SIZE:
+            Template.objects.bulk_update(batch, ['excerpt', 'word_count', 'variable_count'])
+            batch = []
+    if batch:
+        Template.objects.bulk_update(batch, ['excerpt', 'word_count', 'variable_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forge', '0011_template_catalogue_fields'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_catalogue_fields, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,69 @@
+"""
+Create the full-text search index used by TemplateSearch.
+
+PostgreSQL gets a generated, weighted tsvector column with a GIN index; the
+database keeps it current. SQLite gets an FTS5 table filled from the
+existing templates and kept current by the Template signals. On other
+databases, or SQLite builds without FTS5, nothing is created and searches
+fall back to substring matching.
+"""
+
+from django.db import migrations
+from django.db.utils import OperationalError
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE forge_template ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX forge_template_search_gin ON forge_template USING GIN (search_vector)",
+]
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS forge_template_search_gin",
+    "ALTER TABLE forge_template DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE forge_template_fts USING fts5("
+    "title, description, content, tokenize = 'porter unicode61')",
+    "INSERT INTO forge_template_fts (rowid, title, description, content) "
+    "SELECT id, title, COALESCE(description, ''), content FROM forge_template",
+]
+SQLITE_REVERSE = [
+    "DROP TABLE IF EXISTS forge_template_fts",
+]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        for statement in POSTGRES_FORWARD:
+            schema_editor.execute(statement)
+    elif vendor == 'sqlite':
+        try:
+            schema_editor.execute(SQLITE_FORWARD[0])
+        except OperationalError:
+            return  # SQLite built without FTS5
+        schema_editor.execute(SQLITE_FORWARD[1])
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'postgresql': POSTGRES_REVERSE, 'sqlite': SQLITE_REVERSE}.get(vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forge', '0012_backfill_template_catalogue_fields'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forge', '0013_template_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='generatedprompt',
+            index=models.Index(fields=['created_at', 'id'], name='forge_gener_created_805b1c_idx'),
+        ),
+    ]
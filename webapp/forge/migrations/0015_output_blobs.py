@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forge', '0014_generatedprompt_created_at_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutputBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(help_text='SHA-256 of the chunk text', max_length=64, unique=True)),
+                ('data', models.BinaryField(help_text='Chunk text as UTF-8, zlib-compressed if compressed is set')),
+                ('compressed', models.BooleanField(default=False, help_text='Whether data is zlib-compressed')),
+                ('size', models.PositiveIntegerField(help_text='Length of the chunk text in UTF-8 bytes')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='OutputChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField(help_text='Position of the chunk in the output, from 0')),
+                ('blob', models.ForeignKey(help_text='Stored chunk text', on_delete=django.db.models.deletion.PROTECT, related_name='uses', to='forge.outputblob')),
+                ('prompt', models.ForeignKey(help_text='Prompt whose output this chunk belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='output_chunks', to='forge.generatedprompt')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('prompt', 'position'), name='unique_output_chunk_position')],
+            },
+        ),
+    ]
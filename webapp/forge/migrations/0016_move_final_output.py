@@ -0,0 +1,51 @@
+"""
+Move every prompt's final_output into the content-addressed chunk store.
+
+Historical models do not have the final_output accessor, so OutputStore is
+given them explicitly. Prompts are read in primary key order in fixed-size
+batches; each prompt's chunks are replaced, so reruns are harmless. The
+reverse operation copies the stored outputs back into the column.
+"""
+
+from django.db import migrations
+
+BATCH_SIZE = 500
+
+
+def move_final_output(apps, schema_editor):
+    from forge.services.output_store import OutputStore
+
+    GeneratedPrompt = apps.get_model('forge', 'GeneratedPrompt')
+    OutputBlob = apps.get_model('forge', 'OutputBlob')
+    OutputChunk = apps.get_model('forge', 'OutputChunk')
+    rows = (
+        GeneratedPrompt.objects.order_by('pk')
+        .values_list('pk', 'final_output')
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    for pk, final_output in rows:
+        OutputStore.write(pk, final_output, blob_model=OutputBlob, chunk_model=OutputChunk)
+
+
+def restore_final_output(apps, schema_editor):
+    from forge.services.output_store import OutputStore
+
+    GeneratedPrompt = apps.get_model('forge', 'GeneratedPrompt')
+    OutputChunk = apps.get_model('forge', 'OutputChunk')
+    pks = list(GeneratedPrompt.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(pks), BATCH_SIZE):
+        batch = pks[start:start + BATCH_SIZE]
+        outputs = OutputStore.read_many(batch, chunk_model=OutputChunk)
+        for pk in batch:
+            GeneratedPrompt.objects.filter(pk=pk).update(final_output=outputs.get(pk, ''))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forge', '0015_output_blobs'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_final_output, restore_final_output),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forge', '0016_move_final_output'),
+    ]
+
+    operations = [
+        # A default lets the column be added back when migrating backwards
+        migrations.AlterField(
+            model_name='generatedprompt',
+            name='final_output',
+            field=models.TextField(default='', help_text='The generated prompt output'),
+        ),
+        migrations.RemoveField(
+            model_name='generatedprompt',
+            name='final_output',
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:55
+
+import django.db.models.deletion
+import django.utils.timezone
+import forge.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forge', '0017_remove_generatedprompt_final_output'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedPrompt',
+            fields=[
+                ('id', models.BigIntegerField(help_text='Id the prompt had in GeneratedPrompt', primary_key=True, serialize=False)),
+                ('input_data', models.JSONField(help_text='User input data used to generate the prompt')),
+                ('output', models.BinaryField(help_text='The generated prompt output as zlib-compressed UTF-8')),
+                ('is_valid', models.BooleanField(default=False, help_text='Whether the generated prompt is BMAD-compliant')),
+                ('validation_notes', models.JSONField(blank=True, default=list, help_text='Notes from BMAD validation checks')),
+                ('missing_variables', models.JSONField(blank=True, default=list, help_text='List of variables that were not replaced')),
+                ('validation_report', models.JSONField(blank=True, default=dict, help_text='Full BMAD validation report of the output when it was archived')),
+                ('validator_version', models.PositiveSmallIntegerField(default=0, help_text='BMAD validator version that produced validation_report')),
+                ('created_at', models.DateTimeField(help_text='When this prompt was generated')),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now, help_text='When this prompt was archived')),
+                ('template', models.ForeignKey(help_text='The template used to generate this prompt', on_delete=django.db.models.deletion.CASCADE, related_name='archived_prompts', to='forge.template')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['is_valid', 'created_at'], name='forge_archi_is_vali_219cc5_idx'), models.Index(fields=['created_at', 'id'], name='forge_archi_created_c13c8c_idx')],
+            },
+            bases=(forge.models.PromptDisplayMixin, models.Model),
+        ),
+    ]
@@ -2,22 +2,69 @@
 Database models for BMAD Forge application.
 """
 
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.utils import timezone
+import codecs
 import json
-import re
+import zlib
 
 
-class TemplateManager(models.Manager):
+class CounterBatchingQuerySet(models.QuerySet):
+    """
+    QuerySet whose deletes adjust the dashboard counters once.
+    
+    The post_delete receivers that keep DashboardStats current run for every
+    deleted row, including rows removed by cascade (deleting a template
+    deletes its prompts). Inside DashboardStats.batched() their changes are
+    summed and applied in one update instead of one per row.
+    """
+    
+    def delete(self):
+        from .services.dashboard_stats import DashboardStats
+        with DashboardStats.batched():
+            return super().delete()
+
+
+class TemplateManager(models.Manager.from_queryset(CounterBatchingQuerySet)):
     """Custom manager for Template model with multi-role and workflow filtering support."""
     
+    # Columns list pages need; content, variables and parsed_structure stay deferred
+    CATALOGUE_FIELDS = (
+        'id', 'title', 'agent_role', 'agent_roles', 'workflow_phase', 'description',
+        'version', 'excerpt', 'word_count', 'variable_count', 'is_active',
+        'created_at', 'last_updated',
+    )
+    
+    def catalogue(self, queryset=None, extra_fields=()):
+        """
+        Project templates to their catalogue columns for list pages.
+        
+        Template bodies and parse artifacts can run to hundreds of kilobytes;
+        list pages only show the metadata and the precomputed excerpt, word
+        count and variable count, so the heavy columns are deferred. Reading
+        one of them on an instance loads it with an extra query.
+        
+        Args:
+            queryset: The queryset to project (default: all templates)
+            extra_fields: Further fields to load, e.g. of select_related
+                relations ('health__status')
+            
+        Returns:
+            Queryset loading only CATALOGUE_FIELDS and extra_fields
+        """
+        if queryset is None:
+            queryset = self.get_queryset()
+        return queryset.only(*self.CATALOGUE_FIELDS, *extra_fields)
+    
     def filter_by_role(self, queryset, role):
         """
         Filter templates by role, checking both agent_role and agent_roles fields.
         
-        Uses Python-based filtering for cross-database compatibility (works with SQLite,
-        PostgreSQL, etc.) since JSONField contains lookup support varies by database.
+        Roles are mirrored into the TemplateRole table when a template is
+        saved, so this is a single join on its (role, template) index and
+        behaves the same on SQLite and PostgreSQL. Each role appears once per
+        template, so the join never duplicates rows.
         
         Args:
             queryset: The queryset to filter
@@ -28,12 +75,7 @@ class TemplateManager(models.Manager):
         """
         if not role:
             return queryset
-            
-        matching_ids = [
-            template.id for template in queryset
-            if template.has_role(role)
-        ]
-        return queryset.filter(id__in=matching_ids)
+        return queryset.filter(role_links__role=role)
     
     def filter_by_workflow(self, queryset, workflow_phase):
         """
@@ -109,6 +151,34 @@ class Template(models.Model):
         blank=True,
         help_text="Detected variables in the template"
     )
+    excerpt = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        editable=False,
+        help_text="Plain-text preview of the content, built on save"
+    )
+    word_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Words in the content after the frontmatter, built on save"
+    )
+    variable_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Distinct variables in the content, built on save"
+    )
+    parsed_structure = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Parsed sections, headings, variables and metadata, built on save"
+    )
+    parser_version = models.PositiveSmallIntegerField(
+        default=0,
+        editable=False,
+        help_text="Template parser version that produced parsed_structure"
+    )
     is_active = models.BooleanField(
         default=True,
         help_text="Whether this template is active and available for use"
@@ -132,28 +202,50 @@ class Template(models.Model):
     def __str__(self):
         return f"{self.title} ({self.agent_role} - {self.workflow_phase})"
     
+    def delete(self, *args, **kwargs):
+        """Delete the template and its prompts, adjusting the dashboard counters once."""
+        from .services.dashboard_stats import DashboardStats
+        with DashboardStats.batched():
+            return super().delete(*args, **kwargs)
+    
     def extract_variables(self):
         """
-        Extract variables from template content using regex patterns.
-        Supports both {{VARIABLE_NAME}} and [VARIABLE_NAME] syntax.
+        Extract variables from template content using the shared variable scanner.
+        Supports both {{VARIABLE_NAME}} and [VARIABLE_NAME] syntax, with optional defaults.
         """
-        pattern = r'\{\{(\w+)\}\}|\[(\w+)\]'
-        matches = re.findall(pattern, self.content)
-        variables = set()
-        for match in matches:
-            variables.add(match[0] if match[0] else match[1])
-        return sorted(list(variables))
+        from .services.template_parser import TemplateParser
+        return TemplateParser.extract_variables_simple(self.content)
     
     def save(self, *args, **kwargs):
-        """Override save to auto-extract variables and sync agent_roles."""
+        """Override save to auto-extract variables, store the parse artifact and catalogue summary, and sync roles."""
+        from .services.template_parser import TemplateParser
+        compiled = TemplateParser.compile(self.content)
         self.variables = self.extract_variables()
+        self.parsed_structure = compiled.to_dict()
+        self.parser_version = TemplateParser.PARSER_VERSION
+        self.excerpt = TemplateParser.excerpt(compiled)
+        self.word_count = len(compiled.body.split())
+        self.variable_count = len(self.variables)
         # Ensure agent_roles is initialized and includes the primary agent_role
         if self.agent_roles is None:
             self.agent_roles = []
         if self.agent_role and self.agent_role not in self.agent_roles:
             # Add primary role at the beginning, preserving other roles
             self.agent_roles = [self.agent_role] + [r for r in self.agent_roles if r != self.agent_role]
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.sync_roles()
+    
+    def sync_roles(self):
+        """Mirror get_roles_list() into TemplateRole rows for filter_by_role."""
+        roles = set(self.get_roles_list())
+        existing = set(self.role_links.values_list('role', flat=True))
+        if existing - roles:
+            self.role_links.filter(role__in=existing - roles).delete()
+        if roles - existing:
+            TemplateRole.objects.bulk_create(
+                [TemplateRole(template=self, role=role) for role in sorted(roles - existing)]
+            )
     
     def get_variables_list(self):
         """Return variables as a list."""
@@ -177,6 +269,28 @@ class Template(models.Model):
         """Check if this template is associated with a specific role."""
         return role in self.get_roles_list()
     
+    def get_compiled(self):
+        """
+        Return the parsed, immutable form of this template's content.
+        
+        The artifact stored in parsed_structure is loaded without reparsing.
+        Artifacts written by an older parser version, or for different
+        content, are rebuilt and written back to the row. Compiled templates
+        are also memoized per process by content hash.
+        """
+        from .services.template_parser import TemplateParser
+        compiled = TemplateParser.compile(self.content, artifact=self.parsed_structure)
+        if self.pk and not TemplateParser.is_artifact_current(
+            self.parsed_structure, compiled.content_hash
+        ):
+            self.parsed_structure = compiled.to_dict()
+            self.parser_version = TemplateParser.PARSER_VERSION
+            Template.objects.filter(pk=self.pk).update(
+                parsed_structure=self.parsed_structure,
+                parser_version=self.parser_version,
+            )
+        return compiled
+    
     def generate_prompt(self, **kwargs):
         """
         Generate a prompt by substituting variables with provided values.
@@ -187,15 +301,109 @@ class Template(models.Model):
         Returns:
             str: Generated prompt with variables substituted
         """
-        result = self.content
-        for key, value in kwargs.items():
-            # Support both {{VAR}} and [VAR] syntax
-            result = result.replace('{{' + key + '}}', str(value))
-            result = result.replace('[' + key + ']', str(value))
-        return result
+        from .services.template_parser import TemplateParser
+        return TemplateParser.render(self.get_compiled(), kwargs).output
 
 
-class GeneratedPrompt(models.Model):
+class TemplateHealth(models.Model):
+    """
+    Latest lint result for a template, written by TemplateLinter.lint_corpus().
+    """
+
+    STATUS_CHOICES = [
+        ('ok', 'OK'),
+        ('warning', 'Warnings'),
+        ('error', 'Errors'),
+    ]
+
+    template = models.OneToOneField(
+        Template,
+        on_delete=models.CASCADE,
+        related_name='health',
+        help_text="Template this health record describes"
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        help_text="Worst severity found when the template was linted"
+    )
+    errors = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Problems that stop the template from working as intended"
+    )
+    warnings = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Problems worth reviewing"
+    )
+    content_hash = models.CharField(
+        max_length=64,
+        help_text="SHA-256 of the content that was linted"
+    )
+    linter_version = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Template linter version that produced this record"
+    )
+    checked_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="When the template was last linted"
+    )
+
+    class Meta:
+        verbose_name = 'template health'
+        verbose_name_plural = 'template health'
+        indexes = [
+            models.Index(fields=['status']),
+        ]
+
+    def __str__(self):
+        return f"{self.template.title}: {self.get_status_display()}"
+
+
+class TemplateRole(models.Model):
+    """
+    One agent role of a template, kept in sync from agent_role/agent_roles on save.
+    """
+
+    template = models.ForeignKey(
+        Template,
+        on_delete=models.CASCADE,
+        related_name='role_links',
+        help_text="Template associated with the role"
+    )
+    role = models.CharField(
+        max_length=50,
+        help_text="BMAD agent role"
+    )
+
+    class Meta:
+        constraints = [
+            # Also the index filter_by_role joins on, role first
+            models.UniqueConstraint(fields=['role', 'template'], name='unique_template_role'),
+        ]
+
+    def __str__(self):
+        return f"{self.template_id}: {self.role}"
+
+
+class PromptDisplayMixin:
+    """Display helpers shared by live and archived generated prompts."""
+    
+    def get_input_data_display(self):
+        """Return input data as a formatted string."""
+        if isinstance(self.input_data, dict):
+            return ', '.join(f"{k}: {v}" for k, v in self.input_data.items())
+        return str(self.input_data)
+    
+    def get_validation_status(self):
+        """Return validation status as a human-readable string."""
+        if self.is_valid:
+            return "Valid"
+        return f"Invalid ({len(self.missing_variables)} issues)"
+
+
+class GeneratedPrompt(PromptDisplayMixin, models.Model):
     """
     Represents a generated prompt with user input data and validation results.
     """
@@ -209,9 +417,6 @@ class GeneratedPrompt(models.Model):
     input_data = models.JSONField(
         help_text="User input data used to generate the prompt"
     )
-    final_output = models.TextField(
-        help_text="The generated prompt output"
-    )
     is_valid = models.BooleanField(
         default=False,
         help_text="Whether the generated prompt is BMAD-compliant"
@@ -226,29 +431,353 @@ class GeneratedPrompt(models.Model):
         blank=True,
         help_text="List of variables that were not replaced"
     )
+    validation_report = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Full BMAD validation report of final_output, built on save"
+    )
+    validator_version = models.PositiveSmallIntegerField(
+        default=0,
+        editable=False,
+        help_text="BMAD validator version that produced validation_report"
+    )
     created_at = models.DateTimeField(
         auto_now_add=True,
         help_text="When this prompt was generated"
     )
     
+    objects = CounterBatchingQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['template', 'created_at']),
             models.Index(fields=['is_valid', 'created_at']),
+            # Keyset pagination of the unfiltered history
+            models.Index(fields=['created_at', 'id']),
         ]
     
+    # Lets templates tell archived prompts (ArchivedPrompt) from live ones
+    is_archived = False
+    
+    # Output text read or assigned in this instance; see final_output
+    _final_output = None
+    _final_output_changed = False
+    
     def __str__(self):
         return f"Generated Prompt from {self.template.title} at {self.created_at}"
     
-    def get_input_data_display(self):
-        """Return input data as a formatted string."""
-        if isinstance(self.input_data, dict):
-            return ', '.join(f"{k}: {v}" for k, v in self.input_data.items())
-        return str(self.input_data)
+    @property
+    def final_output(self):
+        """
+        The generated prompt output.
+        
+        Outputs are stored as shared, compressed section chunks by
+        OutputStore. They are read on first access and written when the
+        prompt is saved after being assigned.
+        """
+        if self._final_output is None:
+            from .services.output_store import OutputStore
+            self._final_output = OutputStore.read(self.pk) if self.pk else ''
+        return self._final_output
     
-    def get_validation_status(self):
-        """Return validation status as a human-readable string."""
-        if self.is_valid:
-            return "Valid"
-        return f"Invalid ({len(self.missing_variables)} issues)"
+    @final_output.setter
+    def final_output(self, value):
+        self._final_output = value or ''
+        self._final_output_changed = True
+    
+    @classmethod
+    def prefetch_final_outputs(cls, prompts):
+        """
+        Load the outputs of several prompts with one query.
+        
+        Args:
+            prompts: Saved GeneratedPrompt instances
+        """
+        from .services.output_store import OutputStore
+        pending = [p for p in prompts if p._final_output is None and p.pk]
+        outputs = OutputStore.read_many(p.pk for p in pending)
+        for prompt in pending:
+            prompt._final_output = outputs.get(prompt.pk, '')
+    
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        if fields is None:
+            self._final_output = None
+            self._final_output_changed = False
+    
+    def save(self, *args, **kwargs):
+        """Override save to store the validation report snapshot of final_output, and the output if it was assigned."""
+        self.refresh_validation_report()
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+            if self._final_output_changed:
+                from .services.output_store import OutputStore
+                OutputStore.write(self.pk, self._final_output)
+                self._final_output_changed = False
+    
+    def refresh_validation_report(self):
+        """
+        Rebuild the validation report snapshot if it is missing or stale.
+        
+        Snapshots written by an older validator version, or for different
+        output, are replaced.
+        
+        Returns:
+            BMADValidationReport for final_output, or None if the stored
+            snapshot was already current
+        """
+        from .services.bmad_validator import BMADValidator
+        from .services.caching import content_hash
+        key = content_hash(self.final_output)
+        if BMADValidator.is_snapshot_current(self.validation_report, key):
+            return None
+        report = BMADValidator.validate(self.final_output)
+        self.validation_report = BMADValidator.snapshot(report, key)
+        self.validator_version = BMADValidator.VALIDATOR_VERSION
+        return report
+    
+    @classmethod
+    def iter_final_output(cls, pk):
+        """
+        Yield the final_output of a prompt in pieces read from the database.
+        
+        Stored chunks are fetched a batch at a time, so the whole output is
+        never loaded at once.
+        
+        Args:
+            pk: Primary key of the prompt
+            
+        Yields:
+            Consecutive pieces of final_output (nothing if the prompt does not exist)
+        """
+        from .services.output_store import OutputStore
+        yield from OutputStore.iter_chunks(pk)
+    
+    def get_validation_report(self):
+        """
+        Return the BMAD validation report of final_output.
+        
+        The snapshot stored in validation_report is loaded without
+        re-validating. Stale snapshots are rebuilt and written back to the row.
+        """
+        from .services.bmad_validator import BMADValidationReport
+        report = self.refresh_validation_report()
+        if report is None:
+            return BMADValidationReport.from_dict(self.validation_report)
+        if self.pk:
+            GeneratedPrompt.objects.filter(pk=self.pk).update(
+                validation_report=self.validation_report,
+                validator_version=self.validator_version,
+            )
+        return report
+
+
+class ArchivedPrompt(PromptDisplayMixin, models.Model):
+    """
+    A generated prompt moved out of GeneratedPrompt by PromptArchive.
+    
+    Keeps the prompt's id and offers the attributes the history and result
+    pages read, so old prompts stay viewable at their original URLs. The
+    output is stored whole and zlib-compressed.
+    """
+    
+    id = models.BigIntegerField(
+        primary_key=True,
+        help_text="Id the prompt had in GeneratedPrompt"
+    )
+    template = models.ForeignKey(
+        Template,
+        on_delete=models.CASCADE,
+        related_name='archived_prompts',
+        help_text="The template used to generate this prompt"
+    )
+    input_data = models.JSONField(
+        help_text="User input data used to generate the prompt"
+    )
+    output = models.BinaryField(
+        help_text="The generated prompt output as zlib-compressed UTF-8"
+    )
+    is_valid = models.BooleanField(
+        default=False,
+        help_text="Whether the generated prompt is BMAD-compliant"
+    )
+    validation_notes = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Notes from BMAD validation checks"
+    )
+    missing_variables = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="List of variables that were not replaced"
+    )
+    validation_report = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Full BMAD validation report of the output when it was archived"
+    )
+    validator_version = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="BMAD validator version that produced validation_report"
+    )
+    created_at = models.DateTimeField(
+        help_text="When this prompt was generated"
+    )
+    archived_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="When this prompt was archived"
+    )
+    
+    is_archived = True
+    
+    objects = CounterBatchingQuerySet.as_manager()
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['is_valid', 'created_at']),
+            models.Index(fields=['created_at', 'id']),
+        ]
+    
+    def __str__(self):
+        return f"Archived Prompt from {self.template.title} at {self.created_at}"
+    
+    @property
+    def final_output(self):
+        """The generated prompt output."""
+        return zlib.decompress(bytes(self.output)).decode('utf-8')
+    
+    @final_output.setter
+    def final_output(self, value):
+        from .services.output_store import OutputStore
+        self.output = zlib.compress((value or '').encode('utf-8'), OutputStore.COMPRESSION_LEVEL)
+    
+    # Compressed bytes decompressed per piece by iter_final_output()
+    STREAM_PIECE = 64 * 1024
+    
+    @classmethod
+    def iter_final_output(cls, pk):
+        """
+        Yield the final_output of an archived prompt in pieces.
+        
+        The output is decompressed and decoded incrementally, so the whole
+        text is never held at once.
+        
+        Args:
+            pk: Primary key of the prompt
+            
+        Yields:
+            Consecutive pieces of final_output (nothing if the prompt does not exist)
+        """
+        data = cls.objects.filter(pk=pk).values_list('output', flat=True).first()
+        if data is None:
+            return
+        data = memoryview(bytes(data))
+        decompressor = zlib.decompressobj()
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        for start in range(0, len(data), cls.STREAM_PIECE):
+            piece = decoder.decode(decompressor.decompress(data[start:start + cls.STREAM_PIECE]))
+            if piece:
+                yield piece
+        piece = decoder.decode(decompressor.flush(), final=True)
+        if piece:
+            yield piece
+    
+    def get_validation_report(self):
+        """
+        Return the BMAD validation report stored when the prompt was archived.
+        
+        Archived prompts are not re-validated; a missing snapshot is rebuilt
+        in memory only.
+        """
+        from .services.bmad_validator import BMADValidationReport, BMADValidator
+        if self.validation_report:
+            return BMADValidationReport.from_dict(self.validation_report)
+        return BMADValidator.validate(self.final_output)
+
+
+class OutputBlob(models.Model):
+    """
+    One distinct chunk of generated output, shared by every prompt containing it.
+    """
+
+    digest = models.CharField(
+        max_length=64,
+        unique=True,
+        help_text="SHA-256 of the chunk text"
+    )
+    data = models.BinaryField(
+        help_text="Chunk text as UTF-8, zlib-compressed if compressed is set"
+    )
+    compressed = models.BooleanField(
+        default=False,
+        help_text="Whether data is zlib-compressed"
+    )
+    size = models.PositiveIntegerField(
+        help_text="Length of the chunk text in UTF-8 bytes"
+    )
+
+    def __str__(self):
+        return f"{self.digest[:12]} ({self.size} bytes)"
+
+
+class OutputChunk(models.Model):
+    """
+    One chunk, in order, of a generated prompt's output.
+    """
+
+    prompt = models.ForeignKey(
+        GeneratedPrompt,
+        on_delete=models.CASCADE,
+        related_name='output_chunks',
+        help_text="Prompt whose output this chunk belongs to"
+    )
+    position = models.PositiveIntegerField(
+        help_text="Position of the chunk in the output, from 0"
+    )
+    blob = models.ForeignKey(
+        OutputBlob,
+        on_delete=models.PROTECT,
+        related_name='uses',
+        help_text="Stored chunk text"
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['prompt', 'position'], name='unique_output_chunk_position'),
+        ]
+
+    def __str__(self):
+        return f"{self.prompt_id}[{self.position}]: {self.blob_id}"
+
+
+class DashboardStat(models.Model):
+    """
+    A materialized dashboard counter, maintained by DashboardStats.
+
+    Counters are grouped, e.g. ('role', 'developer') or ('templates', 'active'),
+    and adjusted incrementally as templates and prompts change.
+    """
+
+    group = models.CharField(
+        max_length=20,
+        help_text="Counter group: templates, role, phase or prompts"
+    )
+    key = models.CharField(
+        max_length=100,
+        help_text="Counter key within the group"
+    )
+    count = models.IntegerField(
+        default=0,
+        help_text="Current count"
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['group', 'key'], name='unique_dashboard_stat'),
+        ]
+
+    def __str__(self):
+        return f"{self.group}:{self.key} = {self.count}"
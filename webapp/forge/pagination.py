@@ -0,0 +1,244 @@
+"""
+Keyset (cursor) pagination for list views.
+"""
+
+import base64
+import binascii
+import datetime
+import json
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence, Tuple
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from django.http import Http404
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token cannot be decoded for the current ordering."""
+
+
+@dataclass(frozen=True, slots=True)
+class KeysetPage:
+    """
+    One page of a keyset-paginated list.
+
+    Offers the parts of Django's Page that the list templates use, without
+    page numbers: a keyset page only knows its neighbours' cursors.
+    """
+    object_list: List[Any]
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
+    first_cursor: Optional[str] = None
+    last_cursor: Optional[str] = None
+
+    # Lets templates tell keyset pages from numbered ones
+    is_keyset = True
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by seeking past the last row shown.
+
+    Pages are selected with a WHERE clause on the ordering columns rather
+    than OFFSET, and no COUNT(*) is issued, so every page costs one indexed
+    range read of per_page + 1 rows however deep it is. The ordering must
+    end in a unique column (normally the primary key) so that rows sharing
+    the leading values are neither skipped nor repeated.
+
+    Cursors are opaque URL-safe tokens holding the direction and the
+    ordering values of the row to continue from. A cursor without values
+    starts from the beginning (next) or the end (previous) of the list.
+    """
+
+    NEXT = 'n'
+    PREVIOUS = 'p'
+
+    def __init__(self, ordering: Sequence[str], per_page: int):
+        """
+        Args:
+            ordering: Field names as for order_by(); '-' marks descending
+            per_page: Rows per page
+        """
+        self.ordering: Tuple[Tuple[str, bool], ...] = tuple(
+            (name.lstrip('-'), name.startswith('-')) for name in ordering
+        )
+        self.per_page = per_page
+
+    def page(self, queryset, cursor: Optional[str] = None) -> KeysetPage:
+        """
+        Return the page a cursor points to.
+
+        Several querysets, over models sharing the ordering fields, are
+        paginated as one list: each is read up to the page size past the
+        cursor and the rows are merged.
+
+        Args:
+            queryset: Filtered queryset, or a list of them; ordering is replaced
+            cursor: Token from a previous page, or None for the first page
+
+        Returns:
+            KeysetPage
+
+        Raises:
+            InvalidCursor: If the cursor is malformed
+        """
+        querysets = list(queryset) if isinstance(queryset, (list, tuple)) else [queryset]
+        direction, values = self.decode(querysets[0].model, cursor) if cursor else (self.NEXT, None)
+        backwards = direction == self.PREVIOUS
+
+        rows = []
+        for queryset in querysets:
+            queryset = queryset.order_by(*self._order_by(backwards))
+            if values is not None:
+                queryset = queryset.filter(self._seek(values, backwards))
+            rows.extend(queryset[:self.per_page + 1])
+        if len(querysets) > 1:
+            # Stable sorts from the last ordering field to the first
+            for name, descending in reversed(self.ordering):
+                rows.sort(key=lambda row: getattr(row, name), reverse=descending != backwards)
+        more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+
+        if not rows:
+            return KeysetPage([], first_cursor=self.encode(self.NEXT, None) if cursor else None)
+
+        has_next = values is not None if backwards else more
+        has_previous = more if backwards else values is not None
+        return KeysetPage(
+            rows,
+            next_cursor=self.encode(self.NEXT, self._values(rows[-1])) if has_next else None,
+            previous_cursor=self.encode(self.PREVIOUS, self._values(rows[0])) if has_previous else None,
+            first_cursor=self.encode(self.NEXT, None) if has_previous else None,
+            last_cursor=self.encode(self.PREVIOUS, None) if has_next else None,
+        )
+
+    def encode(self, direction: str, values: Optional[List[Any]]) -> str:
+        """Encode a direction and ordering values as a cursor token."""
+        payload = json.dumps([direction, values], default=_cursor_value, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode(self, model, cursor: str) -> Tuple[str, Optional[List[Any]]]:
+        """
+        Decode a cursor token for this paginator's ordering.
+
+        Args:
+            model: Model the ordering fields belong to
+            cursor: Token made by encode()
+
+        Returns:
+            Tuple of (direction, ordering values or None)
+
+        Raises:
+            InvalidCursor: If the token is malformed or does not fit the ordering
+        """
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            direction, raw = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+            raise InvalidCursor(f"Malformed cursor: {e}") from e
+        if direction not in (self.NEXT, self.PREVIOUS):
+            raise InvalidCursor(f"Unknown cursor direction: {direction!r}")
+        if raw is None:
+            return direction, None
+        if not isinstance(raw, list) or len(raw) != len(self.ordering):
+            raise InvalidCursor("Cursor does not match the list ordering")
+        try:
+            values = [
+                model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(self.ordering, raw)
+            ]
+        except (FieldDoesNotExist, ValidationError) as e:
+            raise InvalidCursor(f"Invalid cursor value: {e}") from e
+        return direction, values
+
+    def _order_by(self, backwards: bool) -> List[str]:
+        return [
+            f"{'-' if descending != backwards else ''}{name}"
+            for name, descending in self.ordering
+        ]
+
+    def _seek(self, values: List[Any], backwards: bool) -> Q:
+        """Rows strictly after values in the (possibly reversed) ordering."""
+        condition = Q()
+        for position, (name, descending) in enumerate(self.ordering):
+            lookup = 'lt' if descending != backwards else 'gt'
+            step = Q(**{f'{name}__{lookup}': values[position]})
+            for (earlier, _), value in zip(self.ordering[:position], values):
+                step &= Q(**{earlier: value})
+            condition |= step
+        # Redundant bound on the leading column, so the database seeks the
+        # index to the cursor rather than filtering the rows before it
+        name, descending = self.ordering[0]
+        bound = 'lte' if descending != backwards else 'gte'
+        return Q(**{f'{name}__{bound}': values[0]}) & condition
+
+    def _values(self, row) -> List[Any]:
+        return [getattr(row, row._meta.get_field(name).attname) for name, _ in self.ordering]
+
+
+def _cursor_value(value):
+    # Full precision: DjangoJSONEncoder drops microseconds below milliseconds,
+    # which would no longer match the row a cursor was taken from
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+class KeysetPaginationMixin:
+    """
+    ListView mixin paginating with KeysetPaginator.
+
+    The page is read from the cursor query parameter. Views set
+    keyset_ordering, or override get_keyset_ordering() to return None for
+    querysets that must keep their own ordering (such as relevance-ranked
+    search results), which are then paginated by Django's Paginator.
+    Override get_keyset_querysets() to page through further querysets
+    together with the view's own as one list.
+    """
+
+    keyset_ordering: Sequence[str] = ()
+    cursor_kwarg = 'cursor'
+
+    def get_keyset_ordering(self, queryset) -> Optional[Sequence[str]]:
+        return self.keyset_ordering or None
+
+    def get_keyset_querysets(self, queryset) -> List:
+        return [queryset]
+
+    def paginate_queryset(self, queryset, page_size):
+        ordering = self.get_keyset_ordering(queryset)
+        if ordering is None:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = KeysetPaginator(ordering, page_size)
+        try:
+            page = paginator.page(
+                self.get_keyset_querysets(queryset), self.request.GET.get(self.cursor_kwarg) or None
+            )
+        except InvalidCursor as e:
+            raise Http404(str(e)) from e
+        return (paginator, page, page.object_list, page.has_other_pages())
@@ -6,5 +6,7 @@ from .github_sync import GitHubSyncService
 from .template_parser import TemplateParser
 from .bmad_validator import BMADValidator
 from .document_generator import DocumentGenerator
+from .template_lint import TemplateLinter
+from .typeahead import TypeaheadIndex
 
-__all__ = ['GitHubSyncService', 'TemplateParser', 'BMADValidator', 'DocumentGenerator']
+__all__ = ['GitHubSyncService', 'TemplateParser', 'BMADValidator', 'DocumentGenerator', 'TemplateLinter', 'TypeaheadIndex']
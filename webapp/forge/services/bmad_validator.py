@@ -2,11 +2,17 @@
 BMAD compliance validation service.
 """
 
-from typing import Dict, List, Tuple, Optional, Any
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Tuple, Optional, Any, Sequence, Union
 from dataclasses import dataclass, field
 from enum import Enum
+from .document_analysis import DocumentAnalysis
+from .keyword_matcher import KeywordMatcher
+from .stream_analysis import SectionTally, StreamingAnalysis
+from .validation_cache import ValidationCache
 from .template_parser import (
     TemplateParser,
+    CompiledTemplate,
     SectionMetadata,
     VariableMetadata,
     ValidationSeverity as ParserValidationSeverity,
@@ -31,7 +37,7 @@ class ValidationSeverity(Enum):
         return mapping.get(severity, cls.WARNING)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ValidationResult:
     """Result of a validation check."""
     is_valid: bool
@@ -40,6 +46,27 @@ class ValidationResult:
     section: Optional[str] = None
     details: Optional[Dict] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary accepted by from_dict."""
+        return {
+            'is_valid': self.is_valid,
+            'severity': self.severity.value,
+            'message': self.message,
+            'section': self.section,
+            'details': self.details,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ValidationResult':
+        """Create a ValidationResult from to_dict() output."""
+        return cls(
+            is_valid=data['is_valid'],
+            severity=ValidationSeverity(data['severity']),
+            message=data['message'],
+            section=data.get('section'),
+            details=data.get('details'),
+        )
+
 
 @dataclass
 class BMADValidationReport:
@@ -61,6 +88,10 @@ class BMADValidationReport:
         elif result.severity == ValidationSeverity.WARNING:
             self.score -= 5
     
+    def get_validation_notes(self) -> List[str]:
+        """Return the messages of all checks that raised an issue, followed by the notes."""
+        return [r.message for r in self.results if not r.is_valid] + self.notes
+    
     def get_summary(self) -> Dict:
         """Get a summary dictionary of the validation report."""
         return {
@@ -72,6 +103,31 @@ class BMADValidationReport:
             'total_checks': len(self.results),
             'passed_checks': sum(1 for r in self.results if r.severity != ValidationSeverity.ERROR),
         }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary accepted by from_dict."""
+        return {
+            'is_valid': self.is_valid,
+            'score': self.score,
+            'max_score': self.max_score,
+            'results': [r.to_dict() for r in self.results],
+            'missing_sections': list(self.missing_sections),
+            'unreplaced_variables': list(self.unreplaced_variables),
+            'notes': list(self.notes),
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'BMADValidationReport':
+        """Create a BMADValidationReport from to_dict() output."""
+        return cls(
+            is_valid=data['is_valid'],
+            score=data['score'],
+            max_score=data.get('max_score', 100),
+            results=[ValidationResult.from_dict(r) for r in data.get('results', [])],
+            missing_sections=list(data.get('missing_sections', [])),
+            unreplaced_variables=list(data.get('unreplaced_variables', [])),
+            notes=list(data.get('notes', [])),
+        )
 
 
 class BMADValidator:
@@ -104,23 +160,77 @@ class BMADValidator:
         'qa': ['qa', 'quality assurance', 'tester', 'testing'],
     }
     
+    # Keywords indicating the Output Requirements section specifies a format
+    FORMAT_KEYWORDS = ('format', 'structure', 'output', 'response', 'return')
+    
+    # Keywords validate_stream() must track while the document streams past
+    STREAM_KEYWORDS = {'## Output Requirements': FORMAT_KEYWORDS}
+    
+    # Bump whenever the rules below change so cached results are not reused
+    VALIDATOR_VERSION = 1
+    
     @classmethod
     def validate(cls, prompt_content: str) -> BMADValidationReport:
         """
         Perform comprehensive BMAD validation on a prompt.
         
+        Reports are served from the ValidationCache when the same content
+        has been validated before.
+        
         Args:
             prompt_content: The generated prompt content
             
+        Returns:
+            BMADValidationReport with all validation results
+        """
+        return ValidationCache.get_or_compute(
+            'bmad', cls.VALIDATOR_VERSION, prompt_content,
+            lambda: cls._validate(prompt_content),
+        )
+    
+    @classmethod
+    def _validate(cls, prompt_content: str) -> BMADValidationReport:
+        """Run the BMAD validation rules on a prompt, bypassing the cache."""
+        return cls.validate_analysis(DocumentAnalysis(prompt_content))
+    
+    @classmethod
+    def validate_stream(cls, source) -> BMADValidationReport:
+        """
+        Validate a document read incrementally, with bounded memory.
+        
+        The document is never held in memory as a whole, so very large
+        uploads or stored outputs can be validated without the copies
+        validate() makes. The report is the same validate() would produce.
+        
+        Args:
+            source: File-like object with read(size), or an iterable of str
+                or bytes chunks (bytes are decoded as UTF-8)
+            
+        Returns:
+            BMADValidationReport with all validation results
+        """
+        analysis = StreamingAnalysis.from_stream(source, keywords=cls.STREAM_KEYWORDS)
+        return cls.validate_analysis(analysis)
+    
+    @classmethod
+    def validate_analysis(cls, analysis) -> BMADValidationReport:
+        """
+        Apply the BMAD validation rules to the facts gathered about a document.
+        
+        A StreamingAnalysis must track STREAM_KEYWORDS.
+        
+        Args:
+            analysis: DocumentAnalysis or StreamingAnalysis of the document
+            
         Returns:
             BMADValidationReport with all validation results
         """
         report = BMADValidationReport()
-        content_lower = prompt_content.lower()
+        sections = analysis.sections
         
         # 1. Check for required sections
         for section in cls.REQUIRED_SECTIONS:
-            if section.lower() not in content_lower:
+            if section not in sections:
                 report.missing_sections.append(section)
                 report.add_result(ValidationResult(
                     is_valid=False,
@@ -130,7 +240,7 @@ class BMADValidator:
                 ))
         
         # 2. Check for unreplaced variables
-        unreplaced = TemplateParser.find_unreplaced_variables(prompt_content)
+        unreplaced = analysis.unreplaced_variables
         if unreplaced:
             report.unreplaced_variables = unreplaced
             report.add_result(ValidationResult(
@@ -140,21 +250,9 @@ class BMADValidator:
                 details={'variables': unreplaced}
             ))
         
-        # 3. Check section structure and content
-        sections = TemplateParser.detect_sections(prompt_content)
-        
-        # Check "Your Role" section has content
+        # 3. Check "Your Role" section has content
         if '## Your Role' in sections:
-            role_section = prompt_content[sections['## Your Role'][1]:]
-            next_section_pos = len(role_section)
-            for section in sections:
-                if section != '## Your Role':
-                    pos = role_section.lower().find(section.lower())
-                    if pos != -1:
-                        next_section_pos = pos
-                        break
-            role_content = role_section[:next_section_pos].strip()
-            if len(role_content) < 10:
+            if analysis.section_length('## Your Role') < 10:
                 report.add_result(ValidationResult(
                     is_valid=False,
                     severity=ValidationSeverity.WARNING,
@@ -164,16 +262,7 @@ class BMADValidator:
         
         # 4. Check "Input" section has content
         if '## Input' in sections:
-            input_section = prompt_content[sections['## Input'][1]:]
-            next_section_pos = len(input_section)
-            for section in sections:
-                if section != '## Input':
-                    pos = input_section.lower().find(section.lower())
-                    if pos != -1:
-                        next_section_pos = pos
-                        break
-            input_content = input_section[:next_section_pos].strip()
-            if len(input_content) < 10:
+            if analysis.section_length('## Input') < 10:
                 report.add_result(ValidationResult(
                     is_valid=False,
                     severity=ValidationSeverity.WARNING,
@@ -183,20 +272,8 @@ class BMADValidator:
         
         # 5. Check "Output Requirements" section
         if '## Output Requirements' in sections:
-            output_section = prompt_content[sections['## Output Requirements'][1]:]
-            next_section_pos = len(output_section)
-            for section in sections:
-                if section != '## Output Requirements':
-                    pos = output_section.lower().find(section.lower())
-                    if pos != -1:
-                        next_section_pos = pos
-                        break
-            output_content = output_section[:next_section_pos].strip()
-            
             # Check for specific output format keywords
-            format_keywords = ['format', 'structure', 'output', 'response', 'return']
-            has_format_keyword = any(kw in output_content.lower() for kw in format_keywords)
-            if not has_format_keyword:
+            if not analysis.keywords_in(cls.FORMAT_KEYWORDS, '## Output Requirements'):
                 report.add_result(ValidationResult(
                     is_valid=False,
                     severity=ValidationSeverity.WARNING,
@@ -213,8 +290,8 @@ class BMADValidator:
                 message="Prompt has fewer sections than recommended for BMAD compliance",
             ))
         
-        # 7. Check for meaningful content
-        word_count = len(prompt_content.split())
+        # 7. Check for meaningful content (only the thresholds matter)
+        word_count = analysis.word_count(limit=100)
         if word_count < 50:
             report.add_result(ValidationResult(
                 is_valid=False,
@@ -225,8 +302,7 @@ class BMADValidator:
             report.notes.append("Prompt is relatively short; consider adding more context")
         
         # 8. Check for variable usage (good practice)
-        variable_count = len(TemplateParser.extract_variables(prompt_content))
-        if variable_count > 0 and len(unreplaced) == 0:
+        if analysis.variable_names and len(unreplaced) == 0:
             report.score += 10  # Bonus for using variables properly
         
         # 9. Optional sections bonus
@@ -239,6 +315,92 @@ class BMADValidator:
         
         return report
     
+    @classmethod
+    def validate_many(
+        cls,
+        contents: Sequence[str],
+        executor: Optional[Executor] = None,
+        workers: Optional[int] = None,
+        chunksize: int = 16,
+    ) -> List[BMADValidationReport]:
+        """
+        Validate a batch of prompts, fanning the work out to worker processes.
+        
+        Validation is CPU-bound, so a process pool is used rather than
+        threads. Pass a long-lived executor when validating many batches to
+        avoid starting a pool per call. Bulk runs bypass the ValidationCache:
+        they see each prompt once and would only evict the hot entries.
+        
+        Args:
+            contents: Prompt contents to validate
+            executor: Executor to submit work to (e.g. a ProcessPoolExecutor
+                created with create_pool())
+            workers: Worker processes for a pool created for this call when no
+                executor is given; 1 validates in the current process
+            chunksize: Prompts sent to a worker per task
+            
+        Returns:
+            BMADValidationReport per prompt, in input order
+        """
+        if executor is None and (workers == 1 or len(contents) <= 1):
+            return [cls._validate(content) for content in contents]
+        if executor is None:
+            with cls.create_pool(workers) as pool:
+                return list(pool.map(_validate_in_worker, contents, chunksize=chunksize))
+        return list(executor.map(_validate_in_worker, contents, chunksize=chunksize))
+    
+    @classmethod
+    def snapshot(cls, report: BMADValidationReport, key: str) -> Dict[str, Any]:
+        """
+        Serialize a report for storage alongside the validated content.
+        
+        Args:
+            report: Report produced by validate()
+            key: Content hash of the validated content
+            
+        Returns:
+            Report dictionary stamped with the content hash and validator version
+        """
+        return {
+            'validator_version': cls.VALIDATOR_VERSION,
+            'content_hash': key,
+            **report.to_dict(),
+        }
+    
+    @classmethod
+    def is_snapshot_current(cls, snapshot: Optional[Dict[str, Any]], key: str) -> bool:
+        """
+        Check whether a stored snapshot matches the content and validator.
+        
+        Args:
+            snapshot: Stored snapshot() output, if any
+            key: Content hash of the validated content
+            
+        Returns:
+            True if the snapshot can be used instead of re-validating
+        """
+        return bool(snapshot) and (
+            snapshot.get('validator_version') == cls.VALIDATOR_VERSION
+            and snapshot.get('content_hash') == key
+        )
+    
+    @staticmethod
+    def create_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+        """
+        Create a process pool suitable for validate_many().
+        
+        Workers run django.setup() first so the forge package can be imported
+        under the spawn start method as well as fork.
+        
+        Args:
+            workers: Number of worker processes (default: CPU count)
+            
+        Returns:
+            ProcessPoolExecutor
+        """
+        import django
+        return ProcessPoolExecutor(max_workers=workers, initializer=django.setup)
+    
     @classmethod
     def quick_validate(cls, prompt_content: str) -> Tuple[bool, List[str]]:
         """
@@ -251,15 +413,15 @@ class BMADValidator:
             Tuple of (is_valid, list of issues)
         """
         issues = []
-        content_lower = prompt_content.lower()
+        analysis = DocumentAnalysis(prompt_content)
         
         # Check required sections
         for section in cls.REQUIRED_SECTIONS:
-            if section.lower() not in content_lower:
+            if section not in analysis.sections:
                 issues.append(f"Missing {section}")
         
         # Check for unreplaced variables
-        unreplaced = TemplateParser.find_unreplaced_variables(prompt_content)
+        unreplaced = analysis.unreplaced_variables
         if unreplaced:
             issues.append(f"Unreplaced variables: {', '.join(unreplaced)}")
         
@@ -278,9 +440,8 @@ class BMADValidator:
             ValidationResult for role-specific checks
         """
         keywords = cls.ROLE_KEYWORDS.get(role, [])
-        content_lower = prompt_content.lower()
         
-        has_role_content = any(kw in content_lower for kw in keywords)
+        has_role_content = KeywordMatcher.get(keywords).contains_any(prompt_content)
         
         if not has_role_content:
             return ValidationResult(
@@ -297,6 +458,11 @@ class BMADValidator:
         )
 
 
+def _validate_in_worker(prompt_content: str) -> BMADValidationReport:
+    """Process pool entry point for BMADValidator.validate_many()."""
+    return BMADValidator._validate(prompt_content)
+
+
 def validate_prompt(prompt_content: str) -> Dict:
     """
     Convenience function to validate a prompt and return results.
@@ -329,44 +495,123 @@ class MetadataAwareValidator:
     Enhanced validator that uses template metadata for validation rules.
     """
 
+    # Bump whenever the rules below change so cached results are not reused
+    VALIDATOR_VERSION = 1
+
     @classmethod
     def validate_with_metadata(
         cls,
         prompt_content: str,
-        template_content: str
+        template_content: Union[str, CompiledTemplate]
     ) -> MetadataValidationResult:
         """
         Perform comprehensive validation using template metadata.
 
+        Results are served from the ValidationCache, keyed by both the
+        prompt and the template content.
+
         Args:
             prompt_content: The generated prompt content to validate
-            template_content: The original template content with metadata
+            template_content: The original template content with metadata,
+                or its CompiledTemplate
 
         Returns:
             MetadataValidationResult with detailed validation information
         """
-        result = MetadataValidationResult(is_valid=True)
+        compiled = TemplateParser.compile(template_content)
+        return ValidationCache.get_or_compute(
+            'metadata', cls.VALIDATOR_VERSION, prompt_content,
+            lambda: cls._validate_with_metadata(prompt_content, compiled),
+            template_hash=compiled.content_hash,
+        )
+
+    @classmethod
+    def _validate_with_metadata(
+        cls, prompt_content: str, compiled: CompiledTemplate
+    ) -> MetadataValidationResult:
+        """Run the metadata-driven rules on a prompt, bypassing the cache."""
+        return cls.validate_analysis(DocumentAnalysis(prompt_content), compiled)
+
+    @classmethod
+    def analyze_stream(
+        cls,
+        source,
+        template_content: Union[str, CompiledTemplate],
+        encoding: str = 'utf-8',
+    ) -> StreamingAnalysis:
+        """
+        Gather the facts both validators need from a document read incrementally.
+
+        The template's ValidationPlan is extended with
+        BMADValidator.STREAM_KEYWORDS, so one pass over the source serves
+        BMADValidator.validate_analysis() and validate_analysis().
+
+        Args:
+            source: File-like object with read(size), or an iterable of str
+                or bytes chunks
+            template_content: The original template content or its CompiledTemplate
+            encoding: Encoding of bytes chunks
+
+        Returns:
+            The closed StreamingAnalysis
+        """
+        plan = TemplateParser.compile(template_content).validation_plan
+        return plan.analyze(source, extra_keywords=BMADValidator.STREAM_KEYWORDS, encoding=encoding)
 
-        # Get section metadata with defaults
-        section_metadata = TemplateParser.get_section_metadata_with_defaults(template_content)
-        variable_metadata = TemplateParser.parse_variable_metadata(template_content)
+    @classmethod
+    def validate_stream(
+        cls, source, template_content: Union[str, CompiledTemplate]
+    ) -> MetadataValidationResult:
+        """
+        Validate a document read incrementally against template metadata.
 
-        # Detect sections in prompt
-        sections = TemplateParser.detect_sections(prompt_content)
+        Args:
+            source: File-like object with read(size), or an iterable of str
+                or bytes chunks (bytes are decoded as UTF-8)
+            template_content: The original template content or its CompiledTemplate
 
-        # Extract section content for validation
-        section_contents = cls._extract_section_contents(prompt_content, sections)
+        Returns:
+            MetadataValidationResult, the same validate_with_metadata() would produce
+        """
+        compiled = TemplateParser.compile(template_content)
+        return cls.validate_analysis(cls.analyze_stream(source, compiled), compiled)
+
+    @classmethod
+    def validate_analysis(
+        cls,
+        analysis: Union[DocumentAnalysis, StreamingAnalysis],
+        template_content: Union[str, CompiledTemplate],
+    ) -> MetadataValidationResult:
+        """
+        Execute the template's ValidationPlan over an analyzed document.
+
+        Each section rule reads the statistics of its section from the
+        analysis, so section text is counted at most once and placeholders
+        are never rescanned.
+
+        Args:
+            analysis: DocumentAnalysis of the document, or the
+                StreamingAnalysis built by analyze_stream()
+            template_content: The original template content or its CompiledTemplate
+
+        Returns:
+            MetadataValidationResult with detailed validation information
+        """
+        plan = TemplateParser.compile(template_content).validation_plan
+        result = MetadataValidationResult(is_valid=True)
 
         # Validate each section
         total_completion = 0
         section_count = 0
 
-        for section_name, metadata in section_metadata.items():
-            clean_name = section_name.replace('## ', '')
-            section_content = section_contents.get(section_name, section_contents.get(f'## {section_name}', ''))
+        for rule in plan.rules:
+            clean_name, metadata = rule.name, rule.metadata
+            tally = analysis.section(clean_name, rule.keywords)
+            if tally is not None and not tally.length:
+                tally = None
 
             # Check if required section is missing
-            if metadata.required and not section_content.strip():
+            if metadata.required and tally is None:
                 result.is_valid = False
                 result.errors.append(f"Missing required section: {clean_name}")
                 result.overall_score -= 20
@@ -382,7 +627,7 @@ class MetadataAwareValidator:
 
             # Validate section content
             validation = TemplateParser.validate_section_against_metadata(
-                clean_name, section_content, metadata
+                clean_name, '', metadata, stats=tally or SectionTally(0, rule.keywords)
             )
 
             # Convert to result format
@@ -391,13 +636,13 @@ class MetadataAwareValidator:
                 'section_name': clean_name,
                 'is_valid': validation.is_valid,
                 'severity': severity.value,
-                'errors': validation.errors,
-                'warnings': validation.warnings,
-                'info': validation.info,
+                'errors': list(validation.errors),
+                'warnings': list(validation.warnings),
+                'info': list(validation.info),
                 'word_count': validation.word_count,
                 'min_words': metadata.min_words,
                 'completion_percentage': validation.completion_percentage,
-                'missing_keywords': validation.missing_keywords,
+                'missing_keywords': list(validation.missing_keywords),
             }
             result.section_results.append(section_result)
 
@@ -418,7 +663,7 @@ class MetadataAwareValidator:
             result.completion_percentage = total_completion / section_count
 
         # Check for unreplaced variables
-        unreplaced = TemplateParser.find_unreplaced_variables(prompt_content)
+        unreplaced = analysis.unreplaced_variables
         if unreplaced:
             result.is_valid = False
             result.errors.append(f"Unreplaced variables: {', '.join(unreplaced)}")
@@ -436,55 +681,23 @@ class MetadataAwareValidator:
 
         return result
 
-    @classmethod
-    def _extract_section_contents(
-        cls,
-        content: str,
-        sections: Dict[str, Tuple[int, int]]
-    ) -> Dict[str, str]:
-        """
-        Extract content for each section.
-
-        Args:
-            content: Full document content
-            sections: Dictionary mapping section names to their positions
-
-        Returns:
-            Dictionary mapping section names to their content
-        """
-        section_contents = {}
-        sorted_sections = sorted(sections.items(), key=lambda x: x[1][0])
-
-        for i, (section_name, (start, end)) in enumerate(sorted_sections):
-            # Find the end of this section (start of next section or end of content)
-            if i + 1 < len(sorted_sections):
-                next_start = sorted_sections[i + 1][1][0]
-                section_content = content[end:next_start].strip()
-            else:
-                section_content = content[end:].strip()
-
-            section_contents[section_name] = section_content
-
-        return section_contents
-
     @classmethod
     def get_section_guidance(
         cls,
         section_name: str,
-        template_content: str
+        template_content: Union[str, CompiledTemplate]
     ) -> Dict[str, Any]:
         """
         Get contextual guidance for filling out a section.
 
         Args:
             section_name: Name of the section
-            template_content: Original template content
+            template_content: Original template content or CompiledTemplate
 
         Returns:
             Dictionary with guidance information
         """
-        section_metadata = TemplateParser.get_section_metadata_with_defaults(template_content)
-        metadata = section_metadata.get(section_name)
+        metadata = TemplateParser.compile(template_content).section_metadata.get(section_name)
 
         return TemplateParser.get_section_guidance(section_name, metadata)
 
@@ -493,7 +706,7 @@ class MetadataAwareValidator:
         cls,
         variable_name: str,
         value: str,
-        template_content: str
+        template_content: Union[str, CompiledTemplate]
     ) -> Dict[str, Any]:
         """
         Validate a single variable value.
@@ -501,13 +714,12 @@ class MetadataAwareValidator:
         Args:
             variable_name: Name of the variable
             value: Value to validate
-            template_content: Original template content
+            template_content: Original template content or CompiledTemplate
 
         Returns:
             Dictionary with validation result
         """
-        variable_metadata = TemplateParser.parse_variable_metadata(template_content)
-        metadata = variable_metadata.get(variable_name)
+        metadata = TemplateParser.compile(template_content).variable_metadata.get(variable_name)
 
         is_valid, errors = TemplateParser.validate_variable_value(
             variable_name, value, metadata
@@ -528,7 +740,7 @@ class MetadataAwareValidator:
     def quick_validate_with_metadata(
         cls,
         prompt_content: str,
-        template_content: str
+        template_content: Union[str, CompiledTemplate]
     ) -> Tuple[bool, List[str], int]:
         """
         Quick validation with metadata support.
@@ -0,0 +1,248 @@
+"""
+Materialized dashboard statistics.
+"""
+
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.db import models, transaction
+
+logger = logging.getLogger(__name__)
+
+# (group, key) of one DashboardStat counter
+StatKey = Tuple[str, str]
+
+# Changes collected by DashboardStats.batched() instead of applied one by one
+_pending: ContextVar[Optional[Counter]] = ContextVar('dashboard_stats_pending', default=None)
+
+
+class DashboardStats:
+    """
+    Counts and recent items for the dashboard, kept ready to serve.
+
+    Counters live in the DashboardStat table and are adjusted by the
+    Template and GeneratedPrompt save/delete signals (see forge.signals), so
+    they never require scanning templates. The assembled snapshot, including
+    the recent template and prompt lists, is held in the Django cache and
+    dropped whenever something it shows changes; on a miss it is rebuilt
+    from three indexed queries. recount() rebuilds the counters from
+    scratch; it runs after each sync and from the recount_dashboard_stats
+    command.
+
+    The Django cache is best-effort; if it is unreachable, snapshots are
+    built from the database on every request.
+    """
+
+    CACHE_KEY = 'forge:dashboard:v1'
+    RECENT_LIMIT = 5
+
+    # Default seconds a snapshot is cached (DASHBOARD_STATS_CACHE_TIMEOUT
+    # overrides it); changes invalidate it sooner
+    DEFAULT_TIMEOUT = 60 * 10
+
+    @classmethod
+    def get(cls) -> Dict[str, Any]:
+        """
+        Return the dashboard snapshot.
+
+        Returns:
+            Dictionary with total_templates, templates_by_role,
+            templates_by_phase, total_prompts, recent_templates and
+            recent_prompts
+        """
+        snapshot = cls._cache_get()
+        if snapshot is None:
+            snapshot = cls.build()
+            cls._cache_set(snapshot)
+        return snapshot
+
+    @classmethod
+    def build(cls) -> Dict[str, Any]:
+        """Assemble the snapshot from the counters and the recent rows."""
+        from ..models import DashboardStat, GeneratedPrompt, Template
+
+        counters = {'templates': {}, 'role': {}, 'phase': {}, 'prompts': {}}
+        for group, key, count in DashboardStat.objects.filter(count__gt=0).values_list(
+            'group', 'key', 'count'
+        ):
+            counters.setdefault(group, {})[key] = count
+
+        return {
+            'total_templates': counters['templates'].get('active', 0),
+            'templates_by_role': counters['role'],
+            'templates_by_phase': counters['phase'],
+            'total_prompts': counters['prompts'].get('total', 0),
+            'recent_templates': list(
+                Template.objects.catalogue(Template.objects.filter(is_active=True))
+                .order_by('-created_at')[:cls.RECENT_LIMIT]
+            ),
+            'recent_prompts': list(
+                GeneratedPrompt.objects.select_related('template')
+                .only('pk', 'is_valid', 'created_at', 'template__title')
+                [:cls.RECENT_LIMIT]
+            ),
+        }
+
+    @classmethod
+    def template_counters(cls, is_active: bool, workflow_phase: str, roles: Iterable[str]) -> Counter:
+        """
+        Return the counters one template contributes to.
+
+        Args:
+            is_active: Whether the template is active
+            workflow_phase: Its workflow phase
+            roles: Its roles (Template.get_roles_list())
+
+        Returns:
+            Counter of StatKey to 1; empty for inactive templates
+        """
+        if not is_active:
+            return Counter()
+        counters = Counter({('templates', 'active'): 1, ('phase', workflow_phase): 1})
+        counters.update(('role', role) for role in dict.fromkeys(roles))
+        return counters
+
+    @classmethod
+    def apply(cls, delta: Counter) -> None:
+        """
+        Adjust counters in place and drop the cached snapshot.
+
+        Inside batched() the change is only added to the batch.
+
+        Args:
+            delta: Counter of StatKey to the change in count; may be negative
+        """
+        from ..models import DashboardStat
+
+        pending = _pending.get()
+        if pending is not None:
+            pending.update(delta)
+            return
+        changes = {key: change for key, change in delta.items() if change}
+        if changes:
+            DashboardStat.objects.bulk_create(
+                [DashboardStat(group=group, key=key) for group, key in changes],
+                ignore_conflicts=True,
+            )
+            for (group, key), change in changes.items():
+                DashboardStat.objects.filter(group=group, key=key).update(
+                    count=models.F('count') + change
+                )
+        cls.invalidate()
+
+    @classmethod
+    @contextmanager
+    def batched(cls):
+        """
+        Collect the changes applied inside the block and apply their sum once.
+
+        Bulk operations that fire a signal per row (such as deleting a batch
+        of prompts) then cost one counter update instead of one per row, and
+        none at all when the changes cancel out. Nested blocks join the
+        outermost one.
+        """
+        if _pending.get() is not None:
+            yield
+            return
+        pending = Counter()
+        token = _pending.set(pending)
+        try:
+            yield
+        finally:
+            _pending.reset(token)
+        cls.apply(pending)
+
+    @classmethod
+    def recount(cls) -> Dict[StatKey, int]:
+        """
+        Rebuild every counter from the templates and prompts tables.
+
+        Returns:
+            The new counts by StatKey
+        """
+        from ..models import ArchivedPrompt, DashboardStat, GeneratedPrompt, Template, TemplateRole
+
+        counts = cls.count(Template, TemplateRole, GeneratedPrompt, ArchivedPrompt)
+        with transaction.atomic():
+            DashboardStat.objects.all().delete()
+            DashboardStat.objects.bulk_create(
+                DashboardStat(group=group, key=key, count=count)
+                for (group, key), count in counts.items()
+            )
+        cls.invalidate()
+        return counts
+
+    @staticmethod
+    def count(template_model, role_model, prompt_model, archive_model=None) -> Dict[StatKey, int]:
+        """
+        Count everything the counters track with aggregate queries.
+
+        The models are passed in so migrations can use their historical
+        versions.
+
+        Args:
+            template_model: Template model
+            role_model: TemplateRole model
+            prompt_model: GeneratedPrompt model
+            archive_model: ArchivedPrompt model, whose prompts count too
+
+        Returns:
+            Counts by StatKey
+        """
+        active = template_model.objects.filter(is_active=True)
+        prompts = prompt_model.objects.count()
+        if archive_model is not None:
+            prompts += archive_model.objects.count()
+        counts = {
+            ('templates', 'active'): active.count(),
+            ('prompts', 'total'): prompts,
+        }
+        phases = active.order_by().values('workflow_phase').annotate(n=models.Count('pk'))
+        for row in phases:
+            counts[('phase', row['workflow_phase'])] = row['n']
+        roles = (
+            role_model.objects.filter(template__is_active=True)
+            .order_by().values('role').annotate(n=models.Count('pk'))
+        )
+        for row in roles:
+            counts[('role', row['role'])] = row['n']
+        return counts
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop the cached snapshot once the current transaction commits."""
+        transaction.on_commit(cls._cache_delete)
+
+    @classmethod
+    def _shared_cache(cls):
+        from django.core.cache import caches
+        return caches[getattr(settings, 'DASHBOARD_STATS_CACHE_ALIAS', 'default')]
+
+    @classmethod
+    def _cache_get(cls) -> Optional[Dict[str, Any]]:
+        try:
+            return cls._shared_cache().get(cls.CACHE_KEY)
+        except Exception as e:
+            logger.warning(f"Dashboard stats cache read failed: {e}")
+            return None
+
+    @classmethod
+    def _cache_set(cls, snapshot: Dict[str, Any]) -> None:
+        try:
+            cls._shared_cache().set(
+                cls.CACHE_KEY, snapshot,
+                getattr(settings, 'DASHBOARD_STATS_CACHE_TIMEOUT', cls.DEFAULT_TIMEOUT),
+            )
+        except Exception as e:
+            logger.warning(f"Dashboard stats cache write failed: {e}")
+
+    @classmethod
+    def _cache_delete(cls) -> None:
+        try:
+            cls._shared_cache().delete(cls.CACHE_KEY)
+        except Exception as e:
+            logger.warning(f"Dashboard stats cache delete failed: {e}")
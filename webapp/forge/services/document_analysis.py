@@ -0,0 +1,185 @@
+"""
+Single-scan document analysis for prompt validation.
+"""
+
+from bisect import bisect_left
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .heading_index import HeadingIndex
+from .keyword_matcher import KeywordMatcher
+from .stream_analysis import SectionTally
+from .template_parser import TemplateParser, TemplateVariable
+
+
+class DocumentAnalysis:
+    """
+    Facts about a generated document that the validators evaluate rules over.
+
+    The document is scanned once, left to right, for headings and variable
+    placeholders. Everything else (section text, word counts and keyword
+    hits) is derived from the slices those offsets delimit, computed on first
+    use and cached, so a rule that only needs one section never touches the
+    rest of a large document.
+    """
+
+    # Word counting proceeds in line-aligned chunks of roughly this size, so a
+    # bounded count can stop early
+    WORD_COUNT_CHUNK = 4096
+
+    def __init__(self, content: str):
+        """
+        Scan a document.
+
+        Args:
+            content: Document content
+        """
+        self.content = content or ''
+        self.index = HeadingIndex(
+            self.content, HeadingIndex.scan_headings(self.content, word_counts=False)
+        )
+        self.variables: Tuple[TemplateVariable, ...] = tuple(
+            TemplateParser.scan_variables(self.content)
+        )
+
+        # BMAD section name -> position of the heading that provides it
+        self.sections: Dict[str, int] = {}
+        for section in TemplateParser.ALL_SECTIONS:
+            i = self.index.find(section, prefix=True)
+            if i is not None:
+                self.sections[section] = i
+
+        self._section_text: Dict[str, str] = {}
+        self._section_words: Dict[str, int] = {}
+        self._word_count: Optional[int] = None
+        self._named: Optional[Dict[str, int]] = None
+        self._variable_starts: Optional[List[int]] = None
+
+    @property
+    def section_spans(self) -> Dict[str, Tuple[int, int]]:
+        """Detected BMAD sections mapped to their heading (start, end) offsets."""
+        return {
+            section: (self.index.headings[i].start_pos, self.index.headings[i].end_pos)
+            for section, i in self.sections.items()
+        }
+
+    @property
+    def variable_names(self) -> List[str]:
+        """Distinct variable names, in order of first occurrence."""
+        return list(dict.fromkeys(var.name for var in self.variables))
+
+    @property
+    def unreplaced_variables(self) -> List[str]:
+        """Sorted names of placeholders without a default value."""
+        return sorted({var.name for var in self.variables if var.default_value is None})
+
+    def section_text(self, section: str) -> str:
+        """
+        Return the stripped body of a detected BMAD section, including subsections.
+
+        Args:
+            section: BMAD section name, e.g. '## Input'
+
+        Returns:
+            Section body, or '' if the section was not detected
+        """
+        text = self._section_text.get(section)
+        if text is None:
+            i = self.sections.get(section)
+            if i is None:
+                text = ''
+            else:
+                start, end = self.index.section_span(i, include_subsections=True)
+                text = self.content[start:end].strip()
+            self._section_text[section] = text
+        return text
+
+    def section_length(self, section: str) -> int:
+        """Return the stripped length of a detected BMAD section (0 if missing)."""
+        return len(self.section_text(section))
+
+    def section(self, name: str, keywords: Iterable[str] = ()) -> Optional[SectionTally]:
+        """
+        Return the statistics of a section by name, including subsections.
+
+        BMAD sections are looked up by canonical name (so 'Input' is the
+        section a '## Input Data' heading provides); other names by the first
+        heading with exactly that name. Placeholders come from the initial
+        scan, so only the section's words and keywords are counted here.
+
+        Args:
+            name: Section name without '#' markers
+            keywords: Keywords to track in the section
+
+        Returns:
+            SectionTally, or None if the section did not occur
+        """
+        i = self.sections.get(f'## {name}')
+        if i is None:
+            if self._named is None:
+                self._named = {}
+                for position, heading in enumerate(self.index):
+                    self._named.setdefault(heading.name, position)
+            i = self._named.get(name)
+            if i is None:
+                return None
+
+        start, end = self.index.section_span(i, include_subsections=True)
+        if self._variable_starts is None:
+            self._variable_starts = [var.start_pos for var in self.variables]
+        variables = self.variables[
+            bisect_left(self._variable_starts, start):bisect_left(self._variable_starts, end)
+        ]
+        text = self.content[start:end]
+        tally = SectionTally(self.index.headings[i].level, keywords)
+        tally.add(text, start, len(text.split()), variables, text)
+        return tally
+
+    def section_word_count(self, section: str) -> int:
+        """Return the number of words in a detected BMAD section (0 if missing)."""
+        count = self._section_words.get(section)
+        if count is None:
+            count = self._section_words[section] = len(self.section_text(section).split())
+        return count
+
+    def word_count(self, limit: Optional[int] = None) -> int:
+        """
+        Return the number of words in the document.
+
+        Args:
+            limit: Stop counting once at least this many words have been
+                seen, for callers that only compare against a threshold
+
+        Returns:
+            Word count (a lower bound of at least limit when counting stopped early)
+        """
+        if self._word_count is not None:
+            return self._word_count
+
+        content = self.content
+        count = 0
+        pos = 0
+        while pos < len(content):
+            # Cut at a line break so no word is split between chunks
+            end = content.find('\n', pos + self.WORD_COUNT_CHUNK)
+            end = len(content) if end == -1 else end + 1
+            count += len(content[pos:end].split())
+            pos = end
+            if limit is not None and count >= limit and pos < len(content):
+                return count
+
+        self._word_count = count
+        return count
+
+    def keywords_in(self, keywords: Iterable[str], section: Optional[str] = None) -> FrozenSet[str]:
+        """
+        Return the keywords that occur in the document or one of its sections.
+
+        Args:
+            keywords: Keywords to look for (case-insensitive substrings)
+            section: BMAD section to search, or None for the whole document
+
+        Returns:
+            Set of the lowercased keywords found
+        """
+        text = self.content if section is None else self.section_text(section)
+        return KeywordMatcher.get(tuple(keywords)).find_all(text)
@@ -2,13 +2,17 @@
 Document generation service for interactive template-based document creation.
 """
 
-import re
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, Union
 from dataclasses import dataclass, field
 from enum import Enum
 
+from .heading_index import HeadingIndex
+from .keyword_matcher import KeywordMatcher
+from .section_stats import SectionStats
+from .validation_cache import ValidationCache
 from .template_parser import (
     TemplateParser,
+    CompiledTemplate,
     SectionMetadata,
     VariableMetadata,
     ValidationSeverity,
@@ -49,23 +53,23 @@ class RealTimeValidation:
     unreplaced_variables: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EnhancedRealTimeValidation:
     """Enhanced real-time validation result with severity levels and metadata support."""
     is_valid: bool
     section_name: str
     severity: ValidationSeverity = ValidationSeverity.INFO
-    errors: List[str] = field(default_factory=list)  # Critical issues
-    warnings: List[str] = field(default_factory=list)  # Non-critical issues
-    info: List[str] = field(default_factory=list)  # Informational messages
-    suggestions: List[str] = field(default_factory=list)  # Improvement suggestions
-    unreplaced_variables: List[str] = field(default_factory=list)
-    missing_keywords: List[str] = field(default_factory=list)
+    errors: Tuple[str, ...] = ()  # Critical issues
+    warnings: Tuple[str, ...] = ()  # Non-critical issues
+    info: Tuple[str, ...] = ()  # Informational messages
+    suggestions: Tuple[str, ...] = ()  # Improvement suggestions
+    unreplaced_variables: Tuple[str, ...] = ()
+    missing_keywords: Tuple[str, ...] = ()
     word_count: int = 0
     min_words: int = 10
     completion_percentage: float = 0.0
     help_text: str = ""
-    examples: List[str] = field(default_factory=list)
+    examples: Tuple[str, ...] = ()
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -73,17 +77,17 @@ class EnhancedRealTimeValidation:
             'is_valid': self.is_valid,
             'section_name': self.section_name,
             'severity': self.severity.value,
-            'errors': self.errors,
-            'warnings': self.warnings,
-            'info': self.info,
-            'suggestions': self.suggestions,
-            'unreplaced_variables': self.unreplaced_variables,
-            'missing_keywords': self.missing_keywords,
+            'errors': list(self.errors),
+            'warnings': list(self.warnings),
+            'info': list(self.info),
+            'suggestions': list(self.suggestions),
+            'unreplaced_variables': list(self.unreplaced_variables),
+            'missing_keywords': list(self.missing_keywords),
             'word_count': self.word_count,
             'min_words': self.min_words,
             'completion_percentage': self.completion_percentage,
             'help_text': self.help_text,
-            'examples': self.examples,
+            'examples': list(self.examples),
         }
 
 
@@ -107,38 +111,83 @@ class DocumentGenerator:
     """
     
     # Section heading patterns
-    HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.+)$', re.MULTILINE)
-    VARIABLE_PATTERN = re.compile(r'\{\{(\w+)\}\}|\[(\w+)\]')
+    HEADING_PATTERN = TemplateParser.HEADING_PATTERN
     
     # Minimum content requirements
     MIN_SECTION_WORDS = 10
     MIN_MEANINGFUL_LENGTH = 20
     
+    # Bump whenever the validation rules change so cached results are not reused
+    VALIDATOR_VERSION = 1
+    
+    # Suggestion rules: (section name terms, keywords, suggestion).
+    # A suggestion applies to sections whose name contains any of the terms
+    # when the content contains none of the keywords.
+    CONTENT_SUGGESTION_RULES = (
+        (('role',),
+         ('responsibility', 'task', 'goal', 'objective', 'you will'),
+         "Consider specifying clear responsibilities or objectives for this role."),
+        (('input',),
+         ('provide', 'given', 'receive', 'include'),
+         "Consider specifying what inputs or data will be provided."),
+        (('output', 'requirement'),
+         ('format', 'structure', 'include', 'return', 'produce'),
+         "Consider specifying the expected output format or structure."),
+    )
+    ENHANCED_SUGGESTION_RULES = (
+        (('role',),
+         ('responsibility', 'task', 'goal', 'objective', 'you will', 'you are'),
+         "Consider specifying clear responsibilities or objectives for this role."),
+        (('role',),
+         ('expert', 'specialist', 'professional'),
+         "Consider establishing expertise level or domain specialization."),
+        (('input',),
+         ('provide', 'given', 'receive', 'include', 'expect'),
+         "Consider specifying what inputs or data will be provided."),
+        (('input',),
+         ('format', 'structure', 'type'),
+         "Consider describing the format or structure of expected inputs."),
+        (('output', 'requirement'),
+         ('format', 'structure', 'include', 'return', 'produce'),
+         "Consider specifying the expected output format or structure."),
+        (('output', 'requirement'),
+         ('deliverable', 'file', 'document', 'response'),
+         "Consider specifying the type of deliverable expected."),
+        (('context',),
+         ('background', 'situation', 'environment'),
+         "Consider providing background information or situational context."),
+        (('constraint',),
+         ('must', 'should', 'cannot', 'avoid', 'limit'),
+         "Consider clearly stating what must or must not be done."),
+    )
+    
     @classmethod
-    def extract_sections(cls, content: str) -> List[TemplateSection]:
+    def extract_sections(
+        cls, content: Union[str, CompiledTemplate]
+    ) -> List[TemplateSection]:
         """
         Extract all sections from template content.
         
         Args:
-            content: Template content string
+            content: Template content string or CompiledTemplate (whose
+                precomputed headings are reused)
             
         Returns:
             List of TemplateSection objects
         """
+        if isinstance(content, CompiledTemplate):
+            index = content.heading_index
+        else:
+            index = HeadingIndex.build(content)
+        content = index.content
+
         sections = []
-        matches = list(cls.HEADING_PATTERN.finditer(content))
-        
-        for i, match in enumerate(matches):
-            heading_level = len(match.group(1))
-            section_name = match.group(2).strip()
-            start_pos = match.end()
-            
-            # Determine end position (next heading or end of content)
-            if i + 1 < len(matches):
-                end_pos = matches[i + 1].start()
-            else:
-                end_pos = len(content)
+        for i, heading in enumerate(index):
+            heading_level = heading.level
+            section_name = heading.name
             
+            # Section body runs to the next heading or end of content
+            start_pos, end_pos = index.section_span(i)
             section_content = content[start_pos:end_pos].strip()
             
             # Extract variables in this section
@@ -152,7 +201,7 @@ class DocumentGenerator:
                 level=heading_level,
                 content=section_content,
                 description=description,
-                start_pos=match.start(),
+                start_pos=heading.start_pos,
                 end_pos=end_pos,
                 variables=variables,
             )
@@ -163,12 +212,7 @@ class DocumentGenerator:
     @classmethod
     def _extract_variables_from_text(cls, text: str) -> List[str]:
         """Extract variable names from text."""
-        matches = cls.VARIABLE_PATTERN.findall(text)
-        variables = set()
-        for match in matches:
-            var_name = match[0] if match[0] else match[1]
-            variables.add(var_name)
-        return sorted(list(variables))
+        return TemplateParser.extract_variables_simple(text)
     
     @classmethod
     def _generate_section_description(cls, content: str) -> str:
@@ -233,6 +277,9 @@ class DocumentGenerator:
         
         False positive rate target: < 5%
         
+        Results are served from the ValidationCache when the same section
+        content has been validated before.
+        
         Args:
             section_name: Name of the section being validated
             content: Content to validate
@@ -240,13 +287,21 @@ class DocumentGenerator:
         Returns:
             RealTimeValidation result
         """
+        return ValidationCache.get_or_compute(
+            'section', cls.VALIDATOR_VERSION, f'{section_name}\0{content}',
+            lambda: cls._validate_section_content(section_name, content),
+        )
+    
+    @classmethod
+    def _validate_section_content(cls, section_name: str, content: str) -> RealTimeValidation:
+        """Run the real-time section rules, bypassing the cache."""
         result = RealTimeValidation(
             is_valid=True,
             section_name=section_name,
         )
         
         # Check for unreplaced variables (100% detection rate requirement)
-        unreplaced = cls._extract_variables_from_text(content)
+        unreplaced = TemplateParser.find_unreplaced_variables(content)
         if unreplaced:
             result.is_valid = False
             result.unreplaced_variables = unreplaced
@@ -279,37 +334,27 @@ class DocumentGenerator:
         cls, section_name: str, content: str, result: RealTimeValidation
     ) -> None:
         """Add content improvement suggestions based on section type."""
-        section_lower = section_name.lower()
-        content_lower = content.lower()
-        
-        # Role section suggestions
-        if 'role' in section_lower:
-            if not any(word in content_lower for word in 
-                      ['responsibility', 'task', 'goal', 'objective', 'you will']):
-                result.suggestions.append(
-                    "Consider specifying clear responsibilities or objectives for this role."
-                )
+        rules = cls._applicable_rules(cls.CONTENT_SUGGESTION_RULES, section_name)
+        if not rules:
+            return
+        found = KeywordMatcher.get(
+            [word for _, keywords, _ in rules for word in keywords]
+        ).find_all(content)
         
-        # Input section suggestions
-        if 'input' in section_lower:
-            if not any(word in content_lower for word in 
-                      ['provide', 'given', 'receive', 'include']):
-                result.suggestions.append(
-                    "Consider specifying what inputs or data will be provided."
-                )
-        
-        # Output section suggestions
-        if 'output' in section_lower or 'requirement' in section_lower:
-            if not any(word in content_lower for word in 
-                      ['format', 'structure', 'include', 'return', 'produce']):
-                result.suggestions.append(
-                    "Consider specifying the expected output format or structure."
-                )
+        for _, keywords, suggestion in rules:
+            if not any(word in found for word in keywords):
+                result.suggestions.append(suggestion)
+    
+    @staticmethod
+    def _applicable_rules(rules, section_name: str) -> List[Tuple]:
+        """Return the suggestion rules whose section terms occur in the section name."""
+        section_lower = section_name.lower()
+        return [rule for rule in rules if any(term in section_lower for term in rule[0])]
     
     @classmethod
     def generate_document(
         cls, 
-        template_content: str, 
+        template_content: Union[str, CompiledTemplate], 
         section_data: Dict[str, str],
         variable_data: Dict[str, str]
     ) -> Tuple[str, List[RealTimeValidation]]:
@@ -317,22 +362,24 @@ class DocumentGenerator:
         Generate a complete document from template with user-provided section data.
         
         Args:
-            template_content: Original template content
+            template_content: Original template content or CompiledTemplate
             section_data: Dictionary mapping section names to user content
             variable_data: Dictionary mapping variable names to values
             
         Returns:
             Tuple of (generated document, list of validation results)
         """
-        result = template_content
         validations = []
         
-        # First, substitute all variables
-        for var_name, value in variable_data.items():
-            result = result.replace('{{' + var_name + '}}', str(value))
-            result = result.replace('[' + var_name + ']', str(value))
+        # First, substitute all variables in one pass over the template
+        rendered = TemplateParser.render(template_content, variable_data)
+        result = rendered.output
+        unreplaced = set(rendered.unreplaced)
         
-        # Replace section content where provided
+        # Append user content to sections, splicing by offset so the
+        # document is rebuilt once rather than once per section
+        parts = []
+        pos = 0
         sections = cls.extract_sections(result)
         for section in sections:
             if section.name in section_data and section_data[section.name]:
@@ -343,15 +390,18 @@ class DocumentGenerator:
                 validations.append(validation)
                 
                 # If the section has the original template content, append user content
-                # Otherwise replace placeholder content
                 if section.content.strip():
-                    # Append user content after existing content
-                    old_section = section.content
-                    new_section = f"{section.content}\n\n{user_content}"
-                    result = result.replace(old_section, new_section, 1)
+                    unreplaced.update(validation.unreplaced_variables)
+                    raw = result[section.start_pos:section.end_pos]
+                    insert_at = section.start_pos + len(raw.rstrip())
+                    parts.append(result[pos:insert_at])
+                    parts.append(f"\n\n{user_content}")
+                    pos = insert_at
+        parts.append(result[pos:])
+        result = ''.join(parts)
         
-        # Final validation pass for unreplaced variables
-        final_unreplaced = cls._extract_variables_from_text(result)
+        # Unreplaced variables were collected while rendering and validating
+        final_unreplaced = sorted(unreplaced)
         if final_unreplaced:
             validations.append(RealTimeValidation(
                 is_valid=False,
@@ -363,12 +413,12 @@ class DocumentGenerator:
         return result, validations
     
     @classmethod
-    def get_wizard_steps(cls, content: str) -> List[Dict]:
+    def get_wizard_steps(cls, content: Union[str, CompiledTemplate]) -> List[Dict]:
         """
         Generate wizard steps from template content.
         
         Args:
-            content: Template content
+            content: Template content or CompiledTemplate
             
         Returns:
             List of wizard step configurations
@@ -400,12 +450,23 @@ class DocumentGenerator:
         - 100% detection rate for missing sections and unreplaced variables
         - False positive rate < 5%
 
+        Reports are served from the ValidationCache when the same content
+        has been validated before.
+
         Args:
             content: Document content to validate
 
         Returns:
             Compliance validation report
         """
+        return ValidationCache.get_or_compute(
+            'compliance', cls.VALIDATOR_VERSION, content,
+            lambda: cls._validate_document_compliance(content),
+        )
+
+    @classmethod
+    def _validate_document_compliance(cls, content: str) -> Dict:
+        """Run the document compliance rules, bypassing the cache."""
         report = {
             'is_compliant': True,
             'compliance_score': 100,
@@ -426,7 +487,7 @@ class DocumentGenerator:
                 report['issues'].append(f"Missing required section: {section}")
 
         # Check for unreplaced variables (100% detection)
-        unreplaced = cls._extract_variables_from_text(content)
+        unreplaced = TemplateParser.find_unreplaced_variables(content)
         if unreplaced:
             report['unreplaced_variables'] = unreplaced
             report['compliance_score'] -= 15 * len(unreplaced)
@@ -450,141 +511,135 @@ class DocumentGenerator:
 
         return report
 
+    @classmethod
+    def section_keywords(
+        cls, section_name: str, metadata: Optional[SectionMetadata] = None
+    ) -> List[str]:
+        """
+        List every keyword real-time validation checks for in a section.
+
+        Args:
+            section_name: Name of the section
+            metadata: Declared SectionMetadata, if any
+
+        Returns:
+            Metadata keywords plus those of the applicable suggestion rules
+        """
+        metadata = TemplateParser.resolve_section_metadata(section_name, metadata)
+        keywords = list(metadata.keywords_required) + list(metadata.keywords_recommended)
+        for _, rule_keywords, _ in cls._applicable_rules(cls.ENHANCED_SUGGESTION_RULES, section_name):
+            keywords.extend(rule_keywords)
+        return keywords
+
     @classmethod
     def validate_section_with_metadata(
         cls,
         section_name: str,
         content: str,
-        template_content: str
+        template_content: Union[str, CompiledTemplate],
+        stats: Optional[SectionStats] = None,
     ) -> EnhancedRealTimeValidation:
         """
         Perform enhanced real-time validation on section content using metadata.
 
+        Results are served from the ValidationCache, keyed by the section
+        name, its content and the template content. Calls passing stats
+        bypass the cache: they come from the incremental real-time path,
+        where hashing the whole section and a cache round trip per
+        keystroke would cost more than the validation itself.
+
         Args:
             section_name: Name of the section being validated
             content: Content to validate
-            template_content: Full template content (for metadata parsing)
+            template_content: Full template content or CompiledTemplate (for metadata)
+            stats: SectionStats tracking the content, built with
+                section_keywords() (for example from an incremental validation
+                session); computed from content if None
 
         Returns:
             EnhancedRealTimeValidation result with severity levels
         """
+        compiled = TemplateParser.compile(template_content)
+        if stats is not None:
+            return cls._validate_section_with_metadata(section_name, content, compiled, stats)
+        return ValidationCache.get_or_compute(
+            'section_metadata', cls.VALIDATOR_VERSION, f'{section_name}\0{content}',
+            lambda: cls._validate_section_with_metadata(section_name, content, compiled, stats),
+            template_hash=compiled.content_hash,
+        )
+
+    @classmethod
+    def _validate_section_with_metadata(
+        cls,
+        section_name: str,
+        content: str,
+        compiled: CompiledTemplate,
+        stats: Optional[SectionStats],
+    ) -> EnhancedRealTimeValidation:
+        """Run the metadata-driven section rules, bypassing the cache."""
         # Get section metadata with defaults
-        section_metadata = TemplateParser.get_section_metadata_with_defaults(template_content)
-        metadata = section_metadata.get(section_name)
+        metadata = compiled.section_metadata.get(section_name)
+        if stats is None:
+            stats = SectionStats(content, cls.section_keywords(section_name, metadata))
 
         # Perform validation
         validation_result = TemplateParser.validate_section_against_metadata(
-            section_name, content, metadata
+            section_name, content, metadata, stats=stats
         )
 
-        # Convert to EnhancedRealTimeValidation
-        result = EnhancedRealTimeValidation(
-            is_valid=validation_result.is_valid,
+        errors = list(validation_result.errors)
+        unreplaced = stats.unreplaced_variables
+        if unreplaced:
+            errors.append(f"Unreplaced variables found: {', '.join(unreplaced)}")
+
+        return EnhancedRealTimeValidation(
+            is_valid=validation_result.is_valid and not unreplaced,
             section_name=section_name,
             severity=validation_result.severity,
-            errors=validation_result.errors,
+            errors=tuple(errors),
             warnings=validation_result.warnings,
             info=validation_result.info,
+            suggestions=cls._enhanced_content_suggestions(section_name, stats),
+            unreplaced_variables=tuple(unreplaced),
             missing_keywords=validation_result.missing_keywords,
             word_count=validation_result.word_count,
             min_words=metadata.min_words if metadata else 10,
             completion_percentage=validation_result.completion_percentage,
+            # Metadata-based guidance
+            help_text=metadata.help_text if metadata else "",
+            examples=metadata.examples if metadata else (),
         )
 
-        # Add metadata-based guidance
-        if metadata:
-            result.help_text = metadata.help_text
-            result.examples = metadata.examples
-
-        # Add content-based suggestions
-        cls._add_enhanced_content_suggestions(section_name, content, result)
-
-        # Check for unreplaced variables
-        unreplaced = cls._extract_variables_from_text(content)
-        if unreplaced:
-            result.is_valid = False
-            result.unreplaced_variables = unreplaced
-            result.errors.append(
-                f"Unreplaced variables found: {', '.join(unreplaced)}"
-            )
-
-        return result
-
     @classmethod
-    def _add_enhanced_content_suggestions(
+    def _enhanced_content_suggestions(
         cls,
         section_name: str,
-        content: str,
-        result: EnhancedRealTimeValidation
-    ) -> None:
-        """Add enhanced content improvement suggestions based on section type and metadata."""
-        section_lower = section_name.lower()
-        content_lower = content.lower()
-
-        # Role section suggestions
-        if 'role' in section_lower:
-            if not any(word in content_lower for word in
-                      ['responsibility', 'task', 'goal', 'objective', 'you will', 'you are']):
-                result.suggestions.append(
-                    "Consider specifying clear responsibilities or objectives for this role."
-                )
-            if not any(word in content_lower for word in ['expert', 'specialist', 'professional']):
-                result.suggestions.append(
-                    "Consider establishing expertise level or domain specialization."
-                )
-
-        # Input section suggestions
-        if 'input' in section_lower:
-            if not any(word in content_lower for word in
-                      ['provide', 'given', 'receive', 'include', 'expect']):
-                result.suggestions.append(
-                    "Consider specifying what inputs or data will be provided."
-                )
-            if not any(word in content_lower for word in ['format', 'structure', 'type']):
-                result.suggestions.append(
-                    "Consider describing the format or structure of expected inputs."
-                )
-
-        # Output section suggestions
-        if 'output' in section_lower or 'requirement' in section_lower:
-            if not any(word in content_lower for word in
-                      ['format', 'structure', 'include', 'return', 'produce']):
-                result.suggestions.append(
-                    "Consider specifying the expected output format or structure."
-                )
-            if not any(word in content_lower for word in ['deliverable', 'file', 'document', 'response']):
-                result.suggestions.append(
-                    "Consider specifying the type of deliverable expected."
-                )
-
-        # Context section suggestions
-        if 'context' in section_lower:
-            if not any(word in content_lower for word in ['background', 'situation', 'environment']):
-                result.suggestions.append(
-                    "Consider providing background information or situational context."
-                )
-
-        # Constraints section suggestions
-        if 'constraint' in section_lower:
-            if not any(word in content_lower for word in ['must', 'should', 'cannot', 'avoid', 'limit']):
-                result.suggestions.append(
-                    "Consider clearly stating what must or must not be done."
-                )
+        stats: SectionStats,
+    ) -> Tuple[str, ...]:
+        """Return enhanced content improvement suggestions based on section type and metadata."""
+        return tuple(
+            suggestion
+            for _, keywords, suggestion in cls._applicable_rules(
+                cls.ENHANCED_SUGGESTION_RULES, section_name
+            )
+            if not any(stats.has_keyword(word) for word in keywords)
+        )
 
     @classmethod
-    def get_enhanced_wizard_steps(cls, content: str) -> List[Dict]:
+    def get_enhanced_wizard_steps(cls, content: Union[str, CompiledTemplate]) -> List[Dict]:
         """
         Generate enhanced wizard steps from template content with metadata support.
 
         Args:
-            content: Template content
+            content: Template content or CompiledTemplate
 
         Returns:
             List of enhanced wizard step configurations
         """
-        sections = cls.extract_sections(content)
-        section_metadata = TemplateParser.get_section_metadata_with_defaults(content)
-        variable_metadata = TemplateParser.parse_variable_metadata(content)
+        compiled = TemplateParser.compile(content)
+        sections = cls.extract_sections(compiled)
+        section_metadata = compiled.section_metadata
+        variable_metadata = compiled.variable_metadata
         steps = []
 
         # If there are variables defined in frontmatter, add a preliminary variables step
@@ -692,7 +747,7 @@ class DocumentGenerator:
         wizard_steps: List[Dict],
         section_data: Dict[str, str],
         variable_data: Dict[str, str],
-        template_content: str
+        template_content: Union[str, CompiledTemplate]
     ) -> Dict[str, Any]:
         """
         Calculate overall completion status and per-step status.
@@ -701,11 +756,12 @@ class DocumentGenerator:
             wizard_steps: List of wizard step configurations
             section_data: Dictionary mapping section names to user content
             variable_data: Dictionary mapping variable names to values
-            template_content: Original template content
+            template_content: Original template content or CompiledTemplate
 
         Returns:
             Dictionary with completion status information
         """
+        template_content = TemplateParser.compile(template_content)
         step_statuses = []
         total_completion = 0
         total_errors = 0
@@ -754,7 +810,7 @@ class DocumentGenerator:
 
         # Check variables
         variable_errors = []
-        variable_metadata = TemplateParser.parse_variable_metadata(template_content)
+        variable_metadata = template_content.variable_metadata
         for var_name, var_value in variable_data.items():
             metadata = variable_metadata.get(var_name)
             is_valid, errors = TemplateParser.validate_variable_value(var_name, var_value, metadata)
@@ -785,18 +841,19 @@ class DocumentGenerator:
         }
 
     @classmethod
-    def get_section_help(cls, section_name: str, template_content: str) -> Dict:
+    def get_section_help(
+        cls, section_name: str, template_content: Union[str, CompiledTemplate]
+    ) -> Dict:
         """
         Get contextual help and guidance for a section.
 
         Args:
             section_name: Name of the section
-            template_content: Full template content
+            template_content: Full template content or CompiledTemplate
 
         Returns:
             Dictionary with help information
         """
-        section_metadata = TemplateParser.get_section_metadata_with_defaults(template_content)
-        metadata = section_metadata.get(section_name)
+        metadata = TemplateParser.compile(template_content).section_metadata.get(section_name)
 
         return TemplateParser.get_section_guidance(section_name, metadata)
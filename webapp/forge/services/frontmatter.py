@@ -0,0 +1,293 @@
+"""
+YAML frontmatter extraction and parsing for templates.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as YAMLLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as YAMLLoader
+
+
+class UnsupportedSyntax(Exception):
+    """Raised by the fast path for frontmatter outside the restricted schema."""
+
+
+class FrontmatterParser:
+    """
+    Locates and parses the YAML frontmatter block at the start of a template.
+
+    BMAD templates only use a small slice of YAML: block mappings, block
+    sequences of scalars, and plain or quoted scalars on a single line.
+    parse_simple() handles exactly that slice without going through a YAML
+    parser and produces the same values yaml.safe_load() would; anything it
+    is not certain about raises UnsupportedSyntax and load() falls back to
+    full YAML (libyaml's CSafeLoader when available).
+    """
+
+    # A line holding only the closing '---' (surrounding whitespace allowed)
+    CLOSING_DELIMITER = re.compile(r'^[^\S\n]*---[^\S\n]*$', re.MULTILINE)
+
+    # Tabs, plus characters the YAML reader rejects or treats as line breaks / BOM
+    UNSAFE_CHARS = re.compile(
+        '[^\n\r\x20-\x7e\xa0-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]'
+        '|[\x85\u2028\u2029\ufeff]'
+    )
+
+    PLAIN_KEY = re.compile(r'[A-Za-z_](?:[A-Za-z0-9_ -]*[A-Za-z0-9_])?\Z')
+    INT_PATTERN = re.compile(r'[-+]?(?:0|[1-9][0-9]*)\Z')
+    FLOAT_PATTERN = re.compile(r'[-+]?(?:0|[1-9][0-9]*)\.[0-9]+\Z')
+
+    # Plain scalars YAML 1.1 resolves to null or bool
+    SPECIAL_SCALARS: Dict[str, Any] = {
+        **dict.fromkeys(['~', 'null', 'Null', 'NULL'], None),
+        **dict.fromkeys(
+            ['yes', 'Yes', 'YES', 'true', 'True', 'TRUE', 'on', 'On', 'ON'], True
+        ),
+        **dict.fromkeys(
+            ['no', 'No', 'NO', 'false', 'False', 'FALSE', 'off', 'Off', 'OFF'], False
+        ),
+    }
+
+    # First characters that make a plain scalar anything but a simple string
+    INDICATORS = frozenset('-?:,[]{}#&*!|>\'"%@`=<~.+0123456789')
+
+    SINGLE_QUOTED = re.compile(r"'((?:[^']|'')*)'")
+    DOUBLE_QUOTED = re.compile(r'"((?:[^"\\]|\\.)*)"')
+    ESCAPE_SEQUENCE = re.compile(r'\\(.)')
+    ESCAPES = {'\\': '\\', '"': '"', '/': '/', 'n': '\n', 't': '\t'}
+
+    @classmethod
+    def split(cls, content: str) -> Optional[Tuple[str, str]]:
+        """
+        Split frontmatter from the rest of a document.
+
+        Only the text up to the closing delimiter is scanned; the body is
+        never split into lines.
+
+        Args:
+            content: Document starting with a '---' line
+
+        Returns:
+            Tuple of (frontmatter text, remaining content), or None when the
+            document has no complete frontmatter block
+        """
+        if not content.startswith('---'):
+            return None
+        first_break = content.find('\n')
+        if first_break == -1:
+            return None
+        match = cls.CLOSING_DELIMITER.search(content, first_break + 1)
+        if match is None:
+            return None
+        return content[first_break + 1:match.start()], content[match.end() + 1:]
+
+    @classmethod
+    def load(cls, text: str) -> Any:
+        """
+        Parse frontmatter text.
+
+        Args:
+            text: YAML between the frontmatter delimiters
+
+        Returns:
+            The parsed document (None for an empty one)
+
+        Raises:
+            yaml.YAMLError: If the text is not valid YAML
+        """
+        try:
+            return cls.parse_simple(text)
+        except UnsupportedSyntax:
+            return yaml.load(text, Loader=YAMLLoader)
+
+    @classmethod
+    def parse_simple(cls, text: str) -> Any:
+        """
+        Parse frontmatter written in the restricted template schema.
+
+        Args:
+            text: YAML between the frontmatter delimiters
+
+        Returns:
+            The parsed document (None for an empty one)
+
+        Raises:
+            UnsupportedSyntax: If the text uses YAML outside the restricted schema
+        """
+        if cls.UNSAFE_CHARS.search(text):
+            raise UnsupportedSyntax('unsupported characters')
+
+        lines: List[Tuple[int, str]] = []
+        for raw in text.split('\n'):
+            line = raw.rstrip(' \r')
+            body = line.lstrip(' ')
+            if not body or body.startswith('#'):
+                continue
+            lines.append((len(line) - len(body), body))
+
+        if not lines:
+            return None
+        value, end = cls._parse_block(lines, 0, lines[0][0])
+        if end != len(lines):
+            raise UnsupportedSyntax('inconsistent indentation')
+        return value
+
+    @classmethod
+    def _parse_block(cls, lines: List[Tuple[int, str]], i: int, indent: int) -> Tuple[Any, int]:
+        """Parse the mapping or sequence starting at line i; return it and the next line."""
+        if lines[i][1] == '-' or lines[i][1].startswith('- '):
+            return cls._parse_sequence(lines, i, indent)
+        return cls._parse_mapping(lines, i, indent)
+
+    @classmethod
+    def _parse_sequence(cls, lines: List[Tuple[int, str]], i: int, indent: int) -> Tuple[List[Any], int]:
+        """Parse a block sequence whose items start at the given indent."""
+        items = []
+        while i < len(lines):
+            line_indent, body = lines[i]
+            if line_indent < indent:
+                break
+            if line_indent > indent or not body.startswith('- '):
+                raise UnsupportedSyntax('nested sequence item')
+            item = body[2:].lstrip(' ')
+            if cls._is_key_line(item):
+                # '- key: value' opens a mapping indented to the first key
+                item_indent = line_indent + len(body) - len(item)
+                lines[i] = (item_indent, item)
+                value, i = cls._parse_mapping(lines, i, item_indent)
+                items.append(value)
+            else:
+                items.append(cls._scalar(item))
+                i += 1
+        return items, i
+
+    @classmethod
+    def _is_key_line(cls, text: str) -> bool:
+        """Check whether text starts with a mapping key rather than being a scalar."""
+        if text[:1] in ('"', "'"):
+            return text[cls._quoted(text)[1]:].startswith(':')
+        return ': ' in text or text.endswith(':')
+
+    @classmethod
+    def _parse_mapping(cls, lines: List[Tuple[int, str]], i: int, indent: int) -> Tuple[Dict[str, Any], int]:
+        """Parse a block mapping whose keys start at the given indent."""
+        mapping: Dict[str, Any] = {}
+        while i < len(lines):
+            line_indent, body = lines[i]
+            if line_indent < indent:
+                break
+            if line_indent > indent:
+                raise UnsupportedSyntax('unexpected indentation')
+            key, rest = cls._split_key(body)
+            i += 1
+            if rest:
+                mapping[key] = cls._scalar(rest)
+            elif i < len(lines) and lines[i][0] > indent:
+                mapping[key], i = cls._parse_block(lines, i, lines[i][0])
+            else:
+                mapping[key] = None
+        return mapping, i
+
+    @classmethod
+    def _split_key(cls, body: str) -> Tuple[str, str]:
+        """Split a 'key: value' line into the key and the (possibly empty) value text."""
+        if body[0] in '"\'':
+            key, end = cls._quoted(body)
+        else:
+            end = body.find(':')
+            key = body[:end]
+            if end == -1 or not cls.PLAIN_KEY.match(key) or key in cls.SPECIAL_SCALARS:
+                raise UnsupportedSyntax('unsupported key')
+        if body[end:end + 1] != ':':
+            raise UnsupportedSyntax('missing key separator')
+        rest = body[end + 1:]
+        if rest and rest[0] != ' ':
+            raise UnsupportedSyntax('missing space after key')
+        return key, rest.lstrip(' ')
+
+    @classmethod
+    def _scalar(cls, text: str) -> Any:
+        """Resolve a single-line scalar the way the YAML safe schema would."""
+        if not text:
+            raise UnsupportedSyntax('empty sequence item')
+        if text[0] in '"\'':
+            value, end = cls._quoted(text)
+            if end != len(text):
+                raise UnsupportedSyntax('text after quoted scalar')
+            return value
+        if text[0] == '[':
+            return cls._flow_sequence(text)
+        if text in cls.SPECIAL_SCALARS:
+            return cls.SPECIAL_SCALARS[text]
+        if cls.INT_PATTERN.match(text):
+            return int(text)
+        if cls.FLOAT_PATTERN.match(text):
+            return float(text)
+        if (
+            text[0] in cls.INDICATORS or ': ' in text or text.endswith(':') or ' #' in text
+        ):
+            raise UnsupportedSyntax('unsupported plain scalar')
+        return text
+
+    @classmethod
+    def _flow_sequence(cls, text: str) -> List[Any]:
+        """Parse a single-line flow sequence of scalars such as ["a", "b c", d]."""
+        if not text.endswith(']'):
+            raise UnsupportedSyntax('multi-line flow sequence')
+        items = []
+        i = 1
+        end = len(text) - 1
+        while True:
+            while i < end and text[i] == ' ':
+                i += 1
+            if i == end and not items:
+                return items
+            if text[i] in '"\'':
+                item, i = cls._quoted(text, i)
+            else:
+                comma = text.find(',', i, end)
+                item_end = end if comma == -1 else comma
+                plain = text[i:item_end].rstrip(' ')
+                if not plain or any(char in plain for char in '[]{}:'):
+                    raise UnsupportedSyntax('unsupported flow item')
+                item, i = cls._scalar(plain), item_end
+            items.append(item)
+            while i < end and text[i] == ' ':
+                i += 1
+            if i == end:
+                return items
+            if text[i] != ',':
+                raise UnsupportedSyntax('unsupported flow sequence')
+            i += 1
+            if not text[i:end].strip(' '):
+                raise UnsupportedSyntax('trailing comma in flow sequence')
+
+    @classmethod
+    def _quoted(cls, text: str, start: int = 0) -> Tuple[str, int]:
+        """Decode the quoted scalar at text[start]; return it and the offset after the quote."""
+        if text[start] == "'":
+            match = cls.SINGLE_QUOTED.match(text, start)
+            if match is None:
+                raise UnsupportedSyntax('multi-line quoted scalar')
+            return match.group(1).replace("''", "'"), match.end()
+
+        match = cls.DOUBLE_QUOTED.match(text, start)
+        if match is None:
+            raise UnsupportedSyntax('multi-line quoted scalar')
+        value = match.group(1)
+        if '\\' in value:
+            value = cls.ESCAPE_SEQUENCE.sub(cls._unescape, value)
+        return value, match.end()
+
+    @classmethod
+    def _unescape(cls, match: 're.Match') -> str:
+        """Decode one backslash escape of a double-quoted scalar."""
+        char = cls.ESCAPES.get(match.group(1))
+        if char is None:
+            raise UnsupportedSyntax('unsupported escape')
+        return char
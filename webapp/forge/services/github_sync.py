@@ -12,6 +12,12 @@ from typing import List, Dict, Optional, Tuple
 from django.conf import settings
 from django.utils import timezone
 from ..models import Template
+from .dashboard_stats import DashboardStats
+from .frontmatter import FrontmatterParser
+from .keyword_matcher import KeywordMatcher
+from .template_lint import TemplateLinter
+from .template_parser import TemplateParser
+from .typeahead import TypeaheadIndex
 
 
 class GitHubSyncService:
@@ -19,6 +25,37 @@ class GitHubSyncService:
     Service for synchronizing BMAD templates from GitHub repositories.
     """
     
+    # Detection rules in priority order: (value, keywords). The first value
+    # with any keyword present in the text wins.
+    ROLE_FILENAME_PATTERNS = (
+        ('orchestrator', ('orchestrator',)),
+        ('analyst', ('analyst',)),
+        ('pm', ('pm', 'project_manager')),
+        ('architect', ('architect',)),
+        ('scrum_master', ('scrum',)),
+        ('developer', ('developer', 'dev')),
+        ('qa', ('qa', 'test', 'quality')),
+    )
+    ROLE_CONTENT_PATTERNS = (
+        ('orchestrator', ('orchestrator',)),
+        ('analyst', ('analyst',)),
+        ('pm', ('project manager',)),
+        ('architect', ('architect',)),
+        ('scrum_master', ('scrum master',)),
+        ('developer', ('developer',)),
+        ('qa', ('qa engineer', 'quality assurance')),
+    )
+    PHASE_FILENAME_PATTERNS = (
+        ('planning', ('planning', 'plan')),
+        ('development', ('development', 'dev', 'sprint')),
+    )
+    PHASE_CONTENT_PATTERNS = (
+        ('planning', ('planning phase',)),
+        ('development', ('development phase',)),
+    )
+    PLANNING_KEYWORDS = ('requirements', 'analysis', 'estimate', 'roadmap', 'backlog')
+    DEVELOPMENT_KEYWORDS = ('implementation', 'code', 'feature', 'refactor', 'testing')
+    
     def __init__(self, token: Optional[str] = None):
         """
         Initialize the GitHub sync service.
@@ -186,30 +223,21 @@ class GitHubSyncService:
         
         remaining_content = content
         
-        # Check if content starts with frontmatter delimiter
-        if content.strip().startswith('---'):
-            lines = content.strip().split('\n')
-            # Find the closing delimiter
-            end_index = -1
-            for i, line in enumerate(lines[1:], start=1):
-                if line.strip() == '---':
-                    end_index = i
-                    break
-            
-            if end_index > 0:
-                # Extract and parse the frontmatter
-                frontmatter_text = '\n'.join(lines[1:end_index])
-                try:
-                    frontmatter = yaml.safe_load(frontmatter_text) or {}
-                except yaml.YAMLError as e:
-                    # Log the error for debugging but continue with empty frontmatter
-                    import logging
-                    logging.warning(f"Failed to parse YAML frontmatter: {e}")
-                    frontmatter = {}
-                
-                # Get the remaining content after frontmatter
-                remaining_content = '\n'.join(lines[end_index + 1:]).strip()
-        
+        # Split off the frontmatter block if the content starts with one
+        split = FrontmatterParser.split(content.strip())
+        if split is not None:
+            frontmatter_text, remaining_content = split
+            try:
+                frontmatter = FrontmatterParser.load(frontmatter_text) or {}
+            except yaml.YAMLError as e:
+                # Log the error for debugging but continue with empty frontmatter
+                import logging
+                logging.warning(f"Failed to parse YAML frontmatter: {e}")
+                frontmatter = {}
+
+            # Get the remaining content after frontmatter
+            remaining_content = remaining_content.strip()
+
         return frontmatter, remaining_content
     
     def detect_agent_roles(self, content: str, filename: str) -> List[str]:
@@ -297,42 +325,17 @@ class GitHubSyncService:
         if frontmatter.get('role') in valid_roles:
             return frontmatter['role']
         
-        content_lower = content.lower()
-        filename_lower = filename.lower()
-        
         # 2. Check filename patterns
-        if 'orchestrator' in filename_lower:
-            return 'orchestrator'
-        if 'analyst' in filename_lower:
-            return 'analyst'
-        if 'pm' in filename_lower or 'project_manager' in filename_lower:
-            return 'pm'
-        if 'architect' in filename_lower:
-            return 'architect'
-        if 'scrum' in filename_lower:
-            return 'scrum_master'
-        if 'developer' in filename_lower or 'dev' in filename_lower:
-            return 'developer'
-        if 'qa' in filename_lower or 'test' in filename_lower or 'quality' in filename_lower:
-            return 'qa'
+        role = self._first_match(self.ROLE_FILENAME_PATTERNS, filename)
+        if role:
+            return role
         
         # 3. Check content for role indicators
         if '## Your Role' in content:
-            role_section = content.split('## Your Role')[1].split('##')[0].lower()
-            if 'orchestrator' in role_section:
-                return 'orchestrator'
-            if 'analyst' in role_section:
-                return 'analyst'
-            if 'project manager' in role_section:
-                return 'pm'
-            if 'architect' in role_section:
-                return 'architect'
-            if 'scrum master' in role_section:
-                return 'scrum_master'
-            if 'developer' in role_section:
-                return 'developer'
-            if 'qa engineer' in role_section or 'quality assurance' in role_section:
-                return 'qa'
+            role_section = content.split('## Your Role')[1].split('##')[0]
+            role = self._first_match(self.ROLE_CONTENT_PATTERNS, role_section)
+            if role:
+                return role
         
         # 4. Default to developer if no role detected
         return 'developer'
@@ -363,27 +366,24 @@ class GitHubSyncService:
         if frontmatter.get('workflow_phase') in valid_phases:
             return frontmatter['workflow_phase']
         
-        filename_lower = filename.lower()
-        content_lower = content.lower()
-        
         # 2. Check filename patterns
-        if 'planning' in filename_lower or 'plan' in filename_lower:
-            return 'planning'
-        if 'development' in filename_lower or 'dev' in filename_lower or 'sprint' in filename_lower:
-            return 'development'
-        
-        # 3. Check content for phase indicators
-        if 'planning phase' in content_lower:
-            return 'planning'
-        if 'development phase' in content_lower:
-            return 'development'
+        phase = self._first_match(self.PHASE_FILENAME_PATTERNS, filename)
+        if phase:
+            return phase
+        
+        # 3. Check content for phase indicators, and count typical planning
+        # vs development keywords, in a single scan
+        found = KeywordMatcher.get(
+            self._pattern_keywords(self.PHASE_CONTENT_PATTERNS)
+            + self.PLANNING_KEYWORDS + self.DEVELOPMENT_KEYWORDS
+        ).find_all(content)
+        for phase, keywords in self.PHASE_CONTENT_PATTERNS:
+            if any(kw in found for kw in keywords):
+                return phase
         
         # 4. Check for typical planning vs development content
-        planning_keywords = ['requirements', 'analysis', 'estimate', 'roadmap', 'backlog']
-        development_keywords = ['implementation', 'code', 'feature', 'refactor', 'testing']
-        
-        planning_count = sum(1 for kw in planning_keywords if kw in content_lower)
-        development_count = sum(1 for kw in development_keywords if kw in content_lower)
+        planning_count = sum(1 for kw in self.PLANNING_KEYWORDS if kw in found)
+        development_count = sum(1 for kw in self.DEVELOPMENT_KEYWORDS if kw in found)
         
         if planning_count > development_count:
             return 'planning'
@@ -391,6 +391,29 @@ class GitHubSyncService:
         # 5. Default to development
         return 'development'
     
+    @staticmethod
+    def _pattern_keywords(patterns) -> Tuple[str, ...]:
+        """Flatten the keywords of a (value, keywords) rule table."""
+        return tuple(kw for _, keywords in patterns for kw in keywords)
+    
+    @classmethod
+    def _first_match(cls, patterns, text: str) -> Optional[str]:
+        """
+        Return the first value in a rule table with a keyword present in text.
+        
+        Args:
+            patterns: (value, keywords) rules in priority order
+            text: Text to scan (case-insensitive)
+            
+        Returns:
+            Matching value, or None if no keyword occurs
+        """
+        found = KeywordMatcher.get(cls._pattern_keywords(patterns)).find_all(text)
+        for value, keywords in patterns:
+            if any(kw in found for kw in keywords):
+                return value
+        return None
+    
     def parse_template_description(self, content: str) -> str:
         """
         Extract description from template content.
@@ -423,7 +446,9 @@ class GitHubSyncService:
         
         return ' '.join(description_lines[:3]) if description_lines else ''
     
-    def sync_templates(self, owner: str, repo: str, branch: str, path: str) -> Dict:
+    def sync_templates(
+        self, owner: str, repo: str, branch: str, path: str, lint_workers: Optional[int] = 1
+    ) -> Dict:
         """
         Synchronize templates from a GitHub repository.
         
@@ -437,15 +462,20 @@ class GitHubSyncService:
             repo: Repository name
             branch: Branch name
             path: Directory path containing templates
+            lint_workers: Worker processes for re-linting the corpus (see
+                TemplateLinter.lint_many); the default lints in this process,
+                as web requests must not start a process pool
             
         Returns:
-            Dictionary with sync results
+            Dictionary with sync results, including the template health
+            counts from TemplateLinter.lint_corpus()
         """
         results = {
             'success': True,
             'created': 0,
             'updated': 0,
             'errors': [],
+            'warnings': [],
             'templates': [],
         }
         
@@ -522,6 +552,10 @@ class GitHubSyncService:
                 else:
                     results['updated'] += 1
                 
+                # Flag frontmatter validation patterns that are unsafe to run
+                for warning in TemplateParser.lint_patterns(template.get_compiled()):
+                    results['warnings'].append(f"{filename}: {warning}")
+                
                 results['templates'].append({
                     'title': template.title,
                     'agent_role': template.agent_role,
@@ -533,6 +567,15 @@ class GitHubSyncService:
             results['success'] = False
             results['errors'].append(str(e))
         
+        # Re-lint the corpus; templates whose content is unchanged are skipped
+        results['health'] = TemplateLinter.lint_corpus(workers=lint_workers)
+        
+        # Saves already adjusted the dashboard counters; recount to repair any drift
+        DashboardStats.recount()
+        
+        # Rebuild the typeahead index here and mark it stale in other processes
+        TypeaheadIndex.refresh()
+        
         return results
     
     def sync_from_config(self) -> Dict:
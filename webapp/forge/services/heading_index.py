@@ -0,0 +1,266 @@
+"""
+Heading and line-offset index shared by the section-aware services.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .caching import LRUCache, content_hash
+
+
+@dataclass(frozen=True)
+class TemplateHeading:
+    """
+    A Markdown heading located in a template.
+    """
+    level: int
+    name: str
+    start_pos: int
+    end_pos: int
+    word_count: int = 0  # Words between this heading and the next
+
+
+class HeadingIndex:
+    """
+    Sorted index of the headings and line starts of a single document.
+
+    Built once per document, it answers "which section contains offset X",
+    "what is the content of section Y" and "where does line N start" with
+    binary searches instead of rescanning the text.
+    """
+
+    # Markdown heading pattern
+    HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.+)$', re.MULTILINE)
+
+    # Indexes memoized by content hash
+    INDEX_CACHE_SIZE = 64
+    _index_cache = LRUCache(maxsize=INDEX_CACHE_SIZE)
+
+    def __init__(self, content: str, headings: Optional[Sequence[TemplateHeading]] = None):
+        """
+        Index a document.
+
+        Args:
+            content: Document content
+            headings: Headings already located in the content, in document
+                order; scanned from the content when omitted
+        """
+        self.content = content or ''
+        if headings is None:
+            headings = self.scan_headings(self.content)
+        self.headings: Tuple[TemplateHeading, ...] = tuple(headings)
+        self._starts = [h.start_pos for h in self.headings]
+
+        # Section end offsets: up to the next heading of any level, and up to
+        # the next heading of the same or a higher level (subsections included)
+        count = len(self.headings)
+        self._ends = self._starts[1:] + [len(self.content)]
+        self._outer_ends = [len(self.content)] * count
+        open_headings: List[int] = []
+        for i, heading in enumerate(self.headings):
+            while open_headings and self.headings[open_headings[-1]].level >= heading.level:
+                self._outer_ends[open_headings.pop()] = heading.start_pos
+            open_headings.append(i)
+
+        # Normalized name lookups: exact via dict, prefix via a sorted key list
+        self._by_key: Dict[str, List[int]] = {}
+        for i, heading in enumerate(self.headings):
+            self._by_key.setdefault(self.normalize(heading.name), []).append(i)
+        self._sorted_keys = sorted(self._by_key)
+
+        # Line offsets are only needed for line lookups; built on first use
+        self._line_starts_cache: Optional[List[int]] = None
+
+    @classmethod
+    def build(cls, content: str) -> 'HeadingIndex':
+        """
+        Return the index for content, reusing a memoized one when available.
+
+        Args:
+            content: Document content
+
+        Returns:
+            HeadingIndex for the content
+        """
+        content = content or ''
+        key = content_hash(content)
+        index = cls._index_cache.get(key)
+        if index is None:
+            index = cls(content)
+            cls._index_cache.set(key, index)
+        return index
+
+    @classmethod
+    def scan_headings(cls, content: str, word_counts: bool = True) -> List[TemplateHeading]:
+        """
+        Locate every Markdown heading in a single pass.
+
+        Only line starts beginning with '#' are tried against HEADING_PATTERN,
+        which gives the same headings as finditer() without running the
+        pattern at every offset.
+
+        Args:
+            content: Document content
+            word_counts: Count the words of each section; when False every
+                word_count is left at 0
+
+        Returns:
+            TemplateHeading list in document order
+        """
+        matches = []
+        pos = 0 if content.startswith('#') else cls._next_line_start(content, 0)
+        while pos != -1:
+            match = cls.HEADING_PATTERN.match(content, pos)
+            if match is not None:
+                matches.append(match)
+                # A match can run over the following lines; resume after it
+                pos = match.end()
+            pos = cls._next_line_start(content, pos)
+
+        headings = []
+        for i, match in enumerate(matches):
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
+            headings.append(TemplateHeading(
+                level=len(match.group(1)),
+                name=match.group(2).strip(),
+                start_pos=match.start(),
+                end_pos=match.end(),
+                word_count=len(content[match.end():end].split()) if word_counts else 0,
+            ))
+        return headings
+
+    @staticmethod
+    def _next_line_start(content: str, pos: int) -> int:
+        """Return the start of the next line after pos that begins with '#', or -1."""
+        found = content.find('\n#', pos)
+        return found + 1 if found != -1 else -1
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        """Normalize a heading name for lookups (no '#' marker, case or extra spaces)."""
+        return ' '.join(name.lstrip('#').split()).lower()
+
+    def __len__(self) -> int:
+        return len(self.headings)
+
+    def __iter__(self) -> Iterator[TemplateHeading]:
+        return iter(self.headings)
+
+    def find(self, name: str, prefix: bool = False) -> Optional[int]:
+        """
+        Find the first heading matching a name.
+
+        A leading '##' marker in name sets the minimum heading level, so
+        '## Input' matches '## Input' and '### Input' but not '# Input'.
+
+        Args:
+            name: Heading name, optionally with a '#' marker
+            prefix: Also match headings whose name starts with name, when no
+                heading matches exactly
+
+        Returns:
+            Position of the heading in document order, or None
+        """
+        min_level = len(name) - len(name.lstrip('#'))
+        key = self.normalize(name)
+
+        for i in self._by_key.get(key, ()):
+            if self.headings[i].level >= min_level:
+                return i
+        if not prefix:
+            return None
+
+        best = None
+        for key_pos in range(bisect_left(self._sorted_keys, key), len(self._sorted_keys)):
+            candidate = self._sorted_keys[key_pos]
+            if not candidate.startswith(key):
+                break
+            for i in self._by_key[candidate]:
+                if self.headings[i].level >= min_level and (best is None or i < best):
+                    best = i
+                    break
+        return best
+
+    def section_span(self, i: int, include_subsections: bool = False) -> Tuple[int, int]:
+        """
+        Return the (start, end) offsets of the body below heading i.
+
+        Args:
+            i: Heading position in document order
+            include_subsections: Extend the section over nested, deeper
+                headings instead of stopping at the next heading
+
+        Returns:
+            Offsets of the text between the heading line and the section end
+        """
+        ends = self._outer_ends if include_subsections else self._ends
+        return self.headings[i].end_pos, ends[i]
+
+    def section_content(
+        self, name: str, prefix: bool = False, include_subsections: bool = False
+    ) -> Optional[str]:
+        """
+        Return the stripped body of the first section matching a name.
+
+        Args:
+            name: Heading name, optionally with a '#' marker
+            prefix: Passed to find()
+            include_subsections: Passed to section_span()
+
+        Returns:
+            Section body, or None if no heading matches
+        """
+        i = self.find(name, prefix=prefix)
+        if i is None:
+            return None
+        start, end = self.section_span(i, include_subsections)
+        return self.content[start:end].strip()
+
+    def heading_at(self, pos: int) -> Optional[int]:
+        """
+        Return the position of the heading whose section contains an offset.
+
+        Args:
+            pos: Character offset in the content
+
+        Returns:
+            Heading position in document order, or None before the first heading
+        """
+        i = bisect_right(self._starts, pos) - 1
+        return i if i >= 0 else None
+
+    @property
+    def _line_starts(self) -> List[int]:
+        """Offsets at which each line begins."""
+        if self._line_starts_cache is None:
+            starts = [0]
+            pos = self.content.find('\n')
+            while pos != -1:
+                starts.append(pos + 1)
+                pos = self.content.find('\n', pos + 1)
+            self._line_starts_cache = starts
+        return self._line_starts_cache
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines in the content."""
+        return len(self._line_starts)
+
+    def line_of(self, pos: int) -> int:
+        """Return the 1-based line number containing a character offset."""
+        return bisect_right(self._line_starts, pos)
+
+    def line_start(self, line: int) -> int:
+        """
+        Return the character offset at which a 1-based line begins.
+
+        Args:
+            line: Line number, clamped to the document
+
+        Returns:
+            Offset of the first character of the line
+        """
+        line = max(1, min(line, len(self._line_starts)))
+        return self._line_starts[line - 1]
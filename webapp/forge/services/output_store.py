@@ -0,0 +1,260 @@
+"""
+Content-addressed, compressed storage for generated outputs.
+"""
+
+import re
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from django.db import models, transaction
+
+from .caching import content_hash
+
+
+@dataclass(frozen=True, slots=True)
+class EncodedChunk:
+    """One chunk of output text, ready to store as an OutputBlob."""
+    digest: str
+    data: bytes
+    compressed: bool
+    size: int
+
+
+class OutputStore:
+    """
+    Stores generated outputs as shared, compressed chunks.
+
+    An output is split into sections at Markdown headings. Each section is
+    stored once as an OutputBlob keyed by the SHA-256 of its text, and the
+    prompt keeps an ordered list of OutputChunk rows pointing at the blobs.
+    Outputs generated from the same template repeat most of its scaffold
+    verbatim, so their unchanged sections are shared between prompts. Each
+    blob is zlib-compressed when that makes it smaller.
+
+    GeneratedPrompt.final_output reads and writes through this class.
+    Deleting a prompt deletes its chunk rows; blobs no longer used by any
+    prompt are removed by delete_unused() (output_storage_report
+    --delete-unused).
+
+    The model classes are optional arguments so migrations can pass their
+    historical versions.
+    """
+
+    # Sections start at Markdown headings
+    SECTION_PATTERN = re.compile(r'^(?=#{1,6}\s)', re.MULTILINE)
+
+    # Longer sections are split, at a line break where possible
+    MAX_CHUNK_CHARS = 64 * 1024
+
+    COMPRESSION_LEVEL = 6
+
+    # Chunks fetched per query when streaming an output
+    STREAM_BATCH = 16
+
+    # Unused blobs deleted per transaction by delete_unused()
+    DELETE_BATCH = 1000
+
+    @classmethod
+    def split(cls, text: str) -> List[str]:
+        """
+        Split output text into chunks at section boundaries.
+
+        Args:
+            text: Output text
+
+        Returns:
+            Non-empty chunks whose concatenation is text
+        """
+        chunks = []
+        for section in cls.SECTION_PATTERN.split(text or ''):
+            while len(section) > cls.MAX_CHUNK_CHARS:
+                cut = section.rfind('\n', 0, cls.MAX_CHUNK_CHARS) + 1 or cls.MAX_CHUNK_CHARS
+                chunks.append(section[:cut])
+                section = section[cut:]
+            if section:
+                chunks.append(section)
+        return chunks
+
+    @classmethod
+    def encode(cls, chunk: str) -> EncodedChunk:
+        """Hash and compress one chunk; it is kept raw if compression does not help."""
+        raw = chunk.encode('utf-8')
+        packed = zlib.compress(raw, cls.COMPRESSION_LEVEL)
+        compressed = len(packed) < len(raw)
+        return EncodedChunk(
+            digest=content_hash(chunk),
+            data=packed if compressed else raw,
+            compressed=compressed,
+            size=len(raw),
+        )
+
+    @staticmethod
+    def decode(data, compressed: bool) -> str:
+        """Return the text of a stored blob."""
+        data = bytes(data)
+        return (zlib.decompress(data) if compressed else data).decode('utf-8')
+
+    @classmethod
+    def write(cls, prompt_id: int, text: str, blob_model=None, chunk_model=None) -> None:
+        """
+        Store the output of a prompt, replacing any it had.
+
+        The output is replaced in one transaction, so the prompt never shows
+        a partial output.
+
+        Args:
+            prompt_id: Primary key of the saved GeneratedPrompt
+            text: Output text
+            blob_model: OutputBlob model
+            chunk_model: OutputChunk model
+        """
+        blob_model, chunk_model = cls._models(blob_model, chunk_model)
+        encoded = [cls.encode(chunk) for chunk in cls.split(text)]
+
+        unique = {chunk.digest: chunk for chunk in encoded}
+        blob_ids: Dict[str, int] = {}
+        with transaction.atomic():
+            missing = unique
+            while missing:
+                blob_model.objects.bulk_create(
+                    [
+                        blob_model(digest=c.digest, data=c.data, compressed=c.compressed, size=c.size)
+                        for c in missing.values()
+                    ],
+                    ignore_conflicts=True,
+                )
+                # Lock the blobs until the chunks referring to them are written,
+                # so delete_unused() cannot remove them in between. A blob it
+                # deleted after the insert above is missing here; store it again.
+                blob_ids.update(
+                    blob_model.objects.select_for_update()
+                    .filter(digest__in=missing).values_list('digest', 'pk')
+                )
+                missing = {digest: c for digest, c in missing.items() if digest not in blob_ids}
+
+            chunk_model.objects.filter(prompt_id=prompt_id).delete()
+            chunk_model.objects.bulk_create(
+                chunk_model(prompt_id=prompt_id, position=position, blob_id=blob_ids[chunk.digest])
+                for position, chunk in enumerate(encoded)
+            )
+
+    @classmethod
+    def read(cls, prompt_id: int) -> str:
+        """Return the output of a prompt ('' if it has none), in one query."""
+        return cls.read_many([prompt_id]).get(prompt_id, '')
+
+    @classmethod
+    def read_many(cls, prompt_ids: Iterable[int], chunk_model=None) -> Dict[int, str]:
+        """
+        Return the outputs of several prompts with a single query.
+
+        Args:
+            prompt_ids: Primary keys of prompts
+            chunk_model: OutputChunk model
+
+        Returns:
+            Output text by prompt id; prompts without output are omitted
+        """
+        _, chunk_model = cls._models(None, chunk_model)
+        parts: Dict[int, List[str]] = {}
+        rows = (
+            chunk_model.objects.filter(prompt_id__in=list(prompt_ids))
+            .order_by('prompt_id', 'position')
+            .values_list('prompt_id', 'blob__data', 'blob__compressed')
+        )
+        for prompt_id, data, compressed in rows:
+            parts.setdefault(prompt_id, []).append(cls.decode(data, compressed))
+        return {prompt_id: ''.join(chunks) for prompt_id, chunks in parts.items()}
+
+    @classmethod
+    def iter_chunks(cls, prompt_id: int, batch_size: Optional[int] = None) -> Iterator[str]:
+        """
+        Yield the output of a prompt chunk by chunk.
+
+        Chunks are fetched STREAM_BATCH at a time, so a large output is never
+        held in memory whole.
+
+        Args:
+            prompt_id: Primary key of the prompt
+            batch_size: Chunks per query
+
+        Yields:
+            Consecutive chunks of the output
+        """
+        _, chunk_model = cls._models(None, None)
+        batch_size = batch_size or cls.STREAM_BATCH
+        position = 0
+        while True:
+            rows = list(
+                chunk_model.objects.filter(prompt_id=prompt_id, position__gte=position)
+                .order_by('position')
+                .values_list('position', 'blob__data', 'blob__compressed')[:batch_size]
+            )
+            for position, data, compressed in rows:
+                yield cls.decode(data, compressed)
+            if len(rows) < batch_size:
+                return
+            position += 1
+
+    @classmethod
+    def report(cls) -> Dict[str, int]:
+        """
+        Measure the space outputs take compared with storing them whole.
+
+        Returns:
+            Dictionary with prompts, chunks, blobs, logical_bytes (outputs as
+            plain UTF-8), unique_bytes (distinct chunks as plain UTF-8) and
+            stored_bytes (distinct chunks as stored)
+        """
+        from django.db.models.functions import Length
+
+        blob_model, chunk_model = cls._models(None, None)
+        chunks = chunk_model.objects.aggregate(
+            chunks=models.Count('pk'),
+            prompts=models.Count('prompt_id', distinct=True),
+            logical_bytes=models.Sum('blob__size'),
+        )
+        blobs = blob_model.objects.aggregate(
+            blobs=models.Count('pk'),
+            unique_bytes=models.Sum('size'),
+            stored_bytes=models.Sum(Length('data')),
+        )
+        return {key: value or 0 for key, value in {**chunks, **blobs}.items()}
+
+    @classmethod
+    def delete_unused(cls) -> int:
+        """
+        Delete blobs no prompt refers to.
+
+        Blobs are deleted DELETE_BATCH at a time. Each batch is locked first,
+        skipping blobs a concurrent write() holds, and is checked for
+        references again as it is deleted.
+
+        Returns:
+            Number of blobs deleted
+        """
+        blob_model, _ = cls._models(None, None)
+        deleted = 0
+        while True:
+            with transaction.atomic():
+                unused = list(
+                    blob_model.objects.filter(uses__isnull=True)
+                    .select_for_update(skip_locked=True, of=('self',))
+                    .values_list('pk', flat=True)[:cls.DELETE_BATCH]
+                )
+                if not unused:
+                    break
+                count, _ = blob_model.objects.filter(pk__in=unused, uses__isnull=True).delete()
+            deleted += count
+            if len(unused) < cls.DELETE_BATCH:
+                break
+        return deleted
+
+    @staticmethod
+    def _models(blob_model, chunk_model):
+        if blob_model is None or chunk_model is None:
+            from ..models import OutputBlob, OutputChunk
+            blob_model = blob_model or OutputBlob
+            chunk_model = chunk_model or OutputChunk
+        return blob_model, chunk_model
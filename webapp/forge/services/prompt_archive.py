@@ -0,0 +1,115 @@
+"""
+Archival of old generated prompts.
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .dashboard_stats import DashboardStats
+from .output_store import OutputStore
+
+
+class PromptArchive:
+    """
+    Moves old prompts from GeneratedPrompt into the ArchivedPrompt table.
+
+    Keeping only recent prompts in GeneratedPrompt keeps it and its indexes
+    small. Archived prompts keep their ids, so the result page, downloads
+    and the history list still find them (see forge.views). Their output is
+    stored whole and compressed rather than as shared chunks.
+
+    Prompts are moved oldest first, in batches of BATCH_SIZE. Each batch is
+    copied and deleted in its own transaction, so an interrupted run loses
+    nothing and can simply be repeated. Chunks no live prompt uses any more
+    are deleted at the end.
+    """
+
+    BATCH_SIZE = 500
+
+    # Default age in days after which prompts are archived
+    # (PROMPT_ARCHIVE_AFTER_DAYS overrides it)
+    DEFAULT_AFTER_DAYS = 180
+
+    @classmethod
+    def cutoff(cls, days: Optional[int] = None) -> datetime:
+        """
+        Return the creation time before which prompts are archived.
+
+        Args:
+            days: Age in days; defaults to PROMPT_ARCHIVE_AFTER_DAYS
+        """
+        if days is None:
+            days = getattr(settings, 'PROMPT_ARCHIVE_AFTER_DAYS', cls.DEFAULT_AFTER_DAYS)
+        return timezone.now() - timedelta(days=days)
+
+    @classmethod
+    def archive(cls, before: datetime, batch_size: Optional[int] = None, progress=None) -> Dict[str, int]:
+        """
+        Archive every prompt created before a point in time.
+
+        Args:
+            before: Prompts created earlier than this are archived
+            batch_size: Prompts moved per transaction
+            progress: Optional callable receiving the running total after
+                each batch
+
+        Returns:
+            Dictionary with archived, batches and deleted_chunks counts
+        """
+        from ..models import GeneratedPrompt
+
+        batch_size = batch_size or cls.BATCH_SIZE
+        stats = {'archived': 0, 'batches': 0, 'deleted_chunks': 0}
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    GeneratedPrompt.objects.filter(created_at__lt=before)
+                    .order_by('created_at', 'id')[:batch_size]
+                )
+                if not batch:
+                    break
+                cls._move(batch)
+            stats['archived'] += len(batch)
+            stats['batches'] += 1
+            if progress is not None:
+                progress(stats['archived'])
+            if len(batch) < batch_size:
+                break
+
+        if stats['archived']:
+            stats['deleted_chunks'] = OutputStore.delete_unused()
+        return stats
+
+    @classmethod
+    def _move(cls, batch) -> None:
+        """Copy a batch of prompts to the archive and delete them from GeneratedPrompt."""
+        from ..models import ArchivedPrompt, GeneratedPrompt
+
+        GeneratedPrompt.prefetch_final_outputs(batch)
+        archived = []
+        for prompt in batch:
+            copy = ArchivedPrompt(
+                id=prompt.pk,
+                template_id=prompt.template_id,
+                input_data=prompt.input_data,
+                is_valid=prompt.is_valid,
+                validation_notes=prompt.validation_notes,
+                missing_variables=prompt.missing_variables,
+                validation_report=prompt.validation_report,
+                validator_version=prompt.validator_version,
+                created_at=prompt.created_at,
+            )
+            copy.final_output = prompt.final_output
+            archived.append(copy)
+        # Reruns after a partial failure find copies already made
+        ArchivedPrompt.objects.bulk_create(archived, ignore_conflicts=True)
+        # Archived prompts still count, so the per-row counter changes of the
+        # delete are netted out in one batch rather than applied row by row
+        with DashboardStats.batched():
+            GeneratedPrompt.objects.filter(pk__in=[p.pk for p in batch]).delete()
+            DashboardStats.apply(Counter({('prompts', 'total'): len(batch)}))
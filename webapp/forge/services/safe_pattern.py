@@ -0,0 +1,304 @@
+"""
+Precompiled, time-bounded validation patterns from template frontmatter.
+"""
+
+import multiprocessing
+import re
+import string
+import threading
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import lru_cache
+from typing import List, Optional, Pattern, Tuple
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_parse
+
+from django.conf import settings
+
+
+class PatternVerdict(Enum):
+    """Outcome of matching a value against a validation pattern."""
+    MATCH = "match"
+    NO_MATCH = "no_match"
+    TIMEOUT = "timeout"
+    INVALID = "invalid"  # The pattern itself does not compile
+
+
+@dataclass(frozen=True, slots=True)
+class SafePattern:
+    """
+    A validation pattern compiled once and matched under a time budget.
+
+    Patterns come from the frontmatter of synced repositories, so they are
+    untrusted. Each is linted when compiled: patterns whose backtracking can
+    explode (nested quantifiers, alternation under a quantifier, adjacent
+    variable-width quantifiers, backreferences) are matched in a separate
+    worker process that is killed when the time budget runs out. Other
+    patterns match in process, but only for values up to
+    MAX_IN_PROCESS_LENGTH characters; longer values go to a worker too, as
+    even a lint-clean pattern can backtrack polynomially in the length.
+    """
+    source: str
+    regex: Optional[Pattern] = field(default=None, compare=False, repr=False)
+    error: Optional[str] = None
+    issues: Tuple[str, ...] = ()
+
+    # Default seconds a risky pattern may spend matching one value
+    # (settings.VALIDATION_PATTERN_TIMEOUT overrides it)
+    DEFAULT_TIMEOUT = 0.5
+
+    # Longest value a lint-clean pattern matches in process
+    MAX_IN_PROCESS_LENGTH = 256
+
+    @classmethod
+    def compile(cls, source: str) -> 'SafePattern':
+        """
+        Compile and lint a pattern, reusing an earlier compilation.
+
+        Args:
+            source: Regular expression source from frontmatter
+
+        Returns:
+            SafePattern; check error for patterns that do not compile
+        """
+        return _compile(str(source))
+
+    @property
+    def is_risky(self) -> bool:
+        """Whether the pattern can backtrack catastrophically."""
+        return bool(self.issues)
+
+    def match(self, value: str, timeout: Optional[float] = None) -> PatternVerdict:
+        """
+        Match a value from its start, as re.match() does.
+
+        Args:
+            value: Value to check
+            timeout: Seconds allowed in a worker (defaults to
+                settings.VALIDATION_PATTERN_TIMEOUT)
+
+        Returns:
+            PatternVerdict for the value
+        """
+        if self.regex is None:
+            return PatternVerdict.INVALID
+        if not self.is_risky and len(value) <= self.MAX_IN_PROCESS_LENGTH:
+            return PatternVerdict.MATCH if self.regex.match(value) else PatternVerdict.NO_MATCH
+        if timeout is None:
+            timeout = getattr(settings, 'VALIDATION_PATTERN_TIMEOUT', self.DEFAULT_TIMEOUT)
+        return _PatternWorker.match(self.source, value, timeout)
+
+
+@lru_cache(maxsize=1024)
+def _compile(source: str) -> SafePattern:
+    try:
+        regex = re.compile(source)
+    except re.error as e:
+        return SafePattern(source, error=str(e))
+    return SafePattern(source, regex, issues=lint_pattern(source))
+
+
+def lint_pattern(source: str) -> Tuple[str, ...]:
+    """
+    Find the constructs in a pattern that make backtracking super-linear.
+
+    Args:
+        source: Regular expression source
+
+    Returns:
+        Descriptions of the problems found (empty for a safe pattern, or
+        one that does not compile)
+    """
+    try:
+        parsed = sre_parse.parse(source)
+    except re.error:
+        return ()
+    issues = []
+    _lint(parsed, False, issues)
+    return tuple(dict.fromkeys(issues))
+
+
+def _lint(items, repeated: bool, issues: list) -> None:
+    """Walk a parsed pattern; repeated is True inside a quantifier that can backtrack into its body."""
+    previous = None
+    for op, av in items:
+        current = av if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] != av[1] else None
+        if current is not None and previous is not None and _can_share(previous[2], current[2]):
+            # Adjacent repeats that can both take the same characters split
+            # a run between them in many ways: .*.*.*x tries O(n^3) splits
+            issues.append('adjacent quantifiers')
+        previous = current
+        if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            low, high, sub = av
+            if repeated and high > 1 and low != high:
+                issues.append('nested quantifiers')
+            # Bounded repeats of a variable-width body backtrack exponentially
+            # in the bound too, e.g. (\w+\s?){1,50}
+            _lint(sub, repeated or high == sre_parse.MAXREPEAT or (high > 1 and _variable_width(sub)), issues)
+        elif op is sre_parse.BRANCH:
+            if repeated:
+                issues.append('alternation inside a quantifier')
+            for branch in av[1]:
+                _lint(branch, repeated, issues)
+        elif op is sre_parse.SUBPATTERN:
+            _lint(av[-1], repeated, issues)
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            _lint(av[1], repeated, issues)
+        elif op is sre_parse.GROUPREF:
+            issues.append('backreference')
+        elif op is sre_parse.GROUPREF_EXISTS:
+            _lint(av[1], repeated, issues)
+            if av[2] is not None:
+                _lint(av[2], repeated, issues)
+        # Possessive quantifiers and atomic groups never backtrack into
+        # their contents, so they are safe whatever they contain
+
+
+def _variable_width(items) -> bool:
+    """Whether a parsed subpattern can match strings of different lengths."""
+    low, high = items.getwidth()
+    return low != high
+
+
+# Characters tried when deciding whether two character classes overlap
+_PROBE_CHARS = string.printable + '\u00a0\u00e9\u00df\u0416\u2014\u4e2d'
+
+_CATEGORIES = {
+    sre_parse.CATEGORY_DIGIT: re.compile(r'\d'),
+    sre_parse.CATEGORY_NOT_DIGIT: re.compile(r'\D'),
+    sre_parse.CATEGORY_SPACE: re.compile(r'\s'),
+    sre_parse.CATEGORY_NOT_SPACE: re.compile(r'\S'),
+    sre_parse.CATEGORY_WORD: re.compile(r'\w'),
+    sre_parse.CATEGORY_NOT_WORD: re.compile(r'\W'),
+}
+
+
+def _can_share(left, right) -> bool:
+    """Whether the last character of one subpattern can also start the next."""
+    last, first = _edge_chars(left, -1), _edge_chars(right, 0)
+    if last is None or first is None:
+        return True
+    return any(last(char) and first(char) for char in _PROBE_CHARS)
+
+
+def _edge_chars(items, index: int):
+    """
+    Predicate for the characters a subpattern can start (index 0) or end
+    (index -1) with, or None if that cannot be told from its first or last item.
+    """
+    if not len(items):
+        return None
+    op, av = items[index]
+    if op is sre_parse.LITERAL:
+        return lambda char: ord(char) == av
+    if op is sre_parse.NOT_LITERAL:
+        return lambda char: ord(char) != av
+    if op is sre_parse.ANY:
+        return lambda char: char != '\n'
+    if op is sre_parse.IN:
+        return lambda char: _in_set(av, char)
+    if op is sre_parse.SUBPATTERN:
+        return _edge_chars(av[-1], index)
+    if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+        return _edge_chars(av[2], index)
+    return None
+
+
+def _in_set(members, char: str) -> bool:
+    """Evaluate a parsed character class against one character."""
+    negate = False
+    found = False
+    code = ord(char)
+    for op, av in members:
+        if op is sre_parse.NEGATE:
+            negate = True
+        elif op is sre_parse.LITERAL:
+            found = found or code == av
+        elif op is sre_parse.RANGE:
+            found = found or av[0] <= code <= av[1]
+        elif op is sre_parse.CATEGORY:
+            pattern = _CATEGORIES.get(av)
+            # Unknown categories are assumed to match
+            found = found or pattern is None or bool(pattern.match(char))
+        else:
+            found = True
+    return found != negate
+
+
+def _match_in_worker(source: str, value: str) -> bool:
+    return _compile(source).regex.match(value) is not None
+
+
+class _PatternWorker:
+    """
+    Worker processes for risky matches, one per match in flight.
+
+    Each call checks out an idle worker (starting one if none is free) and
+    has it to itself, so concurrent requests never wait on each other. A
+    worker that runs over time is killed on its own; other matches are
+    unaffected. Up to MAX_IDLE finished workers are kept for reuse.
+    """
+
+    MAX_IDLE = 4
+
+    _idle: List['_PatternWorker'] = []
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self.conn, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_serve, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    @classmethod
+    def match(cls, source: str, value: str, timeout: float) -> PatternVerdict:
+        worker = cls._checkout()
+        try:
+            worker.conn.send((source, value))
+            if not worker.conn.poll(timeout):
+                worker.kill()
+                return PatternVerdict.TIMEOUT
+            matched = worker.conn.recv()
+        except (EOFError, OSError):
+            # The worker died mid-match; report the value as unchecked
+            worker.kill()
+            return PatternVerdict.TIMEOUT
+        cls._checkin(worker)
+        return PatternVerdict.MATCH if matched else PatternVerdict.NO_MATCH
+
+    @classmethod
+    def _checkout(cls) -> '_PatternWorker':
+        with cls._lock:
+            while cls._idle:
+                worker = cls._idle.pop()
+                if worker.process.is_alive():
+                    return worker
+                worker.kill()
+        return cls()
+
+    @classmethod
+    def _checkin(cls, worker: '_PatternWorker') -> None:
+        with cls._lock:
+            if len(cls._idle) < cls.MAX_IDLE:
+                cls._idle.append(worker)
+                return
+        worker.kill()
+
+    def kill(self) -> None:
+        """Stop the worker process, whatever it is doing."""
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+def _serve(conn) -> None:
+    """Worker process loop: answer (source, value) requests until the pipe closes."""
+    while True:
+        try:
+            source, value = conn.recv()
+        except EOFError:
+            return
+        conn.send(_match_in_worker(source, value))
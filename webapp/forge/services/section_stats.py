@@ -0,0 +1,270 @@
+"""
+Line-based section statistics that can be updated in place as content is edited.
+"""
+
+import threading
+import uuid
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from django.conf import settings
+
+from .caching import LRUCache
+from .keyword_matcher import KeywordMatcher
+from .template_parser import TemplateParser
+
+
+# Per-line entry: (word count, keywords present, unreplaced variable names)
+LineStats = Tuple[int, Tuple[str, ...], Tuple[str, ...]]
+
+
+class SectionStats:
+    """
+    Word count, keyword hits and unreplaced variables of a section's content.
+
+    Statistics are kept per line. Words, keywords and variable placeholders
+    never span a line break, so an edit only needs the lines it touches
+    re-tokenized; the totals are adjusted by the difference. This lets the
+    wizard's real-time validation cost O(edit) per keystroke rather than
+    O(section).
+    """
+
+    def __init__(self, text: str = '', keywords: Iterable[str] = (), revision: int = 0):
+        """
+        Tokenize content from scratch.
+
+        Args:
+            text: Section content
+            keywords: Keywords to track (matched case-insensitively as substrings
+                by a shared KeywordMatcher)
+            revision: Revision number of the content
+        """
+        self.keywords = tuple(sorted({k.lower() for k in keywords if k}))
+        self._matcher = KeywordMatcher.get(self.keywords)
+        self.revision = revision
+        self.set_text(text)
+
+    def set_text(self, text: str) -> None:
+        """Replace the whole content and recompute every statistic."""
+        self.text = text or ''
+        self.word_count = 0
+        self.keyword_counts: Counter = Counter()
+        self.variable_counts: Counter = Counter()
+        self._lines: List[LineStats] = [self._line_stats(line) for line in self.text.split('\n')]
+        for line in self._lines:
+            self._add(line, 1)
+
+    def apply_delta(self, start: int, end: int, text: str) -> None:
+        """
+        Replace content[start:end] with text, re-tokenizing only the affected lines.
+
+        Args:
+            start: Start offset of the replaced range in the current content
+            end: End offset (exclusive) of the replaced range
+            text: Replacement text
+
+        Raises:
+            ValueError: If the range does not lie within the current content
+        """
+        if not 0 <= start <= end <= len(self.text):
+            raise ValueError(
+                f"Edit range {start}-{end} is outside content of length {len(self.text)}"
+            )
+
+        first_line = self.text.count('\n', 0, start)
+        last_line = first_line + self.text.count('\n', start, end)
+        segment_start = self.text.rfind('\n', 0, start) + 1
+        segment_end = self.text.find('\n', end)
+        if segment_end == -1:
+            segment_end = len(self.text)
+
+        new_text = self.text[:start] + text + self.text[end:]
+        segment = new_text[segment_start:segment_end + len(text) - (end - start)]
+        new_lines = [self._line_stats(line) for line in segment.split('\n')]
+
+        for line in self._lines[first_line:last_line + 1]:
+            self._add(line, -1)
+        for line in new_lines:
+            self._add(line, 1)
+        self._lines[first_line:last_line + 1] = new_lines
+        self.text = new_text
+
+    def has_keyword(self, keyword: str) -> bool:
+        """Check whether a keyword occurs anywhere in the content."""
+        keyword = keyword.lower()
+        if keyword not in self.keywords:
+            # Not tracked; fall back to a direct scan
+            return KeywordMatcher.get((keyword,)).contains_any(self.text)
+        return self.keyword_counts[keyword] > 0
+
+    @property
+    def unreplaced_variables(self) -> List[str]:
+        """Sorted names of placeholders without a default still in the content."""
+        return sorted(name for name, count in self.variable_counts.items() if count > 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to a JSON-compatible dictionary, totals included."""
+        return {
+            'revision': self.revision,
+            'text': self.text,
+            'keywords': list(self.keywords),
+            'lines': list(self._lines),
+            'word_count': self.word_count,
+            'keyword_counts': dict(+self.keyword_counts),
+            'variable_counts': dict(+self.variable_counts),
+        }
+
+    @classmethod
+    def from_dict(
+        cls, data: Mapping[str, Any], keywords: Optional[Iterable[str]] = None
+    ) -> 'SectionStats':
+        """
+        Restore statistics serialized by to_dict().
+
+        The stored totals are used as they are, so restoring does not touch
+        every line again.
+
+        Args:
+            data: Serialized statistics
+            keywords: Keywords now required; if they differ from the stored
+                ones the stored text is re-tokenized
+
+        Returns:
+            SectionStats for the stored content
+        """
+        stored_keywords = tuple(data.get('keywords', ()))
+        if keywords is not None and tuple(sorted({k.lower() for k in keywords if k})) != stored_keywords:
+            return cls(data.get('text', ''), keywords, data.get('revision', 0))
+        if 'word_count' not in data:
+            return cls(data.get('text', ''), stored_keywords, data.get('revision', 0))
+
+        stats = cls.__new__(cls)
+        stats.keywords = stored_keywords
+        stats._matcher = KeywordMatcher.get(stored_keywords)
+        stats.revision = data.get('revision', 0)
+        stats.text = data.get('text', '')
+        stats.word_count = data['word_count']
+        stats.keyword_counts = Counter(data.get('keyword_counts', {}))
+        stats.variable_counts = Counter(data.get('variable_counts', {}))
+        # Entries may come back as lists after JSON; _add() takes either
+        stats._lines = list(data.get('lines', []))
+        return stats
+
+    def _line_stats(self, line: str) -> LineStats:
+        """Tokenize a single line."""
+        return (
+            len(line.split()),
+            tuple(sorted(self._matcher.find_all(line))),
+            tuple(
+                var.name for var in TemplateParser.scan_variables(line)
+                if var.default_value is None
+            ),
+        )
+
+    def _add(self, line: LineStats, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) a line's contribution to the totals."""
+        words, keywords, variables = line
+        self.word_count += sign * words
+        for keyword in keywords:
+            self.keyword_counts[keyword] += sign
+        for name in variables:
+            self.variable_counts[name] += sign
+
+
+class SectionStatsStore:
+    """
+    Keeps each user's SectionStats between real-time validation requests.
+
+    The live SectionStats objects are held in a process-local LRU, so an
+    edit costs only its own re-tokenization: nothing is serialized or
+    copied per keystroke, and no cache backend needs configuring. The
+    session holds only a small index: for each section being edited, its
+    revision and a random token naming the LRU entry. The index keeps the
+    MAX_SECTIONS most recently edited sections; older entries are dropped
+    from the LRU as well.
+
+    A request served by another worker process, or one arriving after the
+    LRU evicted the entry, finds nothing: load() returns None and the
+    client resends the full content once.
+    """
+
+    SESSION_KEY = 'section_validation'
+
+    # Sections kept per session
+    MAX_SECTIONS = 20
+
+    # Sections kept per process (SECTION_VALIDATION_LOCAL_SIZE overrides it)
+    DEFAULT_LOCAL_SIZE = 512
+
+    _local: Optional[LRUCache] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def load(
+        cls, session, template_id: int, section_name: str, keywords: Iterable[str]
+    ) -> Optional[SectionStats]:
+        """
+        Take the stored statistics of a section, or None if there are none.
+
+        The entry is removed until save() puts it back, so two requests
+        never edit the same object at once.
+
+        Args:
+            session: The user's session
+            template_id: Template being edited
+            section_name: Section being edited
+            keywords: Keywords the section is validated for
+        """
+        entry = session.get(cls.SESSION_KEY, {}).get(cls._entry_key(template_id, section_name))
+        if not entry:
+            return None
+        stats = cls._local_cache().pop(entry['token'])
+        if stats is None or stats.revision != entry.get('revision'):
+            return None
+        if stats.keywords != tuple(sorted({k.lower() for k in keywords if k})):
+            return SectionStats(stats.text, keywords, stats.revision)
+        return stats
+
+    @classmethod
+    def revision(cls, session, template_id: int, section_name: str) -> int:
+        """Return the last stored revision of a section (0 if none)."""
+        entry = session.get(cls.SESSION_KEY, {}).get(cls._entry_key(template_id, section_name))
+        return entry['revision'] if entry else 0
+
+    @classmethod
+    def save(cls, session, template_id: int, section_name: str, stats: SectionStats) -> None:
+        """Store a section's statistics, evicting the least recently edited sections."""
+        index = dict(session.get(cls.SESSION_KEY, {}))
+        key = cls._entry_key(template_id, section_name)
+        entry = index.pop(key, None) or {'token': uuid.uuid4().hex}
+        # Re-inserted last, so the index stays in order of last edit
+        index[key] = {'revision': stats.revision, 'token': entry['token']}
+        local = cls._local_cache()
+        while len(index) > cls.MAX_SECTIONS:
+            local.pop(index.pop(next(iter(index)))['token'])
+        local.set(entry['token'], stats)
+        session[cls.SESSION_KEY] = index
+
+    @classmethod
+    def discard(cls, session, template_id: int, section_name: str) -> None:
+        """Forget a section's statistics."""
+        index = dict(session.get(cls.SESSION_KEY, {}))
+        entry = index.pop(cls._entry_key(template_id, section_name), None)
+        if entry:
+            cls._local_cache().pop(entry['token'])
+            session[cls.SESSION_KEY] = index
+
+    @staticmethod
+    def _entry_key(template_id: int, section_name: str) -> str:
+        return f'{template_id}:{section_name}'
+
+    @classmethod
+    def _local_cache(cls) -> LRUCache:
+        """Return the process-local LRU, creating it from settings on first use."""
+        if cls._local is None:
+            with cls._lock:
+                if cls._local is None:
+                    cls._local = LRUCache(maxsize=getattr(
+                        settings, 'SECTION_VALIDATION_LOCAL_SIZE', cls.DEFAULT_LOCAL_SIZE
+                    ))
+        return cls._local
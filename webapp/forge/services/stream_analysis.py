@@ -0,0 +1,443 @@
+"""
+Bounded-memory document analysis over a stream of text chunks.
+"""
+
+import codecs
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union
+
+from .heading_index import HeadingIndex
+from .keyword_matcher import KeywordMatcher
+from .template_parser import TemplateParser
+
+
+class SectionTally:
+    """
+    Running statistics of one section's content while a document streams past.
+
+    Offers the read interface of SectionStats (word_count, has_keyword(),
+    unreplaced_variables), so TemplateParser.validate_section_against_metadata()
+    accepts it in place of statistics built from the section text.
+    """
+
+    __slots__ = (
+        'level', 'keywords', '_matcher', 'word_count', 'found_keywords',
+        'variables', 'unreplaced', 'first', 'end',
+    )
+
+    def __init__(self, level: int = 0, keywords: Iterable[str] = ()):
+        """
+        Start an empty tally.
+
+        Args:
+            level: Heading level of the section (0 for the whole document)
+            keywords: Keywords to track (case-insensitive substrings)
+        """
+        self.level = level
+        self.keywords = tuple(sorted({k.lower() for k in keywords if k}))
+        self._matcher = KeywordMatcher.get(self.keywords)
+        self.word_count = 0
+        self.found_keywords: Set[str] = set()
+        self.variables: Dict[str, None] = {}  # Distinct names, in order of first occurrence
+        self.unreplaced: Set[str] = set()
+        self.first: Optional[int] = None  # Offset of the first non-whitespace character
+        self.end = 0  # Offset after the last non-whitespace character
+
+    def add(self, text: str, pos: int, words: int, variables, keyword_text: str) -> None:
+        """
+        Add a line (or piece of a long line) to the tally.
+
+        Args:
+            text: The text
+            pos: Offset of the text in the document
+            words: Number of words in the text
+            variables: Placeholders found in the text
+            keyword_text: Text to search for keywords (the text, possibly
+                preceded by the end of the previous piece of the same line)
+        """
+        body = text.lstrip()
+        if not body:
+            return
+        if self.first is None:
+            self.first = pos + len(text) - len(body)
+        self.end = pos + len(text.rstrip())
+        self.word_count += words
+        if self.keywords and len(self.found_keywords) < len(self.keywords):
+            self.found_keywords |= self._matcher.find_all(keyword_text)
+        for var in variables:
+            self.variables.setdefault(var.name)
+            if var.default_value is None:
+                self.unreplaced.add(var.name)
+
+    @property
+    def length(self) -> int:
+        """Length of the content with surrounding whitespace stripped."""
+        return 0 if self.first is None else self.end - self.first
+
+    def has_keyword(self, keyword: str) -> bool:
+        """Check whether a tracked keyword occurs in the content."""
+        keyword = keyword.lower()
+        if keyword not in self.keywords:
+            raise KeyError(f"Keyword '{keyword}' was not tracked while streaming")
+        return keyword in self.found_keywords
+
+    @property
+    def unreplaced_variables(self) -> List[str]:
+        """Sorted names of placeholders without a default."""
+        return sorted(self.unreplaced)
+
+
+class StreamingAnalysis:
+    """
+    The facts DocumentAnalysis provides, gathered from a stream of chunks.
+
+    Text is consumed in whole lines, taking the run of lines up to the next
+    heading candidate at once, and only the current partial line is
+    buffered, so memory stays flat however large the document is. Words,
+    keywords and variable placeholders never span a line break, and section
+    boundaries are heading lines, so line-aligned processing gives the same
+    results as analyzing the whole text. Lines longer than MAX_LINE_LENGTH
+    are processed in pieces cut at whitespace; only a placeholder or keyword
+    inside an unbroken run of that length can be missed, and a heading line
+    that long is matched by prefix on its first piece.
+
+    Keywords must be registered up front, per BMAD section, per tracked
+    section name, or for the whole document (key None).
+    """
+
+    # Characters read from a file-like source at a time
+    READ_SIZE = 64 * 1024
+
+    # Longest partial line buffered before it is processed in pieces
+    MAX_LINE_LENGTH = 1024 * 1024
+
+    # A heading marker with nothing else on its line; HEADING_PATTERN then
+    # takes the heading name from the next non-blank line
+    BARE_MARKER = re.compile(r'#{1,6}\s*\Z')
+
+    def __init__(
+        self,
+        keywords: Optional[Mapping[Optional[str], Iterable[str]]] = None,
+        sections: Iterable[str] = (),
+    ):
+        """
+        Prepare to analyze a document.
+
+        Args:
+            keywords: Keywords to track, keyed by BMAD section (e.g.
+                '## Output Requirements'), tracked section name, or None for
+                the whole document
+            sections: Heading names (without '#') whose first occurrence is
+                tracked, in addition to the BMAD sections
+        """
+        self._keywords = {key: tuple(value) for key, value in (keywords or {}).items()}
+        self.document = SectionTally(0, self._keywords.get(None, ()))
+
+        self._bmad_keys = [
+            (section, HeadingIndex.normalize(section), len(section) - len(section.lstrip('#')))
+            for section in TemplateParser.ALL_SECTIONS
+        ]
+        # BMAD section -> [first exact heading match, first prefix match]
+        self._bmad: Dict[str, List[Optional[SectionTally]]] = {
+            section: [None, None] for section, _, _ in self._bmad_keys
+        }
+        self._named: Dict[str, Optional[SectionTally]] = dict.fromkeys(sections)
+
+        longest = max(
+            (len(k) for values in self._keywords.values() for k in values), default=1
+        )
+        self._keyword_overlap = max(longest - 1, 1)
+
+        self._open: List[SectionTally] = []
+        self._opening: List[SectionTally] = []  # Opened by the current heading line
+        self._buffer = ''
+        self._offset = 0  # Document offset of the buffer start
+        self._continuation = False  # The buffer continues a line already partly processed
+        self._tail = ''  # End of the previous piece of the current line
+        self._pending: Optional[Tuple[int, int, str, bool]] = None
+        self._sections: Optional[Dict[str, SectionTally]] = None
+        self.heading_count = 0
+        self.closed = False
+
+    @classmethod
+    def from_stream(
+        cls,
+        source,
+        keywords: Optional[Mapping[Optional[str], Iterable[str]]] = None,
+        sections: Iterable[str] = (),
+        encoding: str = 'utf-8',
+    ) -> 'StreamingAnalysis':
+        """
+        Analyze a document read incrementally.
+
+        Args:
+            source: File-like object with read(size), or an iterable of str
+                or bytes chunks (e.g. UploadedFile.chunks())
+            keywords: See __init__()
+            sections: See __init__()
+            encoding: Encoding of bytes chunks (invalid sequences are replaced)
+
+        Returns:
+            The closed StreamingAnalysis
+        """
+        analysis = cls(keywords=keywords, sections=sections)
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        for chunk in cls._chunks(source):
+            analysis.feed(decoder.decode(chunk) if isinstance(chunk, bytes) else chunk)
+        analysis.feed(decoder.decode(b'', final=True))
+        return analysis.close()
+
+    @classmethod
+    def _chunks(cls, source) -> Iterable[Union[str, bytes]]:
+        """Yield the chunks of a file-like object or chunk iterable."""
+        if hasattr(source, 'read'):
+            while True:
+                chunk = source.read(cls.READ_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+        else:
+            yield from source
+
+    def feed(self, text: str) -> None:
+        """
+        Consume the next chunk of the document.
+
+        Args:
+            text: Decoded text, split anywhere
+        """
+        if self.closed:
+            raise ValueError('Cannot feed a closed StreamingAnalysis')
+        if not text:
+            return
+        buffer = self._buffer + text
+        start = 0
+        while True:
+            newline = buffer.find('\n', start)
+            if newline == -1:
+                break
+            if self._pending is None and (self._continuation or buffer[start] != '#'):
+                # Lines up to the next heading candidate are processed as one block
+                heading = buffer.find('\n#', newline)
+                newline = buffer.rfind('\n', newline) if heading == -1 else heading
+            self._line(buffer[start:newline], self._offset + start, end_of_line=True)
+            start = newline + 1
+        self._offset += start
+        self._buffer = buffer[start:]
+        while len(self._buffer) > self.MAX_LINE_LENGTH:
+            cut = self._cut_point(self._buffer)
+            self._line(self._buffer[:cut], self._offset, end_of_line=False)
+            self._offset += cut
+            self._buffer = self._buffer[cut:]
+
+    def close(self) -> 'StreamingAnalysis':
+        """
+        Finish the document, processing any final unterminated line.
+
+        Returns:
+            self
+        """
+        if not self.closed:
+            if self._buffer or self._continuation:
+                self._line(self._buffer, self._offset, end_of_line=True)
+                self._offset += len(self._buffer)
+                self._buffer = ''
+            if self._pending is not None:
+                self._resolve_pending_at_end()
+            self._open = []
+            self.closed = True
+        return self
+
+    def _cut_point(self, buffer: str) -> int:
+        """Choose where to split an over-long partial line (after whitespace when possible)."""
+        limit = self.MAX_LINE_LENGTH
+        cut = max(buffer.rfind(' ', 0, limit), buffer.rfind('\t', 0, limit)) + 1
+        if cut > 0:
+            # Don't cut through a placeholder that opens before the cut
+            opener = max(buffer.rfind('{{', 0, cut), buffer.rfind('[', 0, cut))
+            closer = max(buffer.rfind('}}', 0, cut), buffer.rfind(']', 0, cut))
+            if opener > closer:
+                earlier = max(buffer.rfind(' ', 0, opener), buffer.rfind('\t', 0, opener)) + 1
+                if earlier > 0:
+                    cut = earlier
+            return cut
+        return limit
+
+    def _line(self, text: str, pos: int, end_of_line: bool) -> None:
+        """Process a line, or a piece of one when end_of_line is False."""
+        line_start = not self._continuation
+        self._continuation = not end_of_line
+
+        if self._pending is not None:
+            if not text.strip():
+                level, start, marker, _ = self._pending
+                self._pending = (level, start, marker, True if text else self._pending[3])
+                if end_of_line:
+                    self._tail = ''
+                return
+            level, start, marker, _ = self._pending
+            self._pending = None
+            self._heading(level, text.strip(), start)
+            self._feed(marker, start, line_start=True)
+            self._feed(text, pos, line_start)
+        elif line_start and text.startswith('#'):
+            if self.BARE_MARKER.match(text):
+                marker = text.rstrip()
+                self._pending = (len(marker), pos, text, len(text) - len(marker) >= 2)
+                if not end_of_line:
+                    self._continuation = True
+                return
+            match = TemplateParser.HEADING_PATTERN.match(text)
+            if match is not None:
+                self._heading(
+                    len(match.group(1)), match.group(2).strip(), pos, truncated=not end_of_line
+                )
+            self._feed(text, pos, line_start)
+        else:
+            self._feed(text, pos, line_start)
+
+        if end_of_line:
+            self._tail = ''
+            if self._opening:
+                self._open.extend(self._opening)
+                self._opening = []
+
+    def _feed(self, text: str, pos: int, line_start: bool) -> None:
+        """Add text to the document and every open section."""
+        words = len(text.split())
+        keyword_text = text
+        if not line_start:
+            if words and text[:1].strip() and self._tail[-1:].strip():
+                # The previous piece ended inside this word
+                words -= 1
+            keyword_text = self._tail + text
+        variables = tuple(TemplateParser.scan_variables(text)) if ('{{' in text or '[' in text) else ()
+
+        self.document.add(text, pos, words, variables, keyword_text)
+        for tally in self._open:
+            tally.add(text, pos, words, variables, keyword_text)
+        overlap = self._keyword_overlap
+        self._tail = text[-overlap:] if len(text) >= overlap else (self._tail + text)[-overlap:]
+
+    def _heading(self, level: int, name: str, pos: int, truncated: bool = False) -> None:
+        """
+        Close the sections a heading ends and start tallies for the sections it opens.
+
+        A truncated name is the start of an over-long heading line; it can
+        only prefix-match a section name, never equal one.
+        """
+        self.heading_count += 1
+        # Open sections are nested, so their levels never decrease
+        while self._open and self._open[-1].level >= level:
+            self._open.pop()
+
+        key = HeadingIndex.normalize(name)
+        for section, section_key, min_level in self._bmad_keys:
+            if level < min_level:
+                continue
+            candidates = self._bmad[section]
+            if key == section_key and not truncated:
+                slot = 0
+            elif key.startswith(section_key):
+                slot = 1
+            else:
+                continue
+            if candidates[slot] is None:
+                candidates[slot] = self._start(level, section)
+        if not truncated and name in self._named and self._named[name] is None:
+            self._named[name] = self._start(level, name)
+
+    def _start(self, level: int, key: str) -> SectionTally:
+        tally = SectionTally(level, self._keywords.get(key, ()))
+        self._opening.append(tally)
+        return tally
+
+    def _resolve_pending_at_end(self) -> None:
+        """Settle a bare heading marker followed by nothing but whitespace."""
+        level, start, marker, is_heading = self._pending
+        self._pending = None
+        if is_heading:
+            # HEADING_PATTERN still matches, with an empty name
+            self._heading(level, '', start)
+        self._feed(marker, start, line_start=True)
+
+    @property
+    def sections(self) -> Dict[str, SectionTally]:
+        """Detected BMAD sections mapped to their tallies, in ALL_SECTIONS order."""
+        if self._sections is not None:
+            return self._sections
+        detected = {}
+        for section, (exact, prefix) in self._bmad.items():
+            tally = exact or prefix
+            if tally is not None:
+                detected[section] = tally
+        if self.closed:
+            self._sections = detected
+        return detected
+
+    def section(self, name: str, keywords: Iterable[str] = ()) -> Optional[SectionTally]:
+        """
+        Return the tally of a tracked section by name.
+
+        BMAD sections are looked up by canonical name (so 'Input' is the
+        section a '## Input Data' heading provides); other names by the first
+        heading with exactly that name.
+
+        Args:
+            name: Section name without '#' markers
+            keywords: Accepted for DocumentAnalysis parity; streamed sections
+                track the keywords registered up front
+
+        Returns:
+            SectionTally, or None if the section did not occur
+        """
+        tally = self.sections.get(f'## {name}')
+        if tally is None:
+            tally = self._named.get(name)
+        return tally
+
+    @property
+    def variable_names(self) -> List[str]:
+        """Distinct variable names, in order of first occurrence."""
+        return list(self.document.variables)
+
+    @property
+    def unreplaced_variables(self) -> List[str]:
+        """Sorted names of placeholders without a default value."""
+        return self.document.unreplaced_variables
+
+    def section_length(self, section: str) -> int:
+        """Return the stripped length of a detected BMAD section (0 if missing)."""
+        tally = self.sections.get(section)
+        return tally.length if tally is not None else 0
+
+    def section_word_count(self, section: str) -> int:
+        """Return the number of words in a detected BMAD section (0 if missing)."""
+        tally = self.sections.get(section)
+        return tally.word_count if tally is not None else 0
+
+    def word_count(self, limit: Optional[int] = None) -> int:
+        """Return the number of words in the document (limit is accepted for DocumentAnalysis parity)."""
+        return self.document.word_count
+
+    def keywords_in(self, keywords: Iterable[str], section: Optional[str] = None) -> Set[str]:
+        """
+        Return the tracked keywords that occur in the document or one of its sections.
+
+        Args:
+            keywords: Keywords to look for; each must have been registered
+                for the section
+            section: BMAD section to search, or None for the whole document
+
+        Returns:
+            Set of the lowercased keywords found
+        """
+        tally = self.document if section is None else self.sections.get(section)
+        if tally is None:
+            return set()
+        return {k.lower() for k in keywords if tally.has_keyword(k)}
+
+    @property
+    def length(self) -> int:
+        """Number of characters consumed so far."""
+        return self._offset + len(self._buffer)
@@ -0,0 +1,203 @@
+"""
+Corpus-wide template linting with per-template health records.
+"""
+
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import yaml
+from django.utils import timezone
+
+from .caching import content_hash
+from .frontmatter import FrontmatterParser
+from .template_parser import TemplateParser
+
+
+@dataclass(frozen=True, slots=True)
+class LintResult:
+    """Problems found in one template's content."""
+    content_hash: str
+    errors: Tuple[str, ...] = ()
+    warnings: Tuple[str, ...] = ()
+
+    @property
+    def status(self) -> str:
+        """TemplateHealth status for the result: error, warning or ok."""
+        if self.errors:
+            return 'error'
+        return 'warning' if self.warnings else 'ok'
+
+
+class TemplateLinter:
+    """
+    Lints templates for BMAD structure, frontmatter metadata and patterns.
+
+    Linting a template depends only on its content, so results are stored
+    per template in TemplateHealth together with the content hash and
+    LINTER_VERSION. lint_corpus() only re-lints templates whose content (or
+    the linter) changed since their record was written, and spreads those
+    over a process pool.
+    """
+
+    # Bump when lint rules change so stored health records are recomputed
+    LINTER_VERSION = 1
+
+    # Below this many templates a process pool costs more than it saves
+    MIN_PARALLEL_BATCH = 8
+
+    @classmethod
+    def lint(cls, content: str) -> LintResult:
+        """
+        Lint one template.
+
+        Args:
+            content: Template content string
+
+        Returns:
+            LintResult with the errors and warnings found
+        """
+        content = content or ''
+        structure = TemplateParser.validate_template(content)
+        errors = list(structure['errors'])
+        warnings = list(structure['warnings'])
+
+        errors.extend(cls._frontmatter_errors(content))
+        try:
+            compiled = TemplateParser.compile(content)
+        except Exception as e:
+            errors.append(f"Frontmatter metadata could not be parsed: {e}")
+        else:
+            for owner, pattern in TemplateParser.iter_patterns(compiled):
+                if pattern.error:
+                    errors.append(f"Validation pattern of {owner} does not compile: {pattern.error}")
+                elif pattern.is_risky:
+                    warnings.append(
+                        f"Validation pattern of {owner} has {', '.join(pattern.issues)}"
+                    )
+
+        return LintResult(content_hash(content), tuple(errors), tuple(warnings))
+
+    @classmethod
+    def _frontmatter_errors(cls, content: str) -> List[str]:
+        """Report frontmatter the parser would silently ignore."""
+        split = FrontmatterParser.split(content)
+        if split is None:
+            return []
+        try:
+            frontmatter = FrontmatterParser.load(split[0])
+        except yaml.YAMLError as e:
+            problem = getattr(e, 'problem', None) or str(e).splitlines()[0]
+            return [f"Frontmatter is not valid YAML ({problem}); its metadata is ignored"]
+        if frontmatter is not None and not isinstance(frontmatter, dict):
+            return ["Frontmatter is not a mapping; its metadata is ignored"]
+        return []
+
+    @classmethod
+    def lint_many(
+        cls,
+        contents: Sequence[str],
+        executor: Optional[Executor] = None,
+        workers: Optional[int] = None,
+        chunksize: int = 4,
+    ) -> List[LintResult]:
+        """
+        Lint a batch of templates, fanning the work out to worker processes.
+
+        Args:
+            contents: Template contents to lint
+            executor: Executor to submit work to (e.g. one created with
+                BMADValidator.create_pool())
+            workers: Worker processes for a pool created for this call when no
+                executor is given; 1 lints in the current process
+            chunksize: Templates sent to a worker per task
+
+        Returns:
+            LintResult per template, in input order
+        """
+        if executor is None and (workers == 1 or len(contents) < cls.MIN_PARALLEL_BATCH):
+            return [cls.lint(content) for content in contents]
+        if executor is None:
+            from .bmad_validator import BMADValidator
+            with BMADValidator.create_pool(workers) as pool:
+                return list(pool.map(_lint_in_worker, contents, chunksize=chunksize))
+        return list(executor.map(_lint_in_worker, contents, chunksize=chunksize))
+
+    @classmethod
+    def lint_corpus(
+        cls,
+        queryset=None,
+        workers: Optional[int] = None,
+        force: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Lint templates and store the results as TemplateHealth records.
+
+        Templates whose health record already matches their content hash and
+        the current LINTER_VERSION are skipped, and identical contents are
+        linted once.
+
+        Args:
+            queryset: Templates to lint (default: all active templates)
+            workers: Worker processes (see lint_many)
+            force: Re-lint templates whose record is current
+
+        Returns:
+            Dictionary with checked, skipped, ok, warning and error counts
+        """
+        from ..models import Template, TemplateHealth
+
+        if queryset is None:
+            queryset = Template.objects.filter(is_active=True)
+        templates = queryset.select_related('health').only(
+            'pk', 'content',
+            'health__content_hash', 'health__linter_version', 'health__status',
+        )
+
+        stats = {'checked': 0, 'skipped': 0, 'ok': 0, 'warning': 0, 'error': 0}
+        pending = {}
+        for template in templates:
+            key = content_hash(template.content)
+            health = getattr(template, 'health', None)
+            if (
+                not force and health is not None
+                and health.content_hash == key
+                and health.linter_version == cls.LINTER_VERSION
+            ):
+                stats['skipped'] += 1
+                stats[health.status] += 1
+                continue
+            pending.setdefault(key, (template.content, []))[1].append(template.pk)
+
+        if not pending:
+            return stats
+
+        results = cls.lint_many([content for content, _ in pending.values()], workers=workers)
+        checked_at = timezone.now()
+        records = []
+        for (_, template_ids), result in zip(pending.values(), results):
+            for template_id in template_ids:
+                records.append(TemplateHealth(
+                    template_id=template_id,
+                    content_hash=result.content_hash,
+                    linter_version=cls.LINTER_VERSION,
+                    status=result.status,
+                    errors=list(result.errors),
+                    warnings=list(result.warnings),
+                    checked_at=checked_at,
+                ))
+                stats['checked'] += 1
+                stats[result.status] += 1
+
+        TemplateHealth.objects.bulk_create(
+            records,
+            update_conflicts=True,
+            unique_fields=['template'],
+            update_fields=['content_hash', 'linter_version', 'status', 'errors', 'warnings', 'checked_at'],
+        )
+        return stats
+
+
+def _lint_in_worker(content: str) -> LintResult:
+    """Process pool entry point for TemplateLinter.lint_many()."""
+    return TemplateLinter.lint(content)
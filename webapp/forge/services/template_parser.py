@@ -2,12 +2,26 @@
 Template parsing service for extracting variables and metadata.
 """
 
+import json
 import re
 import yaml
-from typing import List, Dict, Tuple, Optional, Any
+from functools import cached_property, lru_cache
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING, List, Dict, Tuple, Optional, Any, Mapping, Union, Iterable, Iterator,
+)
 from dataclasses import dataclass, field
 from enum import Enum
 
+from .caching import LRUCache, content_hash
+from .frontmatter import FrontmatterParser
+from .heading_index import HeadingIndex, TemplateHeading
+from .safe_pattern import PatternVerdict, SafePattern
+
+if TYPE_CHECKING:
+    from .section_stats import SectionStats
+    from .validation_plan import ValidationPlan
+
 
 class ValidationSeverity(Enum):
     """Severity levels for validation issues."""
@@ -26,22 +40,58 @@ class InputType(Enum):
     CHECKBOX = "checkbox"
 
 
-@dataclass
+def _freeze_sequences(instance: Any, *names: str) -> None:
+    """Store the named fields of a frozen dataclass as tuples (lists may be passed in)."""
+    for name in names:
+        value = getattr(instance, name)
+        if not isinstance(value, tuple):
+            value = (value,) if isinstance(value, str) else tuple(value or ())
+            object.__setattr__(instance, name, value)
+
+
+def _compile_pattern(instance: Any) -> None:
+    """Store the SafePattern for a frozen dataclass's validation_pattern."""
+    if instance.validation_pattern:
+        object.__setattr__(instance, 'pattern', SafePattern.compile(instance.validation_pattern))
+
+
+@dataclass(frozen=True, slots=True)
 class StructuredField:
     """Represents a structured input field within a section."""
     name: str
     field_type: str  # text, select, multiselect, checkbox, textarea
-    options: List[str] = field(default_factory=list)
+    options: Tuple[str, ...] = ()
     required: bool = False
     description: str = ""
     default_value: Optional[str] = None
     validation_pattern: Optional[str] = None
+    # validation_pattern compiled and linted once, when the field is parsed
+    pattern: Optional[SafePattern] = field(default=None, init=False, compare=False, repr=False)
 
+    def __post_init__(self):
+        _freeze_sequences(self, 'options')
+        _compile_pattern(self)
 
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the frontmatter dictionary form read by SectionMetadata.from_dict."""
+        return {
+            'name': self.name,
+            'type': self.field_type,
+            'options': list(self.options),
+            'required': self.required,
+            'description': self.description,
+            'default': self.default_value,
+            'validation': self.validation_pattern,
+        }
+
+
+@dataclass(frozen=True, slots=True)
 class SectionMetadata:
     """
     Metadata for a template section defining validation rules and input configuration.
+
+    Instances are immutable and shared, e.g. between cached CompiledTemplates
+    and the DEFAULT_SECTION_METADATA registry.
     """
     name: str
     required: bool = True
@@ -49,13 +99,18 @@ class SectionMetadata:
     max_words: Optional[int] = None
     input_type: InputType = InputType.TEXTAREA
     help_text: str = ""
-    keywords_required: List[str] = field(default_factory=list)
-    keywords_recommended: List[str] = field(default_factory=list)
+    keywords_required: Tuple[str, ...] = ()
+    keywords_recommended: Tuple[str, ...] = ()
     validation_severity: ValidationSeverity = ValidationSeverity.WARNING
-    examples: List[str] = field(default_factory=list)
-    structured_fields: List[StructuredField] = field(default_factory=list)
+    examples: Tuple[str, ...] = ()
+    structured_fields: Tuple[StructuredField, ...] = ()
     placeholder: str = ""
 
+    def __post_init__(self):
+        _freeze_sequences(
+            self, 'keywords_required', 'keywords_recommended', 'examples', 'structured_fields'
+        )
+
     @classmethod
     def from_dict(cls, name: str, data: Dict[str, Any]) -> 'SectionMetadata':
         """Create SectionMetadata from a dictionary (parsed from YAML)."""
@@ -101,8 +156,24 @@ class SectionMetadata:
             placeholder=data.get('placeholder', ''),
         )
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the frontmatter dictionary form accepted by from_dict."""
+        return {
+            'required': self.required,
+            'min_words': self.min_words,
+            'max_words': self.max_words,
+            'input_type': self.input_type.value,
+            'help_text': self.help_text,
+            'keywords_required': list(self.keywords_required),
+            'keywords_recommended': list(self.keywords_recommended),
+            'validation_severity': self.validation_severity.value,
+            'examples': list(self.examples),
+            'structured_fields': [f.to_dict() for f in self.structured_fields],
+            'placeholder': self.placeholder,
+        }
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class VariableMetadata:
     """
     Metadata for a template variable defining validation rules.
@@ -113,11 +184,17 @@ class VariableMetadata:
     validation_pattern: Optional[str] = None
     default_value: Optional[str] = None
     input_type: str = "text"  # text, textarea, select, multiselect
-    options: List[str] = field(default_factory=list)
+    options: Tuple[str, ...] = ()
     help_text: str = ""
     placeholder: str = ""
     min_length: Optional[int] = None
     max_length: Optional[int] = None
+    # validation_pattern compiled and linted once, when the metadata is parsed
+    pattern: Optional[SafePattern] = field(default=None, init=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        _freeze_sequences(self, 'options')
+        _compile_pattern(self)
 
     @classmethod
     def from_dict(cls, name: str, data: Dict[str, Any]) -> 'VariableMetadata':
@@ -139,22 +216,37 @@ class VariableMetadata:
             max_length=data.get('max_length'),
         )
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the frontmatter dictionary form accepted by from_dict."""
+        return {
+            'description': self.description,
+            'required': self.required,
+            'validation': self.validation_pattern,
+            'default': self.default_value,
+            'input_type': self.input_type,
+            'options': list(self.options),
+            'help_text': self.help_text,
+            'placeholder': self.placeholder,
+            'min_length': self.min_length,
+            'max_length': self.max_length,
+        }
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SectionValidationResult:
     """Result of validating section content against metadata."""
     is_valid: bool
     section_name: str
     severity: ValidationSeverity
-    errors: List[str] = field(default_factory=list)
-    warnings: List[str] = field(default_factory=list)
-    info: List[str] = field(default_factory=list)
-    missing_keywords: List[str] = field(default_factory=list)
+    errors: Tuple[str, ...] = ()
+    warnings: Tuple[str, ...] = ()
+    info: Tuple[str, ...] = ()
+    missing_keywords: Tuple[str, ...] = ()
     word_count: int = 0
     completion_percentage: float = 0.0
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TemplateVariable:
     """
     Represents a variable found in a template.
@@ -167,14 +259,258 @@ class TemplateVariable:
     metadata: Optional[VariableMetadata] = None
 
 
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """
+    Immutable, fully parsed representation of a template.
+
+    Produced by TemplateParser.compile() and shared between requests, so the
+    frontmatter YAML, section metadata and variable spans of a template are
+    derived once per process rather than on every call.
+    """
+    content_hash: str
+    content: str
+    body: str
+    frontmatter: Mapping[str, Any]
+    sections: Mapping[str, Tuple[int, int]]
+    headings: Tuple[TemplateHeading, ...]
+    variables: Tuple[TemplateVariable, ...]
+    variable_spans: Tuple[TemplateVariable, ...]
+    section_metadata: Mapping[str, SectionMetadata]
+    variable_metadata: Mapping[str, VariableMetadata]
+    heading_index: HeadingIndex = field(compare=False, repr=False)
+
+    @cached_property
+    def validation_plan(self) -> 'ValidationPlan':
+        """The section metadata compiled into a ValidationPlan, built on first use."""
+        from .validation_plan import ValidationPlan
+        return ValidationPlan.compile(self.section_metadata)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize to a JSON-compatible artifact for persistence.
+
+        Ordered structures are stored as lists so key order survives
+        databases (such as PostgreSQL jsonb) that do not preserve it. The
+        content itself is not included; from_dict() takes it separately.
+
+        Returns:
+            Dictionary stamped with the content hash and parser version
+        """
+        body_start = self.content.rfind(self.body) if self.body else len(self.content)
+        return {
+            'parser_version': TemplateParser.PARSER_VERSION,
+            'content_hash': self.content_hash,
+            'body_span': [body_start, body_start + len(self.body)],
+            # Round-trip through JSON so YAML dates and similar become strings
+            'frontmatter': json.loads(json.dumps(dict(self.frontmatter), default=str)),
+            'sections': [
+                [name, start, end] for name, (start, end) in self.sections.items()
+            ],
+            'headings': [
+                [h.level, h.name, h.start_pos, h.end_pos, h.word_count]
+                for h in self.headings
+            ],
+            'variable_spans': [
+                [v.name, v.syntax, v.start_pos, v.end_pos, v.default_value]
+                for v in self.variable_spans
+            ],
+            'section_metadata': [
+                [name, meta.to_dict()] for name, meta in self.section_metadata.items()
+            ],
+            'variable_metadata': [
+                [name, meta.to_dict()] for name, meta in self.variable_metadata.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, content: str, data: Mapping[str, Any]) -> 'CompiledTemplate':
+        """
+        Rebuild a compiled template from an artifact produced by to_dict().
+
+        No YAML or heading regexes are run. The caller is responsible for
+        checking the artifact is current (see TemplateParser.is_artifact_current).
+
+        Args:
+            content: Template content the artifact was built from
+            data: Artifact dictionary
+
+        Returns:
+            CompiledTemplate equivalent to compiling the content
+        """
+        body_start, body_end = data['body_span']
+        headings = tuple(
+            TemplateHeading(
+                level=level,
+                name=name,
+                start_pos=start,
+                end_pos=end,
+                word_count=word_count,
+            )
+            for level, name, start, end, word_count in data['headings']
+        )
+        variable_spans = tuple(
+            TemplateVariable(
+                name=name,
+                syntax=syntax,
+                start_pos=start,
+                end_pos=end,
+                default_value=default,
+            )
+            for name, syntax, start, end, default in data['variable_spans']
+        )
+        return cls(
+            content_hash=data['content_hash'],
+            content=content,
+            body=content[body_start:body_end],
+            frontmatter=MappingProxyType(dict(data['frontmatter'])),
+            sections=MappingProxyType({
+                name: (start, end) for name, start, end in data['sections']
+            }),
+            headings=headings,
+            variables=tuple(TemplateParser._dedupe_variables(variable_spans)),
+            variable_spans=variable_spans,
+            section_metadata=MappingProxyType({
+                name: SectionMetadata.from_dict(name, meta)
+                for name, meta in data['section_metadata']
+            }),
+            variable_metadata=MappingProxyType({
+                name: VariableMetadata.from_dict(name, meta)
+                for name, meta in data['variable_metadata']
+            }),
+            heading_index=HeadingIndex(content, headings),
+        )
+
+
+@dataclass
+class SubstitutionResult:
+    """Output of TemplateParser.render() and the placeholders it left behind."""
+    output: str
+    unreplaced: List[str] = field(default_factory=list)
+
+
+# Built-in section metadata used when a template does not declare its own.
+# Shared read-only instances, built once at import.
+DEFAULT_SECTION_METADATA: Mapping[str, SectionMetadata] = MappingProxyType({
+    'Your Role': SectionMetadata(
+        name='Your Role',
+        required=True,
+        min_words=20,
+        validation_severity=ValidationSeverity.CRITICAL,
+        help_text="Define the AI persona and primary responsibilities.",
+        keywords_recommended=('responsibility', 'expertise', 'role', 'task'),
+    ),
+    'Input': SectionMetadata(
+        name='Input',
+        required=True,
+        min_words=15,
+        validation_severity=ValidationSeverity.CRITICAL,
+        help_text="Specify what information or data will be provided.",
+        keywords_recommended=('provide', 'given', 'receive', 'include'),
+    ),
+    'Output Requirements': SectionMetadata(
+        name='Output Requirements',
+        required=True,
+        min_words=20,
+        validation_severity=ValidationSeverity.CRITICAL,
+        help_text="Define the expected output format and structure.",
+        keywords_recommended=('format', 'structure', 'output', 'return', 'produce'),
+    ),
+    'Context': SectionMetadata(
+        name='Context',
+        required=False,
+        min_words=10,
+        validation_severity=ValidationSeverity.WARNING,
+        help_text="Provide background information and context.",
+    ),
+    'Constraints': SectionMetadata(
+        name='Constraints',
+        required=False,
+        min_words=10,
+        validation_severity=ValidationSeverity.WARNING,
+        help_text="Define any limitations or restrictions.",
+    ),
+    'Examples': SectionMetadata(
+        name='Examples',
+        required=False,
+        min_words=10,
+        validation_severity=ValidationSeverity.INFO,
+        help_text="Provide examples of expected input/output.",
+    ),
+    'Step-by-Step Instructions': SectionMetadata(
+        name='Step-by-Step Instructions',
+        required=False,
+        min_words=10,
+        validation_severity=ValidationSeverity.WARNING,
+        help_text="Break down the process into clear steps.",
+    ),
+    'Success Criteria': SectionMetadata(
+        name='Success Criteria',
+        required=False,
+        min_words=10,
+        validation_severity=ValidationSeverity.WARNING,
+        help_text="Define how success will be measured.",
+    ),
+    'Notes': SectionMetadata(
+        name='Notes',
+        required=False,
+        min_words=5,
+        validation_severity=ValidationSeverity.INFO,
+        help_text="Additional notes and considerations.",
+    ),
+})
+
+
+@lru_cache(maxsize=256)
+def default_section_metadata(section_name: str) -> SectionMetadata:
+    """
+    Return the built-in metadata for a section.
+
+    Args:
+        section_name: Section name without the '## ' marker
+
+    Returns:
+        The registered defaults, or shared optional-section defaults for
+        sections without an entry
+    """
+    metadata = DEFAULT_SECTION_METADATA.get(section_name)
+    if metadata is None:
+        metadata = SectionMetadata(
+            name=section_name,
+            required=False,
+            min_words=10,
+            validation_severity=ValidationSeverity.WARNING,
+        )
+    return metadata
+
+
 class TemplateParser:
     """
     Service for parsing BMAD templates and extracting variables.
     """
     
-    # Regex patterns for variable detection
-    DOUBLE_BRACE_PATTERN = r'\{\{(\w+(?::[^}]+)?)\}\}'
-    SINGLE_BRACKET_PATTERN = r'\[(\w+(?::[^\]]+)?)\]'
+    # Variable scanners for {{VAR}}, {{VAR:default}}, [VAR] and [VAR:default],
+    # merged into one left-to-right scan by _variable_matches(). Each starts
+    # with a literal the regex engine can skip ahead to, where a combined
+    # alternation would be tried at every offset. Defaults never span a line
+    # break, so an unclosed brace cannot make a match run on across the rest
+    # of the document.
+    BRACE_VARIABLE_PATTERN = re.compile(r'\{\{(?P<name>\w+)(?::(?P<default>[^}\n]+))?\}\}')
+    BRACKET_VARIABLE_PATTERN = re.compile(r'\[(?P<name>\w+)(?::(?P<default>[^\]\n]+))?\]')
+
+    # Markdown heading pattern
+    HEADING_PATTERN = HeadingIndex.HEADING_PATTERN
+
+    # Bump whenever the compiled structure or its serialized form changes, so
+    # artifacts persisted by older code are rebuilt rather than trusted
+    PARSER_VERSION = 2
+
+    # Characters kept in a catalogue excerpt (see excerpt())
+    EXCERPT_LENGTH = 200
+
+    # Compiled templates memoized by content hash
+    COMPILE_CACHE_SIZE = 128
+    _compile_cache = LRUCache(maxsize=COMPILE_CACHE_SIZE)
     
     # BMAD section patterns
     REQUIRED_SECTIONS = [
@@ -193,44 +529,204 @@ class TemplateParser:
     ]
     
     ALL_SECTIONS = REQUIRED_SECTIONS + OPTIONAL_SECTIONS
+
+    @classmethod
+    def compile(
+        cls,
+        content: Union[str, CompiledTemplate],
+        artifact: Optional[Mapping[str, Any]] = None,
+    ) -> CompiledTemplate:
+        """
+        Parse a template once and return its immutable compiled form.
+
+        Results are memoized in a bounded LRU cache keyed by the content hash,
+        so repeated calls for the same template skip YAML parsing and section
+        detection entirely. Passing an already compiled template returns it
+        unchanged, which lets callers hand either form to the services.
+
+        Args:
+            content: Template content string or CompiledTemplate
+            artifact: Optional persisted CompiledTemplate.to_dict() output;
+                used instead of parsing on a cache miss when it is current
+
+        Returns:
+            CompiledTemplate for the content
+        """
+        if isinstance(content, CompiledTemplate):
+            return content
+
+        content = content or ''
+        key = content_hash(content)
+        compiled = cls._compile_cache.get(key)
+        if compiled is None:
+            if cls.is_artifact_current(artifact, key):
+                compiled = CompiledTemplate.from_dict(content, artifact)
+            else:
+                compiled = cls._compile(content, key)
+            cls._compile_cache.set(key, compiled)
+        return compiled
+
+    @classmethod
+    def is_artifact_current(cls, artifact: Optional[Mapping[str, Any]], key: str) -> bool:
+        """
+        Check whether a persisted artifact matches the content and parser.
+
+        Args:
+            artifact: Persisted CompiledTemplate.to_dict() output, if any
+            key: Content hash of the template content
+
+        Returns:
+            True if the artifact can be loaded without reparsing
+        """
+        return bool(artifact) and (
+            artifact.get('parser_version') == cls.PARSER_VERSION
+            and artifact.get('content_hash') == key
+        )
+
+    @classmethod
+    def _compile(cls, content: str, key: str) -> CompiledTemplate:
+        """Build a CompiledTemplate without consulting the cache."""
+        frontmatter, body = cls.parse_frontmatter(content)
+        if not isinstance(frontmatter, dict):
+            frontmatter = {}
+
+        headings = tuple(HeadingIndex.scan_headings(content))
+        heading_index = HeadingIndex(content, headings)
+        sections = cls.detect_sections(heading_index)
+        section_metadata = cls._merge_section_defaults(
+            cls._section_metadata_from_frontmatter(frontmatter),
+            cls._section_names(heading_index, sections),
+        )
+
+        variable_spans = tuple(cls.scan_variables(content))
+
+        return CompiledTemplate(
+            content_hash=key,
+            content=content,
+            body=body,
+            frontmatter=MappingProxyType(frontmatter),
+            sections=MappingProxyType(sections),
+            headings=headings,
+            variables=tuple(cls._dedupe_variables(variable_spans)),
+            variable_spans=variable_spans,
+            section_metadata=MappingProxyType(section_metadata),
+            variable_metadata=MappingProxyType(
+                cls._variable_metadata_from_frontmatter(frontmatter)
+            ),
+            heading_index=heading_index,
+        )
+
+    @classmethod
+    def clear_compile_cache(cls) -> None:
+        """Drop all memoized compiled templates."""
+        cls._compile_cache.clear()
+
+    @classmethod
+    def scan_variables(cls, content: str) -> Iterator[TemplateVariable]:
+        """
+        Scan content for every variable occurrence in a single pass.
+        
+        Args:
+            content: Template content string
+            
+        Yields:
+            TemplateVariable for each occurrence, in document order
+        """
+        for match in cls._variable_matches(content):
+            yield TemplateVariable(
+                name=match.group('name'),
+                syntax='double_brace' if match.re is cls.BRACE_VARIABLE_PATTERN else 'single_bracket',
+                start_pos=match.start(),
+                end_pos=match.end(),
+                default_value=match.group('default'),
+            )
+    
+    @classmethod
+    def _variable_matches(cls, content: str) -> Iterator['re.Match']:
+        """
+        Yield every variable placeholder in content, left to right.
+        
+        Both patterns are searched independently and merged by position; a
+        pending match overlapping the one just yielded is searched for again
+        from its end, so matches never overlap.
+        """
+        brace = cls.BRACE_VARIABLE_PATTERN.search(content)
+        bracket = cls.BRACKET_VARIABLE_PATTERN.search(content)
+        while brace is not None or bracket is not None:
+            if bracket is None or (brace is not None and brace.start() < bracket.start()):
+                match = brace
+            else:
+                match = bracket
+            yield match
+            end = match.end()
+            if brace is not None and brace.start() < end:
+                brace = cls.BRACE_VARIABLE_PATTERN.search(content, end)
+            if bracket is not None and bracket.start() < end:
+                bracket = cls.BRACKET_VARIABLE_PATTERN.search(content, end)
+    
+    @staticmethod
+    def _dedupe_variables(occurrences) -> List[TemplateVariable]:
+        """Keep the first occurrence of each variable name."""
+        seen = set()
+        variables = []
+        for var in occurrences:
+            if var.name not in seen:
+                seen.add(var.name)
+                variables.append(var)
+        return variables
     
     @classmethod
     def extract_variables(cls, content: str) -> List[TemplateVariable]:
         """
         Extract all variables from template content.
         
+        Each variable is reported once, at its first occurrence.
+        
         Args:
             content: Template content string
             
         Returns:
             List of TemplateVariable objects
         """
-        variables = []
-        
-        # Find double brace variables: {{VAR_NAME}} or {{VAR_NAME:default}}
-        for match in re.finditer(cls.DOUBLE_BRACE_PATTERN, content):
-            var = TemplateVariable(
-                name=match.group(1).split(':')[0],
-                syntax='double_brace',
-                start_pos=match.start(),
-                end_pos=match.end(),
-                default_value=match.group(1).split(':')[1] if ':' in match.group(1) else None
-            )
-            if var not in variables:
-                variables.append(var)
+        return cls._dedupe_variables(cls.scan_variables(content))
+    
+    @classmethod
+    def excerpt(cls, content: Union[str, CompiledTemplate], max_length: Optional[int] = None) -> str:
+        """
+        Build a short plain-text preview of a template for catalogue listings.
         
-        # Find single bracket variables: [VAR_NAME]
-        for match in re.finditer(cls.SINGLE_BRACKET_PATTERN, content):
-            var = TemplateVariable(
-                name=match.group(1),
-                syntax='single_bracket',
-                start_pos=match.start(),
-                end_pos=match.end(),
-            )
-            if var not in variables:
-                variables.append(var)
+        Frontmatter, headings and blank lines are skipped and whitespace is
+        collapsed. Lines are read only until the excerpt is full.
         
-        return variables
+        Args:
+            content: Template content or CompiledTemplate
+            max_length: Maximum length (default: EXCERPT_LENGTH)
+            
+        Returns:
+            Excerpt cut at a word boundary, ending in an ellipsis when cut
+        """
+        if max_length is None:
+            max_length = cls.EXCERPT_LENGTH
+        body = cls.compile(content).body
+        words = []
+        length = -1
+        pos = 0
+        while pos < len(body) and length <= max_length:
+            end = body.find('\n', pos)
+            if end == -1:
+                end = len(body)
+            line = body[pos:end].strip()
+            pos = end + 1
+            if not line or line.startswith('#'):
+                continue
+            for word in line.split():
+                if length + 1 + len(word) > max_length:
+                    if not words:  # A single word longer than the excerpt
+                        return word[:max_length - 1] + '…'
+                    return ' '.join(words) + '…'
+                words.append(word)
+                length += 1 + len(word)
+        return ' '.join(words)
     
     @classmethod
     def extract_variables_simple(cls, content: str) -> List[str]:
@@ -241,37 +737,50 @@ class TemplateParser:
             content: Template content string
             
         Returns:
-            List of variable names
-        """
-        pattern = r'\{\{(\w+)\}\}|\[(\w+)\]'
-        matches = re.findall(pattern, content)
-        variables = set()
-        for match in matches:
-            variables.add(match[0] if match[0] else match[1])
-        return sorted(list(variables))
+            Sorted list of variable names
+        """
+        return sorted({var.name for var in cls.scan_variables(content)})
     
     @classmethod
-    def detect_sections(cls, content: str) -> Dict[str, Tuple[int, int]]:
+    def detect_sections(
+        cls, content: Union[str, HeadingIndex]
+    ) -> Dict[str, Tuple[int, int]]:
         """
         Detect BMAD sections in template content.
         
+        A section is matched by the first heading named after it, or failing
+        that the first heading whose name starts with it ("## Input Data"
+        satisfies "## Input").
+        
         Args:
-            content: Template content string
+            content: Template content string or its HeadingIndex
             
         Returns:
-            Dictionary mapping section names to their (start, end) positions
+            Dictionary mapping section names to their heading (start, end) positions
         """
+        index = content if isinstance(content, HeadingIndex) else HeadingIndex.build(content)
         sections = {}
-        content_lower = content.lower()
         
         for section in cls.ALL_SECTIONS:
-            section_lower = section.lower()
-            pos = content_lower.find(section_lower)
-            if pos != -1:
-                sections[section] = (pos, pos + len(section))
+            i = index.find(section, prefix=True)
+            if i is not None:
+                heading = index.headings[i]
+                sections[section] = (heading.start_pos, heading.end_pos)
         
         return sections
     
+    @staticmethod
+    def _section_names(
+        index: HeadingIndex, sections: Mapping[str, Tuple[int, int]]
+    ) -> List[str]:
+        """Return detected BMAD sections followed by the remaining '##' headings."""
+        claimed = {start for start, _ in sections.values()}
+        names = list(sections)
+        for heading in index:
+            if heading.level == 2 and heading.start_pos not in claimed:
+                names.append(heading.name)
+        return names
+    
     @classmethod
     def check_required_sections(cls, content: str) -> Tuple[bool, List[str]]:
         """
@@ -339,26 +848,72 @@ class TemplateParser:
         return result
     
     @classmethod
-    def substitute_variables(cls, content: str, values: Dict[str, str]) -> str:
+    def render(
+        cls,
+        content: Union[str, CompiledTemplate],
+        values: Mapping[str, Any],
+        apply_defaults: bool = True,
+    ) -> SubstitutionResult:
+        """
+        Substitute variables in a single pass over the template.
+        
+        Walks the variable spans in document order and joins the literal text
+        between them with the replacement values, so the content is copied
+        once regardless of how many variables are supplied. Placeholders with
+        no value fall back to their ``{{VAR:default}}`` default; those with
+        neither are left in place and reported as unreplaced.
+        
+        Args:
+            content: Template content string or CompiledTemplate (whose
+                precomputed variable spans are reused)
+            values: Mapping of variable names to replacement values
+            apply_defaults: Whether inline defaults fill missing values
+            
+        Returns:
+            SubstitutionResult with the output and sorted unreplaced names
+        """
+        if isinstance(content, CompiledTemplate):
+            spans = content.variable_spans
+            content = content.content
+        else:
+            content = content or ''
+            spans = cls.scan_variables(content)
+        
+        parts = []
+        unreplaced = set()
+        pos = 0
+        for var in spans:
+            if var.name in values:
+                replacement = str(values[var.name])
+            elif apply_defaults and var.default_value is not None:
+                replacement = var.default_value
+            else:
+                # Placeholders carrying a default are satisfiable and not reported
+                if var.default_value is None:
+                    unreplaced.add(var.name)
+                continue
+            parts.append(content[pos:var.start_pos])
+            parts.append(replacement)
+            pos = var.end_pos
+        parts.append(content[pos:])
+        
+        return SubstitutionResult(output=''.join(parts), unreplaced=sorted(unreplaced))
+    
+    @classmethod
+    def substitute_variables(
+        cls, content: Union[str, CompiledTemplate], values: Dict[str, str]
+    ) -> str:
         """
         Substitute variables in template content with provided values.
         
         Args:
-            content: Template content string
+            content: Template content string or CompiledTemplate
             values: Dictionary mapping variable names to replacement values
             
         Returns:
             Content with variables substituted
         """
-        result = content
-        
-        for var_name, value in values.items():
-            # Replace double brace syntax
-            result = result.replace('{{' + var_name + '}}', str(value))
-            # Replace single bracket syntax
-            result = result.replace('[' + var_name + ']', str(value))
-        
-        return result
+        return cls.render(content, values).output
     
     @classmethod
     def find_unreplaced_variables(cls, content: str) -> List[str]:
@@ -369,15 +924,13 @@ class TemplateParser:
             content: Template content string
 
         Returns:
-            List of unreplaced variable names
+            Sorted list of unreplaced variable names
         """
-        variables = cls.extract_variables_simple(content)
-        # Check if any variables remain in content
-        unreplaced = []
-        for var in variables:
-            if '{{' + var + '}}' in content or '[' + var + ']' in content:
-                unreplaced.append(var)
-        return unreplaced
+        # Placeholders carrying a default are satisfiable and not reported
+        return sorted({
+            var.name for var in cls.scan_variables(content)
+            if var.default_value is None
+        })
 
     @classmethod
     def parse_frontmatter(cls, content: str) -> Tuple[Dict[str, Any], str]:
@@ -390,26 +943,13 @@ class TemplateParser:
         Returns:
             Tuple of (frontmatter dict, remaining content)
         """
-        if not content.startswith('---'):
-            return {}, content
-
-        # Find the closing ---
-        lines = content.split('\n')
-        end_index = -1
-        for i, line in enumerate(lines[1:], 1):
-            if line.strip() == '---':
-                end_index = i
-                break
-
-        if end_index == -1:
+        split = FrontmatterParser.split(content)
+        if split is None:
             return {}, content
-
-        # Parse YAML frontmatter
-        frontmatter_text = '\n'.join(lines[1:end_index])
-        remaining_content = '\n'.join(lines[end_index + 1:])
+        frontmatter_text, remaining_content = split
 
         try:
-            frontmatter = yaml.safe_load(frontmatter_text) or {}
+            frontmatter = FrontmatterParser.load(frontmatter_text) or {}
         except yaml.YAMLError:
             frontmatter = {}
 
@@ -426,8 +966,17 @@ class TemplateParser:
         Returns:
             Dictionary mapping section names to SectionMetadata
         """
-        frontmatter, _ = cls.parse_frontmatter(content)
-        sections_data = frontmatter.get('sections', {})
+        return cls._section_metadata_from_frontmatter(cls.compile(content).frontmatter)
+
+    @classmethod
+    def _section_metadata_from_frontmatter(
+        cls,
+        frontmatter: Mapping[str, Any]
+    ) -> Dict[str, SectionMetadata]:
+        """Build SectionMetadata for every section declared in frontmatter."""
+        sections_data = frontmatter.get('sections') or {}
+        if not isinstance(sections_data, dict):
+            return {}
 
         section_metadata = {}
         for section_name, section_config in sections_data.items():
@@ -449,8 +998,17 @@ class TemplateParser:
         Returns:
             Dictionary mapping variable names to VariableMetadata
         """
-        frontmatter, _ = cls.parse_frontmatter(content)
-        variables_data = frontmatter.get('variables', {})
+        return dict(cls.compile(content).variable_metadata)
+
+    @classmethod
+    def _variable_metadata_from_frontmatter(
+        cls,
+        frontmatter: Mapping[str, Any]
+    ) -> Dict[str, VariableMetadata]:
+        """Build VariableMetadata for every variable declared in frontmatter."""
+        variables_data = frontmatter.get('variables') or {}
+        if not isinstance(variables_data, dict):
+            return {}
 
         variable_metadata = {}
         for var_name, var_config in variables_data.items():
@@ -481,82 +1039,24 @@ class TemplateParser:
         Returns:
             Dictionary mapping section names to SectionMetadata
         """
-        # Parse any existing metadata from frontmatter
-        metadata = cls.parse_section_metadata(content)
-
-        # Define default section configurations
-        default_configs = {
-            'Your Role': SectionMetadata(
-                name='Your Role',
-                required=True,
-                min_words=20,
-                validation_severity=ValidationSeverity.CRITICAL,
-                help_text="Define the AI persona and primary responsibilities.",
-                keywords_recommended=['responsibility', 'expertise', 'role', 'task'],
-            ),
-            'Input': SectionMetadata(
-                name='Input',
-                required=True,
-                min_words=15,
-                validation_severity=ValidationSeverity.CRITICAL,
-                help_text="Specify what information or data will be provided.",
-                keywords_recommended=['provide', 'given', 'receive', 'include'],
-            ),
-            'Output Requirements': SectionMetadata(
-                name='Output Requirements',
-                required=True,
-                min_words=20,
-                validation_severity=ValidationSeverity.CRITICAL,
-                help_text="Define the expected output format and structure.",
-                keywords_recommended=['format', 'structure', 'output', 'return', 'produce'],
-            ),
-            'Context': SectionMetadata(
-                name='Context',
-                required=False,
-                min_words=10,
-                validation_severity=ValidationSeverity.WARNING,
-                help_text="Provide background information and context.",
-            ),
-            'Constraints': SectionMetadata(
-                name='Constraints',
-                required=False,
-                min_words=10,
-                validation_severity=ValidationSeverity.WARNING,
-                help_text="Define any limitations or restrictions.",
-            ),
-            'Examples': SectionMetadata(
-                name='Examples',
-                required=False,
-                min_words=10,
-                validation_severity=ValidationSeverity.INFO,
-                help_text="Provide examples of expected input/output.",
-            ),
-            'Step-by-Step Instructions': SectionMetadata(
-                name='Step-by-Step Instructions',
-                required=False,
-                min_words=10,
-                validation_severity=ValidationSeverity.WARNING,
-                help_text="Break down the process into clear steps.",
-            ),
-            'Success Criteria': SectionMetadata(
-                name='Success Criteria',
-                required=False,
-                min_words=10,
-                validation_severity=ValidationSeverity.WARNING,
-                help_text="Define how success will be measured.",
-            ),
-            'Notes': SectionMetadata(
-                name='Notes',
-                required=False,
-                min_words=5,
-                validation_severity=ValidationSeverity.INFO,
-                help_text="Additional notes and considerations.",
-            ),
-        }
+        return dict(cls.compile(content).section_metadata)
 
-        # Detect sections in content
-        detected_sections = cls.detect_sections(content)
+    @classmethod
+    def _merge_section_defaults(
+        cls,
+        metadata: Dict[str, SectionMetadata],
+        detected_sections: Iterable[str]
+    ) -> Dict[str, SectionMetadata]:
+        """
+        Merge frontmatter section metadata with the built-in defaults.
+
+        Args:
+            metadata: Section metadata declared in frontmatter
+            detected_sections: Names of the sections found in the template content
 
+        Returns:
+            Dictionary mapping section names to SectionMetadata
+        """
         # Merge: use provided metadata, fall back to defaults
         result = {}
         for section_name in detected_sections:
@@ -565,25 +1065,36 @@ class TemplateParser:
 
             if clean_name in metadata:
                 result[clean_name] = metadata[clean_name]
-            elif clean_name in default_configs:
-                result[clean_name] = default_configs[clean_name]
             else:
-                # Create default metadata for unknown sections
-                result[clean_name] = SectionMetadata(
-                    name=clean_name,
-                    required=False,
-                    min_words=10,
-                    validation_severity=ValidationSeverity.WARNING,
-                )
+                result[clean_name] = default_section_metadata(clean_name)
 
         return result
 
+    @classmethod
+    def resolve_section_metadata(
+        cls, section_name: str, metadata: Optional[SectionMetadata] = None
+    ) -> SectionMetadata:
+        """
+        Return the metadata to validate a section with, applying defaults.
+
+        Args:
+            section_name: Name of the section
+            metadata: Declared SectionMetadata, if any
+
+        Returns:
+            The declared metadata, or the built-in defaults for the section when it is None
+        """
+        if metadata is not None:
+            return metadata
+        return default_section_metadata(section_name)
+
     @classmethod
     def validate_section_against_metadata(
         cls,
         section_name: str,
         content: str,
-        metadata: Optional[SectionMetadata] = None
+        metadata: Optional[SectionMetadata] = None,
+        stats: Optional['SectionStats'] = None,
     ) -> SectionValidationResult:
         """
         Validate section content against its metadata rules.
@@ -592,92 +1103,84 @@ class TemplateParser:
             section_name: Name of the section being validated
             content: Content of the section
             metadata: SectionMetadata for validation rules (uses defaults if None)
+            stats: SectionStats already tracking the content (for example from
+                an incremental validation session); built from content if None
 
         Returns:
             SectionValidationResult with validation details
         """
-        # Use default metadata if none provided
-        if metadata is None:
-            default_metadata = cls.get_section_metadata_with_defaults('')
-            metadata = default_metadata.get(
-                section_name,
-                SectionMetadata(
-                    name=section_name,
-                    required=False,
-                    min_words=10,
-                    validation_severity=ValidationSeverity.WARNING,
-                )
+        metadata = cls.resolve_section_metadata(section_name, metadata)
+        if stats is None:
+            from .section_stats import SectionStats
+            stats = SectionStats(
+                content, metadata.keywords_required + metadata.keywords_recommended
             )
 
-        result = SectionValidationResult(
-            is_valid=True,
-            section_name=section_name,
-            severity=metadata.validation_severity,
-        )
+        is_valid = True
+        errors: List[str] = []
+        warnings: List[str] = []
+        info: List[str] = []
 
-        # Calculate word count
-        words = content.split()
-        result.word_count = len(words)
+        # Word count
+        word_count = stats.word_count
 
         # Check minimum word count
-        if result.word_count < metadata.min_words:
+        if word_count < metadata.min_words:
             if metadata.validation_severity == ValidationSeverity.CRITICAL:
-                result.is_valid = False
-                result.errors.append(
-                    f"Section '{section_name}' has {result.word_count} words, "
+                is_valid = False
+                errors.append(
+                    f"Section '{section_name}' has {word_count} words, "
                     f"minimum required is {metadata.min_words}."
                 )
             else:
-                result.warnings.append(
-                    f"Section '{section_name}' has {result.word_count} words, "
+                warnings.append(
+                    f"Section '{section_name}' has {word_count} words, "
                     f"recommended minimum is {metadata.min_words}."
                 )
 
         # Check maximum word count
-        if metadata.max_words and result.word_count > metadata.max_words:
-            result.warnings.append(
-                f"Section '{section_name}' has {result.word_count} words, "
+        if metadata.max_words and word_count > metadata.max_words:
+            warnings.append(
+                f"Section '{section_name}' has {word_count} words, "
                 f"recommended maximum is {metadata.max_words}."
             )
 
         # Check required keywords
-        content_lower = content.lower()
         missing_required = []
         for keyword in metadata.keywords_required:
-            if keyword.lower() not in content_lower:
+            if not stats.has_keyword(keyword):
                 missing_required.append(keyword)
 
         if missing_required:
-            result.is_valid = False
-            result.missing_keywords = missing_required
-            result.errors.append(
+            is_valid = False
+            errors.append(
                 f"Missing required keywords in '{section_name}': {', '.join(missing_required)}"
             )
 
         # Check recommended keywords (info only)
         missing_recommended = []
         for keyword in metadata.keywords_recommended:
-            if keyword.lower() not in content_lower:
+            if not stats.has_keyword(keyword):
                 missing_recommended.append(keyword)
 
         if missing_recommended:
-            result.info.append(
+            info.append(
                 f"Consider including these keywords in '{section_name}': {', '.join(missing_recommended)}"
             )
 
         # Check for unreplaced variables
-        unreplaced = cls.find_unreplaced_variables(content)
+        unreplaced = stats.unreplaced_variables
         if unreplaced:
-            result.is_valid = False
-            result.errors.append(
+            is_valid = False
+            errors.append(
                 f"Unreplaced variables in '{section_name}': {', '.join(unreplaced)}"
             )
 
         # Calculate completion percentage
         if metadata.min_words > 0:
-            word_percentage = min(100, (result.word_count / metadata.min_words) * 100)
+            word_percentage = min(100, (word_count / metadata.min_words) * 100)
         else:
-            word_percentage = 100 if result.word_count > 0 else 0
+            word_percentage = 100 if word_count > 0 else 0
 
         keyword_count = len(metadata.keywords_required) + len(metadata.keywords_recommended)
         if keyword_count > 0:
@@ -689,9 +1192,63 @@ class TemplateParser:
         else:
             keyword_percentage = 100
 
-        result.completion_percentage = (word_percentage + keyword_percentage) / 2
+        return SectionValidationResult(
+            is_valid=is_valid,
+            section_name=section_name,
+            severity=metadata.validation_severity,
+            errors=tuple(errors),
+            warnings=tuple(warnings),
+            info=tuple(info),
+            missing_keywords=tuple(missing_required),
+            word_count=word_count,
+            completion_percentage=(word_percentage + keyword_percentage) / 2,
+        )
+
+    @classmethod
+    def iter_patterns(cls, content: Union[str, CompiledTemplate]) -> Iterator[Tuple[str, SafePattern]]:
+        """
+        Yield every validation pattern a template declares.
 
-        return result
+        Args:
+            content: Template content or CompiledTemplate
+
+        Yields:
+            (owner description, SafePattern) for variables and structured fields
+        """
+        compiled = cls.compile(content)
+        for name, metadata in compiled.variable_metadata.items():
+            if metadata.pattern is not None:
+                yield f"variable '{name}'", metadata.pattern
+        for section_name, metadata in compiled.section_metadata.items():
+            for structured in metadata.structured_fields:
+                if structured.pattern is not None:
+                    yield f"field '{structured.name}' of section '{section_name}'", structured.pattern
+
+    @classmethod
+    def lint_patterns(cls, content: Union[str, CompiledTemplate]) -> List[str]:
+        """
+        Report the validation patterns of a template that are unsafe to run.
+
+        Args:
+            content: Template content or CompiledTemplate
+
+        Returns:
+            One message per pattern that does not compile or can backtrack
+            catastrophically
+        """
+        messages = []
+        for owner, pattern in cls.iter_patterns(content):
+            if pattern.error:
+                messages.append(
+                    f"Validation pattern of {owner} does not compile ({pattern.error}) "
+                    f"and is ignored."
+                )
+            elif pattern.is_risky:
+                messages.append(
+                    f"Validation pattern of {owner} has {', '.join(pattern.issues)}; "
+                    f"it is matched in a time-limited worker."
+                )
+        return messages
 
     @classmethod
     def validate_variable_value(
@@ -742,17 +1299,18 @@ class TemplateParser:
                 f"{metadata.max_length} characters."
             )
 
-        # Check validation pattern
-        if metadata.validation_pattern:
-            try:
-                pattern = re.compile(metadata.validation_pattern)
-                if not pattern.match(value):
-                    errors.append(
-                        f"Variable '{variable_name}' does not match required format."
-                    )
-            except re.error:
-                # Invalid regex pattern, skip validation
-                pass
+        # Check validation pattern (an invalid pattern skips the check)
+        if metadata.pattern is not None:
+            verdict = metadata.pattern.match(value)
+            if verdict == PatternVerdict.NO_MATCH:
+                errors.append(
+                    f"Variable '{variable_name}' does not match required format."
+                )
+            elif verdict == PatternVerdict.TIMEOUT:
+                errors.append(
+                    f"Variable '{variable_name}' could not be checked against its "
+                    f"required format in time."
+                )
 
         # Check options (for select/multiselect)
         if metadata.options and metadata.input_type in ('select', 'multiselect'):
@@ -785,8 +1343,7 @@ class TemplateParser:
             Dictionary with guidance information
         """
         if metadata is None:
-            default_metadata = cls.get_section_metadata_with_defaults('')
-            metadata = default_metadata.get(section_name)
+            metadata = DEFAULT_SECTION_METADATA.get(section_name)
 
         if metadata is None:
             return {
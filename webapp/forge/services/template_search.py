@@ -0,0 +1,182 @@
+"""
+Ranked full-text search over templates.
+"""
+
+import re
+from typing import List, Optional
+
+from django.db import connections, models
+from django.db.models.expressions import RawSQL
+
+
+class TemplateSearch:
+    """
+    Full-text search over template titles, descriptions and bodies.
+
+    The index is kept by the database, so a search reads index pages rather
+    than every template body:
+
+    - PostgreSQL: a generated tsvector column, search_vector, with a GIN
+      index. Titles weigh most, then descriptions, then bodies. The column
+      is maintained by the database on every write.
+    - SQLite: an FTS5 table, forge_template_fts, keyed by template id and
+      ranked with BM25 using the same weights. Template save/delete signals
+      keep it current (see forge.signals); rebuild() repairs it after bulk
+      changes that bypass signals.
+
+    Other databases, or SQLite builds without FTS5, fall back to
+    case-insensitive substring matching. The index is created by migration
+    0013_template_search_index.
+    """
+
+    FTS_TABLE = 'forge_template_fts'
+
+    # Relative weight of matches in the title, description and content
+    BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+    # Words of a query; everything else (operators, quotes) is dropped
+    TERM_PATTERN = re.compile(r'\w+')
+
+    _fts_available = {}
+
+    @classmethod
+    def backend(cls, using: str = 'default') -> Optional[str]:
+        """
+        Return the search backend for a database.
+
+        Args:
+            using: Database alias
+
+        Returns:
+            'postgresql', 'sqlite', or None when only substring search is
+            available
+        """
+        connection = connections[using]
+        if connection.vendor == 'postgresql':
+            return 'postgresql'
+        if connection.vendor != 'sqlite':
+            return None
+        name = connection.settings_dict['NAME']
+        if name not in cls._fts_available:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [cls.FTS_TABLE]
+                )
+                cls._fts_available[name] = cursor.fetchone() is not None
+        return 'sqlite' if cls._fts_available[name] else None
+
+    @classmethod
+    def terms(cls, query: str) -> List[str]:
+        """Split a user query into lower-cased search terms."""
+        return cls.TERM_PATTERN.findall((query or '').lower())
+
+    @classmethod
+    def search(cls, queryset, query: str, ordered: bool = True):
+        """
+        Filter templates to those matching every term of a query.
+
+        Each term also matches words it is a prefix of, so partial words
+        typed into a search box find results.
+
+        Args:
+            queryset: Template queryset to search within
+            query: User search text
+            ordered: Order results by relevance, best first (annotated as
+                search_rank on the full-text backends)
+
+        Returns:
+            Filtered queryset
+        """
+        terms = cls.terms(query)
+        if not terms:
+            return queryset.none()
+
+        backend = cls.backend(queryset.db)
+        if backend == 'postgresql':
+            tsquery = ' & '.join(f"'{term}':*" for term in terms)
+            queryset = queryset.filter(RawSQL(
+                "forge_template.search_vector @@ to_tsquery('english', %s)",
+                (tsquery,), output_field=models.BooleanField(),
+            ))
+            if ordered:
+                queryset = queryset.annotate(search_rank=RawSQL(
+                    "ts_rank(forge_template.search_vector, to_tsquery('english', %s))",
+                    (tsquery,), output_field=models.FloatField(),
+                )).order_by('-search_rank', 'title')
+        elif backend == 'sqlite':
+            # Joined rather than ranked in a correlated subquery, so the
+            # FTS5 query runs once and bm25() reads its ranking state
+            match = ' '.join(f'"{term}"*' for term in terms)
+            queryset = queryset.extra(
+                tables=[cls.FTS_TABLE],
+                where=[f'{cls.FTS_TABLE}.rowid = forge_template.id', f'{cls.FTS_TABLE} MATCH %s'],
+                params=[match],
+            )
+            if ordered:
+                weights = ', '.join(str(weight) for weight in cls.BM25_WEIGHTS)
+                # bm25() is lower for better matches
+                queryset = queryset.extra(
+                    select={'search_rank': f'-bm25({cls.FTS_TABLE}, {weights})'}
+                ).order_by('-search_rank', 'title')
+        else:
+            for term in terms:
+                queryset = queryset.filter(
+                    models.Q(title__icontains=term) |
+                    models.Q(description__icontains=term) |
+                    models.Q(content__icontains=term)
+                )
+        return queryset
+
+    @classmethod
+    def index(cls, template) -> None:
+        """
+        Write a template's searchable text to the SQLite FTS5 table.
+
+        A no-op on other backends, where the database maintains the index.
+
+        Args:
+            template: Saved Template instance
+        """
+        if cls.backend(template._state.db or 'default') != 'sqlite':
+            return
+        with connections[template._state.db or 'default'].cursor() as cursor:
+            cursor.execute(f"DELETE FROM {cls.FTS_TABLE} WHERE rowid = %s", [template.pk])
+            cursor.execute(
+                f"INSERT INTO {cls.FTS_TABLE} (rowid, title, description, content) VALUES (%s, %s, %s, %s)",
+                [template.pk, template.title, template.description or '', template.content],
+            )
+
+    @classmethod
+    def unindex(cls, pk: int, using: str = 'default') -> None:
+        """
+        Remove a deleted template from the SQLite FTS5 table.
+
+        Args:
+            pk: Primary key of the deleted template
+            using: Database alias
+        """
+        if cls.backend(using) != 'sqlite':
+            return
+        with connections[using].cursor() as cursor:
+            cursor.execute(f"DELETE FROM {cls.FTS_TABLE} WHERE rowid = %s", [pk])
+
+    @classmethod
+    def rebuild(cls, using: str = 'default') -> Optional[str]:
+        """
+        Rebuild the SQLite FTS5 table from the templates table.
+
+        Args:
+            using: Database alias
+
+        Returns:
+            The backend in use; None when there is no index to rebuild
+        """
+        backend = cls.backend(using)
+        if backend == 'sqlite':
+            with connections[using].cursor() as cursor:
+                cursor.execute(f"DELETE FROM {cls.FTS_TABLE}")
+                cursor.execute(
+                    f"INSERT INTO {cls.FTS_TABLE} (rowid, title, description, content) "
+                    f"SELECT id, title, COALESCE(description, ''), content FROM forge_template"
+                )
+        return backend
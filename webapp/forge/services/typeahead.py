@@ -0,0 +1,241 @@
+"""
+In-process trigram index for typeahead template lookup.
+"""
+
+import logging
+import re
+import threading
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class TypeaheadEntry:
+    """The catalogue facts about one active template a typeahead result shows."""
+    id: int
+    title: str
+    description: str
+    roles: Tuple[str, ...]
+    workflow_phase: str
+    variables: Tuple[str, ...]
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'roles': list(self.roles),
+            'workflow_phase': self.workflow_phase,
+        }
+
+
+class TypeaheadIndex:
+    """
+    Trigram index over the active templates, held in process memory.
+
+    Every word of a template's title, description, roles and variable names
+    is split into trigrams, padded at the start as in pg_trgm ("  w", " wo",
+    "wor", ...), so a few typed characters match words they begin and small
+    typos still share most trigrams. Each trigram maps to the templates
+    containing it, weighted by the field it came from. A template matches
+    when it holds at least MIN_SCORE of the query's trigrams and ranks by
+    their summed weights. Queries never touch the database.
+
+    The index is built on first use in each process and dropped when a
+    template is saved or deleted (see forge.signals) or a sync completes.
+    Other processes notice through a generation stamp in the Django cache,
+    checked at most every CHECK_INTERVAL seconds.
+    """
+
+    FIELD_WEIGHTS = {'title': 3.0, 'roles': 2.0, 'variables': 1.5, 'description': 1.0}
+
+    # Results must contain at least this share of the query's trigrams
+    MIN_SCORE = 0.5
+
+    DEFAULT_LIMIT = 8
+    MAX_LIMIT = 25
+
+    GENERATION_KEY = 'forge:typeahead:generation'
+    CHECK_INTERVAL = 5.0
+
+    WORD_PATTERN = re.compile(r'[^\W_]+')
+
+    _current: Optional['TypeaheadIndex'] = None
+    _generation: Optional[str] = None
+    _checked_at = 0.0
+    _lock = threading.Lock()
+
+    def __init__(self, entries: Iterable[TypeaheadEntry]):
+        self.entries: List[TypeaheadEntry] = list(entries)
+        postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        for position, entry in enumerate(self.entries):
+            fields = (
+                ('title', (entry.title,)),
+                ('roles', entry.roles),
+                ('variables', entry.variables),
+                ('description', (entry.description,)),
+            )
+            for field_name, values in fields:
+                weight = self.FIELD_WEIGHTS[field_name]
+                for value in values:
+                    for gram in self.trigrams(value):
+                        if postings[gram].get(position, 0.0) < weight:
+                            postings[gram][position] = weight
+        self.postings = dict(postings)
+
+    @classmethod
+    def words(cls, text: str) -> List[str]:
+        """Lower-cased words of text; underscores split variable names into words."""
+        return cls.WORD_PATTERN.findall((text or '').lower())
+
+    @classmethod
+    def trigrams(cls, text: str, partial: bool = False) -> set:
+        """
+        Return the padded trigrams of every word in text.
+
+        Args:
+            text: Text to split
+            partial: Treat the last word as unfinished (no end-of-word trigram)
+
+        Returns:
+            Set of trigrams
+        """
+        grams = set()
+        words = cls.words(text)
+        for position, word in enumerate(words):
+            padded = f'  {word}' if partial and position == len(words) - 1 else f'  {word} '
+            grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+        return grams
+
+    def search(
+        self,
+        query: str,
+        limit: int = DEFAULT_LIMIT,
+        role: Optional[str] = None,
+        workflow_phase: Optional[str] = None,
+    ) -> List[TypeaheadEntry]:
+        """
+        Return the best matching templates for a partly typed query.
+
+        Args:
+            query: Text typed so far
+            limit: Maximum number of results
+            role: Only templates with this role
+            workflow_phase: Only templates in this phase
+
+        Returns:
+            Entries, best match first
+        """
+        grams = self.trigrams(query, partial=True)
+        if not grams:
+            return []
+
+        scores: Dict[int, float] = defaultdict(float)
+        matched: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for position, weight in self.postings.get(gram, {}).items():
+                scores[position] += weight
+                matched[position] += 1
+
+        threshold = self.MIN_SCORE * len(grams)
+        ranked = []
+        for position, score in scores.items():
+            if matched[position] < threshold:
+                continue
+            entry = self.entries[position]
+            if role and role not in entry.roles:
+                continue
+            if workflow_phase and entry.workflow_phase != workflow_phase:
+                continue
+            ranked.append((-score, entry.title.lower(), entry.id, entry))
+        ranked.sort()
+        return [entry for *_, entry in ranked[:limit]]
+
+    @classmethod
+    def build(cls) -> 'TypeaheadIndex':
+        """Build an index from the active templates' catalogue columns."""
+        from ..models import Template
+
+        rows = Template.objects.catalogue(
+            Template.objects.filter(is_active=True), extra_fields=('variables',)
+        ).order_by('pk')
+        return cls(
+            TypeaheadEntry(
+                id=template.pk,
+                title=template.title,
+                description=template.description or template.excerpt,
+                roles=tuple(template.get_roles_list()),
+                workflow_phase=template.workflow_phase,
+                variables=tuple(template.get_variables_list()),
+            )
+            for template in rows
+        )
+
+    @classmethod
+    def get(cls) -> 'TypeaheadIndex':
+        """
+        Return this process's index, rebuilding it when it is missing or stale.
+
+        Returns:
+            The current TypeaheadIndex
+        """
+        now = time.monotonic()
+        with cls._lock:
+            index = cls._current
+            if index is not None and now - cls._checked_at < cls.CHECK_INTERVAL:
+                return index
+            cls._checked_at = now
+        generation = cls._shared_generation()
+        if index is not None and generation == cls._generation:
+            return index
+        index = cls.build()
+        with cls._lock:
+            cls._current = index
+            cls._generation = generation
+        return index
+
+    @classmethod
+    def search_templates(cls, query: str, **kwargs) -> List[TypeaheadEntry]:
+        """Search the current index (see search() for the arguments)."""
+        return cls.get().search(query, **kwargs)
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop the index in every process once the current transaction commits."""
+        transaction.on_commit(cls._invalidate_now)
+
+    @classmethod
+    def refresh(cls) -> 'TypeaheadIndex':
+        """Rebuild this process's index now and tell other processes to rebuild theirs."""
+        cls._invalidate_now()
+        return cls.get()
+
+    @classmethod
+    def _invalidate_now(cls) -> None:
+        with cls._lock:
+            cls._current = None
+        try:
+            cls._shared_cache().set(cls.GENERATION_KEY, uuid.uuid4().hex, None)
+        except Exception as e:
+            logger.warning(f"Typeahead generation write failed: {e}")
+
+    @classmethod
+    def _shared_cache(cls):
+        from django.core.cache import caches
+        return caches[getattr(settings, 'TYPEAHEAD_CACHE_ALIAS', 'default')]
+
+    @classmethod
+    def _shared_generation(cls) -> Optional[str]:
+        try:
+            return cls._shared_cache().get(cls.GENERATION_KEY)
+        except Exception as e:
+            logger.warning(f"Typeahead generation read failed: {e}")
+            return None
@@ -0,0 +1,174 @@
+"""
+Content-hash keyed cache for validation results.
+"""
+
+import logging
+import pickle
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+
+from .caching import LRUCache, content_hash
+from .template_parser import TemplateParser
+
+logger = logging.getLogger(__name__)
+
+
+class ValidationCache:
+    """
+    Two-level cache in front of the validators.
+
+    Results are keyed by (validator name, validator version, template
+    metadata hash, content hash), so bumping a validator's version or
+    changing a template's metadata simply stops old entries from being
+    found. Lookups try a process-local LRU first and then the configured
+    Django cache (Redis in production), so workers share each other's
+    results. Values are stored pickled and unpickled on every hit: callers
+    get their own copy and can mutate it freely.
+
+    The Django cache is best-effort; if it is unreachable, validation
+    carries on with the local cache alone.
+    """
+
+    KEY_PREFIX = 'forge:validation'
+
+    # Defaults, overridable with VALIDATION_CACHE_* settings
+    DEFAULT_LOCAL_SIZE = 512
+    DEFAULT_TIMEOUT = 60 * 60 * 24
+
+    _local: Optional[LRUCache] = None
+    _lock = threading.Lock()
+    _shared_hits = 0
+    _shared_misses = 0
+    _shared_errors = 0
+
+    @classmethod
+    def make_key(cls, validator: str, version: Any, content: str, template_hash: str = '') -> str:
+        """
+        Build the cache key for a validation.
+
+        Args:
+            validator: Name of the validation (e.g. 'bmad')
+            version: Version of the validator's rules
+            content: Validated content; include anything else the result
+                depends on, such as the section name
+            template_hash: Content hash of the template whose metadata the
+                rules come from, if any
+
+        Returns:
+            Cache key string
+        """
+        return (
+            f'{cls.KEY_PREFIX}:{validator}:v{version}.p{TemplateParser.PARSER_VERSION}:'
+            f'{template_hash}:{content_hash(content)}'
+        )
+
+    @classmethod
+    def get_or_compute(
+        cls,
+        validator: str,
+        version: Any,
+        content: str,
+        compute: Callable[[], Any],
+        template_hash: str = '',
+    ) -> Any:
+        """
+        Return the cached result of a validation, computing it on a miss.
+
+        Args:
+            validator: Name of the validation
+            version: Version of the validator's rules
+            content: Validated content (see make_key())
+            compute: Zero-argument callable performing the validation
+            template_hash: Content hash of the template, if any
+
+        Returns:
+            The validation result (a private copy on a hit)
+        """
+        if not getattr(settings, 'VALIDATION_CACHE_ENABLED', True):
+            return compute()
+
+        key = cls.make_key(validator, version, content, template_hash)
+        local = cls._local_cache()
+        blob = local.get(key)
+        if blob is None:
+            blob = cls._shared_get(key)
+            if blob is None:
+                result = compute()
+                blob = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+                cls._shared_set(key, blob)
+                local.set(key, blob)
+                return result
+            local.set(key, blob)
+        return pickle.loads(blob)
+
+    @classmethod
+    def _local_cache(cls) -> LRUCache:
+        """Return the process-local LRU, creating it from settings on first use."""
+        if cls._local is None:
+            with cls._lock:
+                if cls._local is None:
+                    cls._local = LRUCache(maxsize=getattr(
+                        settings, 'VALIDATION_CACHE_LOCAL_SIZE', cls.DEFAULT_LOCAL_SIZE
+                    ))
+        return cls._local
+
+    @classmethod
+    def _shared_cache(cls):
+        """Return the Django cache backing the local LRU."""
+        from django.core.cache import caches
+        return caches[getattr(settings, 'VALIDATION_CACHE_ALIAS', 'default')]
+
+    @classmethod
+    def _shared_get(cls, key: str) -> Optional[bytes]:
+        """Fetch a pickled result from the Django cache, counting hits and misses."""
+        try:
+            blob = cls._shared_cache().get(key)
+        except Exception as e:
+            cls._record('_shared_errors')
+            logger.warning(f"Validation cache read failed: {e}")
+            return None
+        cls._record('_shared_hits' if blob is not None else '_shared_misses')
+        return blob
+
+    @classmethod
+    def _shared_set(cls, key: str, blob: bytes) -> None:
+        """Store a pickled result in the Django cache."""
+        try:
+            cls._shared_cache().set(
+                key, blob, getattr(settings, 'VALIDATION_CACHE_TIMEOUT', cls.DEFAULT_TIMEOUT)
+            )
+        except Exception as e:
+            cls._record('_shared_errors')
+            logger.warning(f"Validation cache write failed: {e}")
+
+    @classmethod
+    def _record(cls, counter: str) -> None:
+        with cls._lock:
+            setattr(cls, counter, getattr(cls, counter) + 1)
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """
+        Return a snapshot of the cache counters.
+
+        Returns:
+            Local LRU size and hit/miss counts, plus shared cache hits,
+            misses and errors (counted on local misses only)
+        """
+        stats = cls._local_cache().stats()
+        with cls._lock:
+            stats.update({
+                'shared_hits': cls._shared_hits,
+                'shared_misses': cls._shared_misses,
+                'shared_errors': cls._shared_errors,
+            })
+        return stats
+
+    @classmethod
+    def clear(cls) -> None:
+        """Empty the local cache and reset all counters (the Django cache is left alone)."""
+        cls._local_cache().clear()
+        with cls._lock:
+            cls._shared_hits = cls._shared_misses = cls._shared_errors = 0
@@ -0,0 +1,91 @@
+"""
+Executable validation plans compiled from template section metadata.
+"""
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Iterable, Mapping, Optional, Tuple
+
+from .stream_analysis import StreamingAnalysis
+from .template_parser import SectionMetadata
+
+
+@dataclass(frozen=True, slots=True)
+class SectionRule:
+    """The metadata rules for one template section."""
+    name: str  # Section name without the '## ' marker
+    metadata: SectionMetadata
+    keywords: Tuple[str, ...]  # Required and recommended keywords
+
+
+@dataclass(frozen=True, slots=True)
+class ValidationPlan:
+    """
+    A template's section metadata compiled for validating documents.
+
+    The plan knows up front every section and keyword the rules look at, so
+    a document is analyzed in a single pass that tallies words, keywords
+    and placeholders for all sections at once. Validation cost is then
+    proportional to the document size, however many sections the template
+    declares. Plans are built once per CompiledTemplate (see
+    CompiledTemplate.validation_plan).
+    """
+    rules: Tuple[SectionRule, ...]
+    keywords: Mapping[str, Tuple[str, ...]]
+
+    @classmethod
+    def compile(cls, section_metadata: Mapping[str, SectionMetadata]) -> 'ValidationPlan':
+        """
+        Build the plan for a template's section metadata.
+
+        Args:
+            section_metadata: Section metadata of the compiled template
+
+        Returns:
+            ValidationPlan with one rule per section, in template order
+        """
+        rules = []
+        keywords = {}
+        for section_name, metadata in section_metadata.items():
+            name = section_name.replace('## ', '')
+            section_keywords = tuple(metadata.keywords_required) + tuple(metadata.keywords_recommended)
+            rules.append(SectionRule(name, metadata, section_keywords))
+            # BMAD sections are tallied under their canonical key, others by name
+            for key in (f'## {name}', name):
+                keywords[key] = keywords.get(key, ()) + section_keywords
+        return cls(rules=tuple(rules), keywords=MappingProxyType(keywords))
+
+    @property
+    def section_names(self) -> Tuple[str, ...]:
+        """Names of the sections the rules apply to."""
+        return tuple(rule.name for rule in self.rules)
+
+    def analyze(
+        self,
+        source,
+        extra_keywords: Optional[Mapping[Optional[str], Iterable[str]]] = None,
+        encoding: str = 'utf-8',
+    ) -> StreamingAnalysis:
+        """
+        Gather the facts the rules need from a document in one pass.
+
+        Args:
+            source: Document text, a file-like object with read(size), or an
+                iterable of str or bytes chunks
+            extra_keywords: Further keywords to track, in the form
+                StreamingAnalysis accepts
+            encoding: Encoding of bytes chunks
+
+        Returns:
+            The closed StreamingAnalysis
+        """
+        keywords = self.keywords
+        if extra_keywords:
+            keywords = dict(keywords)
+            for key, values in extra_keywords.items():
+                keywords[key] = keywords.get(key, ()) + tuple(values)
+        if isinstance(source, str):
+            source = (source,)
+        return StreamingAnalysis.from_stream(
+            source, keywords=keywords, sections=self.section_names, encoding=encoding
+        )
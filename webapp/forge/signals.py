@@ -0,0 +1,87 @@
+"""
+Signal handlers keeping derived data current: the materialized dashboard
+statistics, the SQLite full-text search index and the typeahead index.
+"""
+
+from collections import Counter
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import ArchivedPrompt, GeneratedPrompt, Template
+from .services.dashboard_stats import DashboardStats
+from .services.template_search import TemplateSearch
+from .services.typeahead import TypeaheadIndex
+
+
+def _template_counters(is_active, workflow_phase, agent_role, agent_roles):
+    """Counters for stored template values, mirroring Template.get_roles_list()."""
+    roles = agent_roles or ([agent_role] if agent_role else [])
+    return DashboardStats.template_counters(is_active, workflow_phase, roles)
+
+
+@receiver(pre_save, sender=Template)
+def remember_template_counters(sender, instance, raw=False, **kwargs):
+    """Record the counters the stored row contributes to before it changes."""
+    stored = None
+    if instance.pk and not raw:
+        stored = sender.objects.filter(pk=instance.pk).values(
+            'is_active', 'workflow_phase', 'agent_role', 'agent_roles'
+        ).first()
+    instance._dashboard_counters = _template_counters(**stored) if stored else Counter()
+
+
+@receiver(post_save, sender=Template)
+def update_template_counters(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    delta = DashboardStats.template_counters(
+        instance.is_active, instance.workflow_phase, instance.get_roles_list()
+    )
+    delta.subtract(getattr(instance, '_dashboard_counters', Counter()))
+    DashboardStats.apply(delta)
+
+
+@receiver(post_delete, sender=Template)
+def remove_template_counters(sender, instance, **kwargs):
+    delta = Counter()
+    delta.subtract(DashboardStats.template_counters(
+        instance.is_active, instance.workflow_phase, instance.get_roles_list()
+    ))
+    DashboardStats.apply(delta)
+
+
+@receiver(post_save, sender=Template)
+def index_template(sender, instance, raw=False, **kwargs):
+    if not raw:
+        TemplateSearch.index(instance)
+
+
+@receiver(post_delete, sender=Template)
+def unindex_template(sender, instance, using='default', **kwargs):
+    TemplateSearch.unindex(instance.pk, using)
+
+
+@receiver(post_save, sender=Template)
+@receiver(post_delete, sender=Template)
+def invalidate_typeahead(sender, instance, raw=False, **kwargs):
+    if not raw:
+        TypeaheadIndex.invalidate()
+
+
+@receiver(post_save, sender=GeneratedPrompt)
+def update_prompt_counters(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    # Saves of existing prompts can still change the recent list
+    DashboardStats.apply(Counter({('prompts', 'total'): 1}) if created else Counter())
+
+
+@receiver(post_delete, sender=GeneratedPrompt)
+def remove_prompt_counters(sender, instance, **kwargs):
+    DashboardStats.apply(Counter({('prompts', 'total'): -1}))
+
+
+@receiver(post_delete, sender=ArchivedPrompt)
+def remove_archived_prompt_counters(sender, instance, **kwargs):
+    DashboardStats.apply(Counter({('prompts', 'total'): -1}))
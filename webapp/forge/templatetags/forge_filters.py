@@ -25,3 +25,16 @@ def get_item(dictionary, key):
             return dictionary[key]
         except (KeyError, IndexError, TypeError):
             return None
+
+
+@register.simple_tag(takes_context=True)
+def cursor_url(context, cursor):
+    """
+    Build a link to a keyset page, keeping the current filters.
+    
+    Usage: <a href="{% cursor_url page_obj.next_cursor %}">
+    """
+    params = context['request'].GET.copy()
+    params.pop('page', None)
+    params['cursor'] = cursor
+    return f"?{params.urlencode()}"
@@ -26,12 +26,14 @@ urlpatterns = [
 
     # Document Generation URLs
     path('generate-document/', views.GenerateDocumentSelectView.as_view(), name='generate_document_select'),
+    path('generate-document/typeahead/', views.template_typeahead, name='template_typeahead'),
     path('generate-document/<int:template_id>/', views.GenerateDocumentWizardView.as_view(), name='generate_document_wizard'),
     path('generate-document/<int:template_id>/validate/', views.validate_section_realtime, name='validate_section_realtime'),
     path('generate-document/<int:template_id>/guidance/<str:section_name>/', views.get_section_guidance, name='get_section_guidance'),
     path('generate-document/<int:template_id>/validate-variable/', views.validate_variable, name='validate_variable'),
     path('generate-document/<int:template_id>/completion-status/', views.get_completion_status, name='get_completion_status'),
     path('generate-document/<int:template_id>/steps/', views.get_enhanced_wizard_steps, name='get_enhanced_wizard_steps'),
+    path('generate-document/<int:template_id>/validate-document/', views.validate_document, name='validate_document'),
 
     # GitHub Sync URLs
     path('sync/', views.GitHubSyncView.as_view(), name='github_sync'),
@@ -2,19 +2,27 @@
 Views for BMAD Forge application.
 """
 
+import codecs
 import json
+from dataclasses import asdict
 from django.shortcuts import render, get_object_or_404, redirect
 from django.views.generic import ListView, DetailView, FormView, TemplateView, View
 from django.http import JsonResponse, FileResponse, HttpResponse
 from django.contrib import messages
 from django.conf import settings
-from django.db import models
+from django.urls import reverse
 from django.views.decorators.http import require_http_methods
-from .models import Template, GeneratedPrompt
+from .models import Template, GeneratedPrompt, ArchivedPrompt
+from .pagination import KeysetPaginationMixin
 from .forms import DynamicPromptForm, TemplateFilterForm, GitHubSyncForm
 from .services import GitHubSyncService, BMADValidator, DocumentGenerator
 from .services.bmad_validator import MetadataAwareValidator
+from .services.dashboard_stats import DashboardStats
 from .services.template_parser import TemplateParser
+from .services.template_search import TemplateSearch
+from .services.typeahead import TypeaheadIndex
+from .services.section_stats import SectionStats, SectionStatsStore
+from .services.validation_cache import ValidationCache
 
 
 class DashboardView(TemplateView):
@@ -26,43 +34,12 @@ class DashboardView(TemplateView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['total_templates'] = Template.objects.filter(is_active=True).count()
-        context['templates_by_role'] = self._get_templates_by_role()
-        context['templates_by_phase'] = self._get_templates_by_phase()
-        context['recent_prompts'] = GeneratedPrompt.objects.select_related('template')[:5]
-        context['recent_templates'] = Template.objects.filter(is_active=True).order_by('-created_at')[:5]
+        # Materialized counts and recent items; independent of the number of templates
+        context.update(DashboardStats.get())
         return context
-    
-    def _get_templates_by_role(self):
-        """Get template counts grouped by agent role.
-        
-        Counts templates for each role, considering that templates can have
-        multiple roles stored in the agent_roles JSONField.
-        """
-        from collections import Counter
-        
-        templates = Template.objects.filter(is_active=True)
-        role_counts = Counter()
-        
-        for template in templates:
-            # Use the get_roles_list() method which handles both agent_role 
-            # and agent_roles fields
-            for role in template.get_roles_list():
-                role_counts[role] += 1
-        
-        return dict(role_counts)
-    
-    def _get_templates_by_phase(self):
-        """Get template counts grouped by workflow phase."""
-        return dict(
-            Template.objects.filter(is_active=True)
-            .values('workflow_phase')
-            .annotate(count=models.Count('id'))
-            .values_list('workflow_phase', 'count')
-        )
 
 
-class TemplateListView(ListView):
+class TemplateListView(KeysetPaginationMixin, ListView):
     """
     List view for browsing and filtering templates.
     """
@@ -71,9 +48,19 @@ class TemplateListView(ListView):
     template_name = 'forge/template_list.html'
     context_object_name = 'templates'
     paginate_by = 12
+    keyset_ordering = ('agent_role', 'workflow_phase', 'title', 'id')
+    
+    def get_keyset_ordering(self, queryset):
+        # Search results keep their relevance order and numbered pages
+        if self.request.GET.get('search'):
+            return None
+        return super().get_keyset_ordering(queryset)
     
     def get_queryset(self):
-        queryset = Template.objects.filter(is_active=True)
+        queryset = Template.objects.catalogue(
+            Template.objects.filter(is_active=True).select_related('health'),
+            extra_fields=('health__status', 'health__errors', 'health__warnings'),
+        )
         
         # Apply filters
         agent_role = self.request.GET.get('agent_role')
@@ -84,11 +71,7 @@ class TemplateListView(ListView):
         queryset = Template.objects.filter_by_workflow(queryset, workflow_phase)
         
         if search:
-            queryset = queryset.filter(
-                models.Q(title__icontains=search) |
-                models.Q(description__icontains=search) |
-                models.Q(content__icontains=search)
-            )
+            queryset = TemplateSearch.search(queryset, search)
         
         # Filter by role - handles multi-role templates using the custom manager
         queryset = Template.objects.filter_by_role(queryset, agent_role)
@@ -179,18 +162,20 @@ class PromptResultView(DetailView):
     template_name = 'forge/prompt_result.html'
     context_object_name = 'prompt'
     
+    def get_object(self, queryset=None):
+        return get_prompt_or_archived(self.kwargs['pk'])
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['validation_report'] = self.object.get_validation_status()
         
-        # Get validation details
-        validator_report = BMADValidator.validate(self.object.final_output)
-        context['validation_details'] = validator_report
+        # Validation details come from the snapshot stored with the prompt
+        context['validation_details'] = self.object.get_validation_report()
         
         return context
 
 
-class PromptHistoryView(ListView):
+class PromptHistoryView(KeysetPaginationMixin, ListView):
     """
     View showing history of generated prompts.
     """
@@ -199,9 +184,16 @@ class PromptHistoryView(ListView):
     template_name = 'forge/prompt_history.html'
     context_object_name = 'prompts'
     paginate_by = 20
+    # Newest first; seeks along the (is_valid, created_at) or (created_at, id) index
+    keyset_ordering = ('-created_at', '-id')
+    # Columns the history list shows; template bodies and parse artifacts stay unread
+    list_fields = (
+        'id', 'is_valid', 'created_at',
+        'template__title', 'template__agent_role', 'template__workflow_phase',
+    )
     
     def get_queryset(self):
-        queryset = GeneratedPrompt.objects.select_related('template')
+        queryset = GeneratedPrompt.objects.select_related('template').only(*self.list_fields)
         
         # Filter by validation status
         status = self.request.GET.get('status')
@@ -211,6 +203,14 @@ class PromptHistoryView(ListView):
             queryset = queryset.filter(is_valid=False)
         
         return queryset
+    
+    def get_keyset_querysets(self, queryset):
+        # Archived prompts follow on after the live ones, with the same filter
+        archived = ArchivedPrompt.objects.select_related('template').only(*self.list_fields)
+        status = self.request.GET.get('status')
+        if status in ('valid', 'invalid'):
+            archived = archived.filter(is_valid=status == 'valid')
+        return [queryset, archived]
 
 
 class GitHubSyncView(FormView):
@@ -254,6 +254,14 @@ class GitHubSyncView(FormView):
             )
         else:
             messages.error(self.request, f"Sync failed: {', '.join(results['errors'])}")
+        for warning in results.get('warnings', []):
+            messages.warning(self.request, warning)
+        health = results.get('health')
+        if health and health['error']:
+            messages.warning(
+                self.request,
+                f"{health['error']} template(s) failed linting; see the template list for details"
+            )
         
         return redirect('forge:template_list')
 
@@ -272,15 +280,36 @@ def manual_sync(request):
         )
     else:
         messages.error(request, f"Sync failed: {', '.join(results['errors'])}")
+    for warning in results.get('warnings', []):
+        messages.warning(request, warning)
+    health = results.get('health')
+    if health and health['error']:
+        messages.warning(
+            request,
+            f"{health['error']} template(s) failed linting; see the template list for details"
+        )
     
     return redirect('forge:template_list')
 
 
+def get_prompt_or_archived(pk):
+    """
+    Return the generated prompt with this id, looking in the archive if it was moved there.
+    
+    Raises:
+        Http404: If neither table has the prompt
+    """
+    prompt = GeneratedPrompt.objects.select_related('template').filter(pk=pk).first()
+    if prompt is None:
+        prompt = get_object_or_404(ArchivedPrompt.objects.select_related('template'), pk=pk)
+    return prompt
+
+
 def download_prompt(request, pk):
     """
     Download generated prompt as a Markdown file.
     """
-    prompt = get_object_or_404(GeneratedPrompt, pk=pk)
+    prompt = get_prompt_or_archived(pk)
     
     response = HttpResponse(
         prompt.final_output,
@@ -330,12 +359,15 @@ def health_check(request):
     except Exception as e:
         health_status['checks']['cache'] = f'error: {str(e)}'
 
+    # Validation cache effectiveness
+    health_status['validation_cache'] = ValidationCache.stats()
+
     # Return 503 if unhealthy, 200 if healthy
     status_code = 503 if health_status['status'] == 'unhealthy' else 200
     return JsonResponse(health_status, status=status_code)
 
 
-class GenerateDocumentSelectView(ListView):
+class GenerateDocumentSelectView(KeysetPaginationMixin, ListView):
     """
     View for selecting a template to generate a document from.
     """
@@ -344,9 +376,16 @@ class GenerateDocumentSelectView(ListView):
     template_name = 'forge/generate_document_select.html'
     context_object_name = 'templates'
     paginate_by = 12
+    keyset_ordering = ('agent_role', 'workflow_phase', 'title', 'id')
+    
+    def get_keyset_ordering(self, queryset):
+        # Search results keep their relevance order and numbered pages
+        if self.request.GET.get('search'):
+            return None
+        return super().get_keyset_ordering(queryset)
     
     def get_queryset(self):
-        queryset = Template.objects.filter(is_active=True)
+        queryset = Template.objects.catalogue(Template.objects.filter(is_active=True))
         
         # Apply filters
         agent_role = self.request.GET.get('agent_role')
@@ -357,11 +396,7 @@ class GenerateDocumentSelectView(ListView):
         queryset = Template.objects.filter_by_workflow(queryset, workflow_phase)
         
         if search:
-            queryset = queryset.filter(
-                models.Q(title__icontains=search) |
-                models.Q(description__icontains=search) |
-                models.Q(content__icontains=search)
-            )
+            queryset = TemplateSearch.search(queryset, search)
         
         # Filter by role - handles multi-role templates using the custom manager
         queryset = Template.objects.filter_by_role(queryset, agent_role)
@@ -376,6 +411,44 @@ class GenerateDocumentSelectView(ListView):
         return context
 
 
+def template_typeahead(request):
+    """
+    API endpoint for typeahead template lookup.
+    Answers from the in-process TypeaheadIndex without querying templates.
+
+    Query parameters: q (text typed so far), limit, agent_role and
+    workflow_phase.
+    """
+    if request.method != 'GET':
+        return JsonResponse({'error': 'GET method required'}, status=405)
+
+    query = request.GET.get('q', '').strip()
+    try:
+        limit = int(request.GET.get('limit', TypeaheadIndex.DEFAULT_LIMIT))
+    except ValueError:
+        return JsonResponse({'error': 'limit must be an integer'}, status=400)
+    limit = max(1, min(limit, TypeaheadIndex.MAX_LIMIT))
+
+    entries = TypeaheadIndex.search_templates(
+        query,
+        limit=limit,
+        role=request.GET.get('agent_role') or None,
+        workflow_phase=request.GET.get('workflow_phase') or None,
+    ) if query else []
+
+    return JsonResponse({
+        'query': query,
+        'results': [
+            {
+                **entry.to_dict(),
+                'url': reverse('forge:template_detail', args=[entry.id]),
+                'wizard_url': reverse('forge:generate_document_wizard', args=[entry.id]),
+            }
+            for entry in entries
+        ],
+    })
+
+
 class GenerateDocumentWizardView(TemplateView):
     """
     Wizard view for interactive document generation.
@@ -393,7 +466,7 @@ class GenerateDocumentWizardView(TemplateView):
         template = self.get_template_object()
 
         # Get enhanced wizard steps with metadata from DocumentGenerator
-        wizard_steps = DocumentGenerator.get_enhanced_wizard_steps(template.content)
+        wizard_steps = DocumentGenerator.get_enhanced_wizard_steps(template.get_compiled())
 
         # Get current step from query param
         current_step = int(self.request.GET.get('step', 1))
@@ -416,7 +489,7 @@ class GenerateDocumentWizardView(TemplateView):
     
     def post(self, request, *args, **kwargs):
         template = self.get_template_object()
-        wizard_steps = DocumentGenerator.get_wizard_steps(template.content)
+        wizard_steps = DocumentGenerator.get_wizard_steps(template.get_compiled())
         
         current_step = int(request.POST.get('current_step', 1))
         action = request.POST.get('action', 'next')
@@ -467,7 +540,7 @@ class GenerateDocumentWizardView(TemplateView):
         
         # Generate the document
         final_output, validations = DocumentGenerator.generate_document(
-            template.content,
+            template.get_compiled(),
             section_content,
             variable_data
         )
@@ -513,6 +586,13 @@ def validate_section_realtime(request, template_id):
     """
     API endpoint for real-time section validation.
     Returns validation results as JSON for immediate feedback.
+
+    Accepts either the full section text (``content``) or an edit against the
+    last validated text (``delta`` with ``start``/``end``/``text`` offsets and
+    the ``revision`` returned by the previous call). The last validated text
+    and its per-line statistics are kept by SectionStatsStore, so a delta
+    only re-tokenizes the lines it touches. A stale or unknown revision
+    returns 409 and the client should resend the full content.
     """
     if request.method != 'POST':
         return JsonResponse({'error': 'POST method required'}, status=405)
@@ -520,17 +600,50 @@ def validate_section_realtime(request, template_id):
     try:
         data = json.loads(request.body)
         section_name = data.get('section_name', '')
-        content = data.get('content', '')
 
         # Get template for metadata
         template = get_object_or_404(Template, id=template_id, is_active=True)
+        compiled = template.get_compiled()
+        keywords = DocumentGenerator.section_keywords(
+            section_name, compiled.section_metadata.get(section_name)
+        )
+
+        delta = data.get('delta')
+        if delta is not None:
+            stats = SectionStatsStore.load(request.session, template_id, section_name, keywords)
+            if stats is None or stats.revision != data.get('revision'):
+                return JsonResponse(
+                    {'error': 'Validation session is out of date', 'resync': True},
+                    status=409,
+                )
+            try:
+                stats.apply_delta(
+                    int(delta.get('start', 0)), int(delta.get('end', 0)), delta.get('text', '')
+                )
+            except (TypeError, ValueError) as e:
+                return JsonResponse({'error': str(e)}, status=400)
+            if 'length' in data and data['length'] != len(stats.text):
+                # The client and server copies have diverged
+                SectionStatsStore.discard(request.session, template_id, section_name)
+                return JsonResponse(
+                    {'error': 'Validation session is out of date', 'resync': True},
+                    status=409,
+                )
+        else:
+            revision = SectionStatsStore.revision(request.session, template_id, section_name)
+            stats = SectionStats(data.get('content', ''), keywords, revision)
+        stats.revision += 1
 
         # Perform enhanced real-time validation with metadata
         validation = DocumentGenerator.validate_section_with_metadata(
-            section_name, content, template.content
+            section_name, stats.text, compiled, stats=stats
         )
 
-        return JsonResponse(validation.to_dict())
+        SectionStatsStore.save(request.session, template_id, section_name, stats)
+
+        response = validation.to_dict()
+        response['revision'] = stats.revision
+        return JsonResponse(response)
 
     except json.JSONDecodeError:
         return JsonResponse({'error': 'Invalid JSON'}, status=400)
@@ -538,6 +651,64 @@ def validate_section_realtime(request, template_id):
         return JsonResponse({'error': str(e)}, status=500)
 
 
+def validate_document(request, template_id):
+    """
+    API endpoint validating an existing document against a template.
+
+    The document is an uploaded ``document`` file (multipart), the raw
+    request body, or a stored prompt named by the ``prompt`` query parameter.
+    It is read in chunks and validated with bounded memory, so large
+    documents never need to fit in memory. Returns the BMAD summary and the
+    template metadata validation as JSON.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST method required'}, status=405)
+
+    template = get_object_or_404(Template, id=template_id, is_active=True)
+    encoding = 'utf-8'
+
+    if 'prompt' in request.GET:
+        try:
+            prompt_id = int(request.GET['prompt'])
+        except ValueError:
+            return JsonResponse({'error': 'prompt must be an integer'}, status=400)
+        # Archived prompts stream from the archive table
+        prompt = get_prompt_or_archived(prompt_id)
+        source = type(prompt).iter_final_output(prompt.pk)
+    elif request.content_type == 'multipart/form-data':
+        upload = request.FILES.get('document')
+        if upload is None:
+            return JsonResponse({'error': 'document file is required'}, status=400)
+        source = upload.chunks()
+        encoding = upload.charset or encoding
+    else:
+        # Read the body as a stream; request.body would load it whole
+        source = request
+        encoding = request.encoding or encoding
+
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        return JsonResponse({'error': f'Unknown encoding: {encoding}'}, status=400)
+
+    try:
+        compiled = template.get_compiled()
+        analysis = MetadataAwareValidator.analyze_stream(source, compiled, encoding=encoding)
+        report = BMADValidator.validate_analysis(analysis)
+        result = MetadataAwareValidator.validate_analysis(analysis, compiled)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+    return JsonResponse({
+        'template_id': template.id,
+        'characters': analysis.length,
+        'word_count': analysis.word_count(),
+        'bmad': report.get_summary(),
+        'validation_notes': report.get_validation_notes(),
+        'metadata': asdict(result),
+    })
+
+
 def get_section_guidance(request, template_id, section_name):
     """
     API endpoint for getting contextual guidance for a section.
@@ -550,7 +721,7 @@ def get_section_guidance(request, template_id, section_name):
         template = get_object_or_404(Template, id=template_id, is_active=True)
 
         # Get guidance for the section
-        guidance = DocumentGenerator.get_section_help(section_name, template.content)
+        guidance = DocumentGenerator.get_section_help(section_name, template.get_compiled())
 
         return JsonResponse(guidance)
 
@@ -578,7 +749,7 @@ def validate_variable(request, template_id):
 
         # Validate the variable
         result = MetadataAwareValidator.validate_variable(
-            variable_name, value, template.content
+            variable_name, value, template.get_compiled()
         )
 
         return JsonResponse(result)
@@ -605,11 +776,12 @@ def get_completion_status(request, template_id):
         template = get_object_or_404(Template, id=template_id, is_active=True)
 
         # Get wizard steps
-        wizard_steps = DocumentGenerator.get_enhanced_wizard_steps(template.content)
+        compiled = template.get_compiled()
+        wizard_steps = DocumentGenerator.get_enhanced_wizard_steps(compiled)
 
         # Calculate completion status
         status = DocumentGenerator.calculate_completion_status(
-            wizard_steps, section_data, variable_data, template.content
+            wizard_steps, section_data, variable_data, compiled
         )
 
         return JsonResponse(status)
@@ -632,7 +804,7 @@ def get_enhanced_wizard_steps(request, template_id):
         template = get_object_or_404(Template, id=template_id, is_active=True)
 
         # Get enhanced wizard steps
-        steps = DocumentGenerator.get_enhanced_wizard_steps(template.content)
+        steps = DocumentGenerator.get_enhanced_wizard_steps(template.get_compiled())
 
         return JsonResponse({'steps': steps, 'total_steps': len(steps)})
 
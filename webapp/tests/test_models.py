@@ -4,7 +4,7 @@ Tests for BMAD Forge models.
 
 import pytest
 from django.utils import timezone
-from forge.models import Template, GeneratedPrompt
+from forge.models import Template, TemplateHealth, GeneratedPrompt
 
 
 @pytest.mark.django_db
@@ -107,6 +107,71 @@ class TestTemplateModel:
         expected = 'Test Template (scrum_master - planning)'
         assert str(template) == expected
     
+    def test_get_compiled(self):
+        """Test the compiled template is shared across instances with the same content."""
+        template = Template.objects.create(
+            title='Compiled Test',
+            content='## Your Role\nYou are a {{role}}.',
+            agent_role='developer',
+            workflow_phase='development',
+        )
+
+        compiled = template.get_compiled()
+
+        assert compiled.content == template.content
+        assert 'Your Role' in compiled.section_metadata
+        assert Template.objects.get(pk=template.pk).get_compiled() is compiled
+
+    def test_save_stores_parse_artifact(self):
+        """Test saving persists the parsed structure with a parser version stamp."""
+        from forge.services.template_parser import TemplateParser
+
+        template = Template.objects.create(
+            title='Artifact Test',
+            content='## Your Role\nYou are a {{role}}.\n\n## Input\nSome input.',
+            agent_role='developer',
+            workflow_phase='development',
+        )
+        template.refresh_from_db()
+
+        assert template.parser_version == TemplateParser.PARSER_VERSION
+        assert [h[1] for h in template.parsed_structure['headings']] == ['Your Role', 'Input']
+        assert template.parsed_structure['headings'][1][4] == 2
+
+    def test_save_stores_catalogue_summary(self, django_assert_num_queries):
+        """Test saving stores the excerpt and counts the catalogue projection loads."""
+        template = Template.objects.create(
+            title='Catalogue Test',
+            content='---\nversion: 1\n---\n# Title\n\n## Your Role\nYou are a {{role}} for {{team}}.\n',
+            agent_role='developer',
+            workflow_phase='development',
+        )
+
+        with django_assert_num_queries(1):
+            listed = Template.objects.catalogue().get(pk=template.pk)
+            assert listed.excerpt == 'You are a {{role}} for {{team}}.'
+            assert listed.word_count == 11
+            assert listed.variable_count == 2
+        assert listed.get_deferred_fields() >= {'content', 'variables', 'parsed_structure'}
+
+    def test_get_compiled_rebuilds_stale_artifact(self):
+        """Test a stale parse artifact is rebuilt and written back lazily."""
+        from forge.services.template_parser import TemplateParser
+
+        template = Template.objects.create(
+            title='Stale Artifact',
+            content='## Input\n{{task}}',
+            agent_role='developer',
+            workflow_phase='development',
+        )
+        Template.objects.filter(pk=template.pk).update(parsed_structure={}, parser_version=0)
+
+        compiled = Template.objects.get(pk=template.pk).get_compiled()
+
+        template.refresh_from_db()
+        assert template.parser_version == TemplateParser.PARSER_VERSION
+        assert template.parsed_structure == compiled.to_dict()
+
     def test_ordering(self):
         """Test default ordering."""
         Template.objects.create(
@@ -222,7 +287,27 @@ class TestTemplateManagerFiltering:
         
         assert filtered.count() == 1
         assert filtered.first().title == 'Multi-Role Template'
-    
+
+    def test_filter_by_role_follows_role_changes_in_one_query(self, django_assert_num_queries):
+        """Test role rows track saves and the filter is a single join."""
+        template = Template.objects.create(
+            title='Multi-Role Template',
+            content='test',
+            agent_role='developer',
+            agent_roles=['developer', 'architect', 'architect'],
+            workflow_phase='development',
+        )
+        template.agent_role = 'qa'
+        template.agent_roles = ['qa', 'developer']
+        template.save()
+
+        assert sorted(template.role_links.values_list('role', flat=True)) == ['developer', 'qa']
+        queryset = Template.objects.filter(is_active=True)
+        with django_assert_num_queries(1):
+            assert list(Template.objects.filter_by_role(queryset, 'architect')) == []
+        with django_assert_num_queries(1):
+            assert list(Template.objects.filter_by_role(queryset, 'qa')) == [template]
+
     def test_combined_role_and_workflow_filtering(self):
         """Test combining filter_by_role and filter_by_workflow."""
         Template.objects.create(
@@ -252,6 +337,46 @@ class TestTemplateManagerFiltering:
         assert queryset.first().title == 'Dev Planning'
 
 
+@pytest.mark.django_db
+class TestTemplateHealth:
+    """Tests for TemplateHealth records written by the corpus lint."""
+
+    def test_lint_corpus_only_relints_changed_templates(self, monkeypatch):
+        """Test health records are reused until the content or linter changes."""
+        from forge.services import TemplateLinter
+        valid = '## Your Role\nDev\n## Input\n{{task}}\n## Output Requirements\nCode'
+        first = Template.objects.create(
+            title='First', content=valid, agent_role='developer', workflow_phase='development'
+        )
+        Template.objects.create(
+            title='Copy', content=valid, agent_role='developer', workflow_phase='development'
+        )
+        broken = Template.objects.create(
+            title='Broken', content='No sections', agent_role='analyst', workflow_phase='planning'
+        )
+        linted = []
+        lint = TemplateLinter.lint
+        monkeypatch.setattr(TemplateLinter, 'lint', lambda content: linted.append(content) or lint(content))
+
+        stats = TemplateLinter.lint_corpus(workers=1)
+
+        assert stats == {'checked': 3, 'skipped': 0, 'ok': 2, 'warning': 0, 'error': 1}
+        assert len(linted) == 2  # Identical contents are linted once
+        assert first.health.status == 'ok'
+        assert TemplateHealth.objects.get(template=broken).errors[0].startswith('Missing required sections')
+
+        broken.content = valid
+        broken.save()
+        stats = TemplateLinter.lint_corpus(workers=1)
+        assert stats == {'checked': 1, 'skipped': 2, 'ok': 3, 'warning': 0, 'error': 0}
+        assert TemplateHealth.objects.get(template=broken).status == 'ok'
+
+        TemplateHealth.objects.filter(template=first).update(linter_version=0)
+        assert TemplateLinter.lint_corpus(workers=1)['checked'] == 1
+        assert TemplateLinter.lint_corpus(workers=1, force=True)['checked'] == 3
+        assert TemplateHealth.objects.count() == 3
+
+
 @pytest.mark.django_db
 class TestGeneratedPromptModel:
     """Tests for the GeneratedPrompt model."""
@@ -308,6 +433,45 @@ class TestGeneratedPromptModel:
         assert 'Invalid' in status
         assert '2 issues' in status
     
+    def test_save_stores_validation_report_snapshot(self):
+        """Test creating a prompt persists its full report with a validator version."""
+        from forge.services import BMADValidator
+        
+        template = Template.objects.create(
+            title='Test', content='test', agent_role='developer', workflow_phase='development'
+        )
+        prompt = GeneratedPrompt.objects.create(
+            template=template, input_data={}, final_output='## Input\n{{task}}'
+        )
+        prompt.refresh_from_db()
+        
+        expected = BMADValidator.validate('## Input\n{{task}}')
+        assert prompt.validator_version == BMADValidator.VALIDATOR_VERSION
+        assert prompt.get_validation_report() == expected
+        assert prompt.validation_report['missing_sections'] == ['## Your Role', '## Output Requirements']
+    
+    def test_get_validation_report_rebuilds_stale_snapshot(self):
+        """Test a snapshot from an older validator is rebuilt and written back lazily."""
+        from forge.services import BMADValidator
+        
+        template = Template.objects.create(
+            title='Test', content='test', agent_role='developer', workflow_phase='development'
+        )
+        prompt = GeneratedPrompt.objects.create(
+            template=template, input_data={}, final_output='{{name}}'
+        )
+        GeneratedPrompt.objects.filter(pk=prompt.pk).update(
+            validation_report={'validator_version': 0, 'is_valid': True, 'score': 0},
+            validator_version=0,
+        )
+        
+        report = GeneratedPrompt.objects.get(pk=prompt.pk).get_validation_report()
+        
+        prompt.refresh_from_db()
+        assert report.unreplaced_variables == ['name']
+        assert prompt.validator_version == BMADValidator.VALIDATOR_VERSION
+        assert prompt.validation_report['unreplaced_variables'] == ['name']
+    
     def test_ordering(self):
         """Test that prompts are ordered by creation date descending."""
         template = Template.objects.create(
@@ -324,3 +488,81 @@ class TestGeneratedPromptModel:
         prompts = list(GeneratedPrompt.objects.all())
         assert prompts[0].id == prompt2.id
         assert prompts[1].id == prompt1.id
+    
+    def test_final_output_is_stored_as_shared_chunks(self, django_assert_num_queries):
+        """Test outputs round-trip through the chunk store and share repeated sections."""
+        from forge.models import OutputBlob, OutputChunk
+        from forge.services.output_store import OutputStore
+        
+        template = Template.objects.create(
+            title='Test', content='test', agent_role='developer', workflow_phase='development'
+        )
+        scaffold = '## Output Requirements\n' + 'Use Markdown with clear structure.\n' * 50
+        first = GeneratedPrompt.objects.create(
+            template=template, input_data={}, final_output=f'## Your Role\nAlice\n\n{scaffold}'
+        )
+        second = GeneratedPrompt.objects.create(
+            template=template, input_data={}, final_output=f'## Your Role\nBob\n\n{scaffold}'
+        )
+        
+        loaded = GeneratedPrompt.objects.get(pk=first.pk)
+        with django_assert_num_queries(1):
+            assert loaded.final_output == f'## Your Role\nAlice\n\n{scaffold}'
+        assert ''.join(GeneratedPrompt.iter_final_output(second.pk)) == second.final_output
+        assert OutputChunk.objects.count() == 4
+        assert OutputBlob.objects.count() == 3
+        assert OutputBlob.objects.get(size=len(scaffold)).compressed
+        
+        second.final_output = 'Replaced'
+        second.save()
+        second.refresh_from_db()
+        assert second.final_output == 'Replaced'
+        
+        first.delete()
+        assert OutputStore.delete_unused() == 3
+        assert OutputStore.read(second.pk) == 'Replaced'
+    
+    def test_archived_output_streams_in_pieces(self, monkeypatch):
+        """Test an archived output decompresses piece by piece, splitting no characters."""
+        from forge.models import ArchivedPrompt
+        
+        template = Template.objects.create(
+            title='Test', content='test', agent_role='developer', workflow_phase='development'
+        )
+        text = ''.join(f'## Section {i}\nÜber café — {i * 7919}\n' for i in range(300))
+        archived = ArchivedPrompt(id=42, template=template, input_data={}, created_at=timezone.now())
+        archived.final_output = text
+        archived.save()
+        monkeypatch.setattr(ArchivedPrompt, 'STREAM_PIECE', 7)
+        
+        pieces = list(ArchivedPrompt.iter_final_output(42))
+        assert len(pieces) > 1
+        assert ''.join(pieces) == text
+        assert list(ArchivedPrompt.iter_final_output(43)) == []
+    
+    def test_write_restores_blobs_deleted_before_their_chunks(self, monkeypatch):
+        """Test a concurrent delete_unused() between blob insert and chunk insert is survived."""
+        from forge.models import OutputBlob
+        from forge.services.output_store import OutputStore
+        
+        template = Template.objects.create(
+            title='Test', content='test', agent_role='developer', workflow_phase='development'
+        )
+        prompt = GeneratedPrompt.objects.create(template=template, input_data={})
+        bulk_create = OutputBlob.objects.bulk_create
+        calls = []
+        
+        def racing_bulk_create(*args, **kwargs):
+            result = bulk_create(*args, **kwargs)
+            calls.append(len(args[0]))
+            if len(calls) == 1:
+                # The new blobs have no chunks yet, so they look unused
+                assert OutputStore.delete_unused() == 2
+            return result
+        
+        monkeypatch.setattr(OutputBlob.objects, 'bulk_create', racing_bulk_create)
+        OutputStore.write(prompt.pk, '## Your Role\nAlice\n\n## Input\nTask\n')
+        
+        assert calls == [2, 2]
+        assert OutputStore.read(prompt.pk) == '## Your Role\nAlice\n\n## Input\nTask\n'
+        assert OutputStore.delete_unused() == 0
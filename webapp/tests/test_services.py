@@ -3,7 +3,8 @@ Tests for BMAD Forge services.
 """
 
 import pytest
-from forge.services import TemplateParser, BMADValidator, GitHubSyncService
+from forge.services import TemplateParser, BMADValidator, GitHubSyncService, TemplateLinter, TypeaheadIndex
+from forge.services.typeahead import TypeaheadEntry
 
 
 class TestTemplateParser:
@@ -36,7 +37,41 @@ class TestTemplateParser:
         assert len(variables) == 2
         assert 'name' in variables
         assert 'email' in variables
-    
+
+    def test_scan_variables_reports_syntax_default_and_span(self):
+        """Test the combined scanner emits every occurrence in document order."""
+        content = "[who] met {{name:John}} and {{name}}"
+        occurrences = list(TemplateParser.scan_variables(content))
+
+        assert [(v.name, v.syntax, v.default_value) for v in occurrences] == [
+            ('who', 'single_bracket', None),
+            ('name', 'double_brace', 'John'),
+            ('name', 'double_brace', None),
+        ]
+        assert content[occurrences[1].start_pos:occurrences[1].end_pos] == '{{name:John}}'
+
+    def test_extract_variables_dedupes_by_name(self):
+        """Test repeated variables are reported once, at first occurrence."""
+        content = "{{a}} {{b}} {{a}} [b] {{c:default}}"
+        variables = TemplateParser.extract_variables(content)
+
+        assert [v.name for v in variables] == ['a', 'b', 'c']
+        assert variables[2].default_value == 'default'
+
+    def test_unclosed_default_does_not_span_lines(self):
+        """Test a default value never runs across a line break."""
+        content = "{{name:unfinished\nmore text}}"
+
+        assert TemplateParser.extract_variables_simple(content) == []
+
+    def test_excerpt_skips_markup_and_cuts_at_word_boundary(self):
+        """Test excerpts leave out frontmatter and headings and end at a whole word."""
+        content = '---\nkey: value\n---\n# Title\n\n## Your Role\nYou   are an\nexperienced architect.\n'
+
+        assert TemplateParser.excerpt(content) == 'You are an experienced architect.'
+        assert TemplateParser.excerpt(content, max_length=16) == 'You are an…'
+        assert TemplateParser.excerpt('x' * 50, max_length=10) == 'xxxxxxxxx…'
+
     def test_detect_sections(self):
         """Test section detection."""
         content = """
@@ -94,6 +129,24 @@ Developer
         
         assert result == "Hello Alice, you work at ACME."
     
+    def test_render_applies_defaults_and_reports_unreplaced(self):
+        """Test single-pass rendering with inline defaults."""
+        content = "Hi {{name}} from [team:Platform], re {{topic}} and {{name}}."
+        
+        result = TemplateParser.render(content, {'name': 'Alice'})
+        
+        assert result.output == "Hi Alice from Platform, re {{topic}} and Alice."
+        assert result.unreplaced == ['topic']
+    
+    def test_render_accepts_compiled_template(self):
+        """Test rendering reuses the compiled variable spans."""
+        compiled = TemplateParser.compile("[a] {{b:x}} {{c}}")
+        
+        result = TemplateParser.render(compiled, {'a': 1, 'c': 'z'}, apply_defaults=False)
+        
+        assert result.output == "1 {{b:x}} z"
+        assert result.unreplaced == []
+    
     def test_find_unreplaced_variables(self):
         """Test finding unreplaced variables."""
         content = "Hello {{name}}, {{greeting}}!"
@@ -210,10 +263,26 @@ Format
         """Test quick validation for invalid prompt."""
         prompt = "Just some text"
         is_valid, issues = BMADValidator.quick_validate(prompt)
-        
+
         assert is_valid is False
         assert len(issues) > 0
 
+    def test_validate_many_matches_validate(self):
+        """Test batch validation returns the serial results in input order."""
+        prompts = [
+            "## Your Role\nDeveloper\n\n## Input\nTask\n\n## Output Requirements\nFormat",
+            "Just some text",
+            "## Your Role\n{{role}}\n\n## Input\nTask\n\n## Output Requirements\nFormat",
+        ]
+        expected = [BMADValidator.validate(p).get_summary() for p in prompts]
+
+        serial = BMADValidator.validate_many(prompts, workers=1)
+        assert [r.get_summary() for r in serial] == expected
+
+        with BMADValidator.create_pool(2) as pool:
+            parallel = BMADValidator.validate_many(prompts, executor=pool, chunksize=1)
+        assert [r.get_summary() for r in parallel] == expected
+
 
 class TestGitHubSyncService:
     """Tests for the GitHubSyncService."""
@@ -226,6 +295,34 @@ class TestGitHubSyncService:
         assert service.detect_agent_role('content', 'analyst_report.md') == 'analyst'
         assert service.detect_agent_role('content', 'pm_planning.md') == 'pm'
     
+    @pytest.mark.django_db
+    def test_sync_flags_unsafe_validation_patterns(self, monkeypatch):
+        """Test synced templates with risky validation patterns are reported."""
+        service = GitHubSyncService()
+        content = '---\nvariables:\n  SLUG:\n    validation: "^(a|aa)+$"\n---\n## Your Role\nText.\n'
+        monkeypatch.setattr(
+            service, 'fetch_directory_contents_recursive',
+            lambda *args: [{'name': 'slug_prompt.md', 'path': 'templates/slug_prompt.md'}],
+        )
+        monkeypatch.setattr(service, 'fetch_file_content', lambda *args: content)
+
+        lint_workers = []
+        lint_corpus = TemplateLinter.lint_corpus.__func__
+
+        def recording_lint_corpus(cls, **kwargs):
+            lint_workers.append(kwargs.get('workers'))
+            return lint_corpus(cls, **kwargs)
+
+        monkeypatch.setattr(TemplateLinter, 'lint_corpus', classmethod(recording_lint_corpus))
+
+        results = service.sync_templates('owner', 'repo', 'main', 'templates')
+
+        # Web-triggered syncs lint in process rather than starting a pool
+        assert lint_workers == [1]
+        assert results['success'] is True
+        assert len(results['warnings']) == 1
+        assert results['warnings'][0].startswith("slug_prompt.md: Validation pattern of variable 'SLUG'")
+
     def test_detect_workflow_phase_from_filename(self):
         """Test workflow phase detection from filename."""
         service = GitHubSyncService()
@@ -484,6 +581,29 @@ Format specifications.
         assert steps[1]['section_name'] == 'Input'
         assert steps[2]['section_name'] == 'Output Requirements'
     
+    def test_generate_document_appends_sections_and_reports_unreplaced(self):
+        """Test generating a document from variables and section data."""
+        from forge.services import DocumentGenerator
+        
+        content = """## Your Role
+You are a {{role}}.
+
+## Input
+Process {{input_file}}.
+"""
+        document, validations = DocumentGenerator.generate_document(
+            content,
+            {'Your Role': 'Focus on the {{domain}} area of the system.'},
+            {'role': 'Developer'},
+        )
+        
+        assert document.startswith(
+            "## Your Role\nYou are a Developer.\n\n"
+            "Focus on the {{domain}} area of the system.\n\n## Input"
+        )
+        assert validations[-1].section_name == 'Document'
+        assert validations[-1].unreplaced_variables == ['domain', 'input_file']
+    
     def test_validate_document_compliance_valid(self):
         """Test document compliance validation with valid content."""
         from forge.services import DocumentGenerator
@@ -655,10 +775,40 @@ Content here.
         assert section.min_words == 25
         assert section.max_words == 100
         assert section.help_text == 'Test help'
-        assert section.keywords_required == ['test', 'keyword']
+        assert section.keywords_required == ('test', 'keyword')
         assert section.validation_severity == ValidationSeverity.WARNING
         assert len(section.examples) == 2
 
+    def test_section_metadata_is_immutable(self):
+        """Test SectionMetadata is frozen and stores collections as tuples."""
+        import dataclasses
+        from forge.services.template_parser import SectionMetadata
+
+        section = SectionMetadata(name='Notes', keywords_recommended=['todo'])
+
+        assert section.keywords_recommended == ('todo',)
+        assert not hasattr(section, '__dict__')
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            section.min_words = 1
+
+    def test_default_section_registry_is_shared(self):
+        """Test defaults come from the shared registry instead of being rebuilt."""
+        from forge.services.template_parser import (
+            DEFAULT_SECTION_METADATA, TemplateParser, ValidationSeverity, default_section_metadata,
+        )
+
+        role = TemplateParser.resolve_section_metadata('Your Role')
+        assert role is DEFAULT_SECTION_METADATA['Your Role']
+        assert role.validation_severity == ValidationSeverity.CRITICAL
+        assert TemplateParser.get_section_metadata_with_defaults(
+            '## Your Role\nText\n'
+        )['Your Role'] is role
+
+        custom = default_section_metadata('Appendix')
+        assert custom is default_section_metadata('Appendix')
+        assert custom.required is False
+        assert TemplateParser.get_section_guidance('Input')['min_words'] == 15
+
 
 class TestVariableMetadata:
     """Tests for VariableMetadata parsing and validation."""
@@ -750,6 +900,113 @@ Content here.
         is_valid, errors = TemplateParser.validate_variable_value('FRAMEWORK', 'Svelte', metadata)
         assert is_valid is False
 
+    def test_validation_patterns_are_compiled_and_linted_once(self):
+        """Test patterns compile when metadata is parsed and risky ones are flagged."""
+        from forge.services.safe_pattern import SafePattern
+        from forge.services.template_parser import VariableMetadata
+
+        metadata = VariableMetadata(name='CODE', validation_pattern=r'^[A-Z]{3}-\d+$')
+        assert metadata.pattern is SafePattern.compile(r'^[A-Z]{3}-\d+$')
+        assert not metadata.pattern.is_risky
+        assert VariableMetadata(name='NONE').pattern is None
+
+        assert SafePattern.compile(r'^(a+)+$').issues == ('nested quantifiers',)
+        assert SafePattern.compile(r'^(a|ab)*$').issues == ('alternation inside a quantifier',)
+        assert SafePattern.compile(r'(\w+)-\1').issues == ('backreference',)
+        assert SafePattern.compile(r'^(?:\d{3}-)*\d+$').issues == ()
+        # Bounded repeats of a variable-width body backtrack just the same
+        assert SafePattern.compile(r'^(\w+\s?){1,50}$').issues == ('nested quantifiers',)
+        assert SafePattern.compile(r'(a+){2,40}$').issues == ('nested quantifiers',)
+        assert SafePattern.compile(r'^(ab){1,50}$').issues == ()
+        assert SafePattern.compile(r'^[A-Z]{2,5}$').issues == ()
+        # Adjacent repeats only count when they can take the same characters
+        assert SafePattern.compile(r'.*.*.*.*x').issues == ('adjacent quantifiers',)
+        assert SafePattern.compile(r'^\w+\d+$').issues == ('adjacent quantifiers',)
+        assert SafePattern.compile(r'^\d+\s+\d+$').issues == ()
+        assert SafePattern.compile('[unclosed').error
+
+    def test_risky_pattern_times_out_with_a_clear_verdict(self, settings):
+        """Test catastrophic backtracking is cut off instead of pinning the worker."""
+        from forge.services.safe_pattern import PatternVerdict
+        from forge.services.template_parser import TemplateParser, VariableMetadata
+
+        settings.VALIDATION_PATTERN_TIMEOUT = 0.2
+        metadata = VariableMetadata(name='SLUG', validation_pattern=r'^(a+)+$')
+
+        assert metadata.pattern.match('aaaa') == PatternVerdict.MATCH
+        is_valid, errors = TemplateParser.validate_variable_value('SLUG', 'a' * 40 + '!', metadata)
+        assert is_valid is False
+        assert errors == ["Variable 'SLUG' could not be checked against its required format in time."]
+        # A fresh worker serves the next check
+        assert metadata.pattern.match('aab') == PatternVerdict.NO_MATCH
+
+    def test_long_values_never_match_in_process(self, monkeypatch):
+        """Test a lint-clean pattern still runs under the budget for long values."""
+        from forge.services import safe_pattern
+        from forge.services.safe_pattern import PatternVerdict, SafePattern
+
+        calls = []
+        monkeypatch.setattr(
+            safe_pattern._PatternWorker, 'match',
+            lambda source, value, timeout: calls.append(len(value)) or PatternVerdict.MATCH,
+        )
+        pattern = SafePattern.compile(r'^[^@]+@[^@]+\.\w+$')
+        assert not pattern.is_risky
+
+        assert pattern.match('dev@example.com') == PatternVerdict.MATCH
+        assert calls == []
+        long_value = 'a.' * SafePattern.MAX_IN_PROCESS_LENGTH + '@b'
+        assert pattern.match(long_value) == PatternVerdict.MATCH
+        assert calls == [len(long_value)]
+
+    def test_timeout_leaves_concurrent_matches_alone(self, settings):
+        """Test killing a stuck worker does not fail other requests' matches."""
+        from concurrent.futures import ThreadPoolExecutor
+        from forge.services.safe_pattern import PatternVerdict, SafePattern
+
+        slow = SafePattern.compile(r'^(a+)+$')
+        quick = SafePattern.compile(r'^(a|bc)+$')
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            stuck = executor.submit(slow.match, 'a' * 40 + '!', 0.5)
+            others = [executor.submit(quick.match, 'abc' * 30, 5) for _ in range(12)]
+            assert stuck.result() == PatternVerdict.TIMEOUT
+            assert [f.result() for f in others] == [PatternVerdict.MATCH] * 12
+
+    def test_invalid_pattern_skips_the_format_check(self):
+        """Test a pattern that does not compile is ignored, as before."""
+        from forge.services.template_parser import TemplateParser, VariableMetadata
+
+        metadata = VariableMetadata(name='X', validation_pattern='(unclosed')
+        assert TemplateParser.validate_variable_value('X', 'anything', metadata) == (True, [])
+
+    def test_lint_patterns_reports_unsafe_template_patterns(self):
+        """Test sync-time linting covers variables and structured fields."""
+        from forge.services.template_parser import TemplateParser
+
+        content = '''---
+variables:
+  SAFE:
+    validation: "^[a-z]+$"
+  SLOW:
+    validation: "^([a-z]+)*$"
+  WORDS:
+    validation: '^(\\w+\\s?){1,50}$'
+sections:
+  Your Role:
+    structured_fields:
+      - name: code
+        validation: "(bad"
+---
+## Your Role
+Text.
+'''
+        messages = TemplateParser.lint_patterns(content)
+        assert len(messages) == 3
+        assert "variable 'SLOW'" in messages[0] and 'nested quantifiers' in messages[0]
+        assert "variable 'WORDS'" in messages[1] and 'nested quantifiers' in messages[1]
+        assert "field 'code'" in messages[2] and 'does not compile' in messages[2]
+
 
 class TestSectionValidation:
     """Tests for section validation against metadata."""
@@ -1125,3 +1382,773 @@ Just content.
 
         assert frontmatter == {}
         assert '## Your Role' in remaining
+
+
+class TestCompiledTemplate:
+    """Tests for compiled template caching."""
+
+    TEMPLATE = '''---
+name: compiled-template
+sections:
+  "Your Role":
+    required: true
+    min_words: 12
+variables:
+  PROJECT_NAME:
+    description: "Project name"
+---
+## Your Role
+Work on {{PROJECT_NAME}}.
+
+## Input
+Input content.
+'''
+
+    def test_compile_extracts_structure(self):
+        """Test compiling exposes frontmatter, metadata, headings and variables."""
+        from forge.services.template_parser import TemplateParser
+
+        compiled = TemplateParser.compile(self.TEMPLATE)
+
+        assert compiled.frontmatter['name'] == 'compiled-template'
+        assert compiled.section_metadata['Your Role'].min_words == 12
+        assert 'Input' in compiled.section_metadata
+        assert 'PROJECT_NAME' in compiled.variable_metadata
+        assert [h.name for h in compiled.headings] == ['Your Role', 'Input']
+        assert [v.name for v in compiled.variables] == ['PROJECT_NAME']
+
+    def test_compile_is_memoized_by_content(self):
+        """Test identical content returns the cached compiled template."""
+        from forge.services.template_parser import TemplateParser
+
+        first = TemplateParser.compile(self.TEMPLATE)
+        second = TemplateParser.compile(str(self.TEMPLATE))
+
+        assert first is second
+        assert TemplateParser.compile(first) is first
+
+    def test_compiled_template_is_immutable(self):
+        """Test compiled templates cannot be modified."""
+        import dataclasses
+        from forge.services.template_parser import TemplateParser
+
+        compiled = TemplateParser.compile(self.TEMPLATE)
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            compiled.content = ''
+        with pytest.raises(TypeError):
+            compiled.section_metadata['Other'] = None
+
+    def test_compile_skips_yaml_on_cache_hit(self, monkeypatch):
+        """Test services reuse the compiled template instead of re-parsing YAML."""
+        from forge.services import DocumentGenerator
+        from forge.services.template_parser import TemplateParser
+
+        TemplateParser.compile(self.TEMPLATE)
+
+        def fail(*args, **kwargs):
+            raise AssertionError('frontmatter should not be parsed again')
+
+        monkeypatch.setattr(TemplateParser, 'parse_frontmatter', fail)
+
+        DocumentGenerator.get_enhanced_wizard_steps(self.TEMPLATE)
+        DocumentGenerator.get_section_help('Your Role', self.TEMPLATE)
+        TemplateParser.get_section_metadata_with_defaults(self.TEMPLATE)
+
+    def test_artifact_round_trip_skips_parsing(self, monkeypatch):
+        """Test a persisted artifact rebuilds the compiled template without parsing."""
+        import json
+        from forge.services.template_parser import TemplateParser
+
+        artifact = json.loads(json.dumps(TemplateParser.compile(self.TEMPLATE).to_dict()))
+        expected = TemplateParser._compile(self.TEMPLATE, artifact['content_hash'])
+        TemplateParser.clear_compile_cache()
+
+        def fail(*args, **kwargs):
+            raise AssertionError('artifact should be loaded without parsing')
+
+        monkeypatch.setattr(TemplateParser, '_compile', fail)
+
+        assert TemplateParser.compile(self.TEMPLATE, artifact=artifact) == expected
+
+    def test_stale_artifact_is_ignored(self):
+        """Test artifacts from another parser version or content are not trusted."""
+        from forge.services.template_parser import TemplateParser
+
+        compiled = TemplateParser.compile(self.TEMPLATE)
+        artifact = dict(compiled.to_dict(), parser_version=TemplateParser.PARSER_VERSION - 1)
+
+        assert not TemplateParser.is_artifact_current(artifact, compiled.content_hash)
+        assert not TemplateParser.is_artifact_current(compiled.to_dict(), 'other-hash')
+        assert TemplateParser.is_artifact_current(compiled.to_dict(), compiled.content_hash)
+
+
+class TestHeadingIndex:
+    """Tests for the shared heading and line-offset index."""
+
+    CONTENT = '''# Title
+Intro line.
+
+## Your Role
+You are a developer.
+
+### Responsibilities
+Write code.
+
+## Input Data
+Some input.
+'''
+
+    def test_find_exact_prefix_and_level(self):
+        """Test heading lookup by normalized name, prefix and minimum level."""
+        from forge.services.heading_index import HeadingIndex
+
+        index = HeadingIndex(self.CONTENT)
+
+        assert index.find('## your   ROLE') == 1
+        assert index.find('## Input') is None
+        assert index.find('## Input', prefix=True) == 3
+        assert index.find('## Title') is None
+        assert index.find('Title') == 0
+
+    def test_section_content_with_and_without_subsections(self):
+        """Test section bodies stop at the next heading or the next sibling."""
+        from forge.services.heading_index import HeadingIndex
+
+        index = HeadingIndex(self.CONTENT)
+
+        assert index.section_content('## Your Role') == 'You are a developer.'
+        assert index.section_content('## Your Role', include_subsections=True) == (
+            'You are a developer.\n\n### Responsibilities\nWrite code.'
+        )
+
+    def test_line_and_heading_offsets(self):
+        """Test offset lookups for lines and containing sections."""
+        from forge.services.heading_index import HeadingIndex
+
+        index = HeadingIndex(self.CONTENT)
+        pos = self.CONTENT.index('Write code.')
+
+        assert index.line_of(0) == 1
+        assert index.line_of(pos) == 8
+        assert index.line_start(8) == pos
+        assert index.headings[index.heading_at(pos)].name == 'Responsibilities'
+        assert index.heading_at(0) == 0
+
+    def test_validator_reads_role_section_with_subsections(self):
+        """Test the validator counts nested subsections as section content."""
+        content = '''## Your Role
+### Focus
+Backend services and APIs.
+
+## Input
+Input details here.
+
+## Output Requirements
+Return a structured report.
+'''
+        report = BMADValidator.validate(content)
+
+        assert report.missing_sections == []
+        assert not any('Your Role' in r.message for r in report.results)
+
+
+class TestSectionStats:
+    """Tests for incrementally maintained section statistics."""
+
+    def test_deltas_match_full_recount(self):
+        """Test applying edits yields the same stats as tokenizing from scratch."""
+        from forge.services.section_stats import SectionStats
+
+        keywords = ['format', 'you will']
+        stats = SectionStats('You will write {{A}}.\nSecond line\nThird', keywords)
+        edits = [
+            (0, 0, 'Intro. '),
+            (10, 25, 'x\ny {{B}} format\n'),
+            (5, 5, '\n\n'),
+            (0, 12, ''),
+        ]
+        for start, end, text in edits:
+            stats.apply_delta(start, end, text)
+            fresh = SectionStats(stats.text, keywords)
+
+            assert stats.word_count == fresh.word_count
+            assert stats.unreplaced_variables == fresh.unreplaced_variables
+            assert +stats.keyword_counts == +fresh.keyword_counts
+            assert stats._lines == fresh._lines
+
+    def test_round_trip_and_rejects_bad_range(self):
+        """Test serialization and range validation."""
+        from forge.services.section_stats import SectionStats
+
+        stats = SectionStats('Return a format\n[X]', ['format'], revision=3)
+        restored = SectionStats.from_dict(stats.to_dict(), ['format'])
+
+        assert restored.revision == 3
+        assert restored.has_keyword('FORMAT')
+        assert restored.unreplaced_variables == ['X']
+        assert restored.word_count == stats.word_count
+        with pytest.raises(ValueError):
+            restored.apply_delta(5, 100, 'x')
+
+    def test_restore_uses_stored_totals(self, monkeypatch):
+        """Test restoring does not replay every line into the totals."""
+        from forge.services.section_stats import SectionStats
+
+        data = SectionStats('one format\ntwo {{B}}\nthree', ['format']).to_dict()
+        monkeypatch.setattr(SectionStats, '_add', lambda *args: pytest.fail('totals recomputed'))
+        restored = SectionStats.from_dict(data, ['format'])
+
+        assert restored.word_count == 5
+        assert restored.unreplaced_variables == ['B']
+        assert restored.keyword_counts['format'] == 1
+
+    def test_store_keeps_stats_in_process_and_evicts_oldest(self, monkeypatch):
+        """Test the session index stays small and bounded, with the dummy cache configured."""
+        from forge.services.section_stats import SectionStats, SectionStatsStore
+
+        monkeypatch.setattr(SectionStatsStore, 'MAX_SECTIONS', 2)
+        session = {}
+        for name in ('A', 'B', 'C'):
+            SectionStatsStore.save(session, 1, name, SectionStats(f'text {name}', [], revision=4))
+
+        index = session[SectionStatsStore.SESSION_KEY]
+        assert list(index) == ['1:B', '1:C']
+        assert 'text' not in str(index)
+        assert SectionStatsStore.load(session, 1, 'A', []) is None
+        stats = SectionStatsStore.load(session, 1, 'C', [])
+        assert stats.text == 'text C'
+        assert SectionStatsStore.revision(session, 1, 'C') == 4
+        # Checked out until saved again, and stored without copying
+        assert SectionStatsStore.load(session, 1, 'C', []) is None
+        SectionStatsStore.save(session, 1, 'C', stats)
+        assert SectionStatsStore.load(session, 1, 'C', []) is stats
+
+        SectionStatsStore.save(session, 1, 'C', stats)
+        SectionStatsStore.discard(session, 1, 'C')
+        assert SectionStatsStore.load(session, 1, 'C', []) is None
+
+
+class TestKeywordMatcher:
+    """Tests for the keyword matcher."""
+
+    def test_finds_overlapping_keywords(self):
+        """Test every keyword is reported, including overlapping ones."""
+        from forge.services.keyword_matcher import KeywordMatcher
+
+        matcher = KeywordMatcher(['he', 'she', 'hers', 'his', 'You Will'])
+        text = 'Ushers: you will see HIS list'
+
+        assert matcher.find_all(text) == {'he', 'she', 'hers', 'his', 'you will'}
+        assert matcher.find_all('ushers') == {'she', 'he', 'hers'}
+        assert matcher.contains_any('USHERS')
+        assert not matcher.contains_any('no match')
+
+    def test_whole_word_mode(self):
+        """Test word-boundary mode ignores hits inside longer words."""
+        from forge.services.keyword_matcher import KeywordMatcher
+
+        matcher = KeywordMatcher(['dev', 'test'], whole_words=True)
+
+        assert matcher.find_all('device testing') == frozenset()
+        assert matcher.find_all('dev-test_plan (dev)') == {'dev'}
+        assert matcher.contains_any('Dev-only') and not matcher.contains_any('device testing')
+        assert not KeywordMatcher([]).contains_any('anything')
+
+    def test_automaton_matches_substring_search(self, monkeypatch):
+        """Test large keyword sets find the same keywords in one automaton pass."""
+        from forge.services.keyword_matcher import KeywordMatcher
+
+        keywords = ['he', 'she', 'hers', 'his', 'You Will', 'dev', 'test', 'hersheys']
+        texts = [
+            'Ushers: you will see HIS list', 'device testing', 'dev-test_plan (dev)',
+            'ahishers', 'no match', '',
+        ]
+        expected = {
+            whole_words: [KeywordMatcher(keywords, whole_words).find_all(t) for t in texts]
+            for whole_words in (False, True)
+        }
+
+        monkeypatch.setattr(KeywordMatcher, 'AUTOMATON_MIN_KEYWORDS', 1)
+        for whole_words in (False, True):
+            matcher = KeywordMatcher(keywords, whole_words)
+            assert matcher.uses_automaton
+            assert [matcher.find_all(t) for t in texts] == expected[whole_words]
+            assert [matcher.contains_any(t) for t in texts] == [bool(f) for f in expected[whole_words]]
+
+    def test_shared_matcher_per_keyword_set(self):
+        """Test matchers are built once per keyword set."""
+        from forge.services.keyword_matcher import KeywordMatcher
+
+        assert KeywordMatcher.get(('a', 'b')) is KeywordMatcher.get(['a', 'b'])
+        assert KeywordMatcher.get(('a', 'b')) is not KeywordMatcher.get(('a', 'b'), whole_words=True)
+
+    def test_contains_any_finds_hits_across_chunks(self):
+        """Test a keyword straddling a search chunk boundary is still found."""
+        from forge.services.keyword_matcher import KeywordMatcher
+
+        text = 'x' * (KeywordMatcher.SEARCH_CHUNK - 3) + 'DEVELOPER' + 'y' * 10
+
+        assert KeywordMatcher(['developer']).contains_any(text)
+        assert not KeywordMatcher(['designer']).contains_any(text)
+
+
+class TestDocumentAnalysis:
+    """Tests for the single-scan document analysis behind BMADValidator."""
+
+    CONTENT = """# Prompt
+## Your Role
+You are a developer.
+### Detail
+Use {{LANGUAGE}} and {{STYLE:pep8}}.
+## Input Data
+Project [[NAME]] and {{LANGUAGE}}.
+## Output Requirements
+Return JSON.
+"""
+
+    def test_sections_and_variables(self):
+        """Test sections are matched by prefix and variables are collected once."""
+        from forge.services.document_analysis import DocumentAnalysis
+
+        analysis = DocumentAnalysis(self.CONTENT)
+
+        assert list(analysis.sections) == ['## Your Role', '## Input', '## Output Requirements']
+        assert analysis.variable_names == ['LANGUAGE', 'STYLE', 'NAME']
+        assert analysis.unreplaced_variables == ['LANGUAGE', 'NAME']
+        assert analysis.section_text('## Your Role').endswith('{{STYLE:pep8}}.')
+        assert analysis.section_text('## Context') == ''
+        assert analysis.section_word_count('## Output Requirements') == 2
+
+    def test_keywords_and_bounded_word_count(self):
+        """Test keyword lookups per section and early-stopping word counts."""
+        from forge.services.document_analysis import DocumentAnalysis
+
+        analysis = DocumentAnalysis(self.CONTENT)
+
+        assert analysis.keywords_in(['json', 'developer'], '## Output Requirements') == {'json'}
+        assert analysis.keywords_in(['json', 'developer']) == {'json', 'developer'}
+        assert analysis.word_count() == len(self.CONTENT.split())
+
+        long_analysis = DocumentAnalysis('word ' * 10000 + '\n' + 'more\n' * 2000)
+        assert 100 <= long_analysis.word_count(limit=100) < 12000
+        assert long_analysis.word_count() == 12000
+
+    def test_validator_results_match_section_scan(self):
+        """Test validate() reports the same sections and variables as the parser."""
+        from forge.services.template_parser import TemplateParser
+
+        report = BMADValidator.validate(self.CONTENT)
+
+        assert report.missing_sections == [
+            s for s in BMADValidator.REQUIRED_SECTIONS
+            if s not in TemplateParser.detect_sections(self.CONTENT)
+        ]
+        assert report.unreplaced_variables == TemplateParser.find_unreplaced_variables(self.CONTENT)
+
+
+class TestStreamingAnalysis:
+    """Tests for bounded-memory validation of streamed documents."""
+
+    CONTENT = TestDocumentAnalysis.CONTENT + """##
+Context
+
+Background for the task, at some length so the section is not minimal.
+"""
+
+    @staticmethod
+    def _pieces(text, size):
+        return [text[i:i + size] for i in range(0, len(text), size)]
+
+    def test_matches_document_analysis_for_any_split(self):
+        """Test streamed facts equal the in-memory analysis wherever chunks split."""
+        from forge.services.document_analysis import DocumentAnalysis
+        from forge.services.stream_analysis import StreamingAnalysis
+
+        expected = DocumentAnalysis(self.CONTENT)
+        for size in (1, 3, 7, 64, len(self.CONTENT)):
+            analysis = StreamingAnalysis.from_stream(
+                self._pieces(self.CONTENT, size), keywords=BMADValidator.STREAM_KEYWORDS
+            )
+            assert list(analysis.sections) == list(expected.sections)
+            assert analysis.variable_names == expected.variable_names
+            assert analysis.unreplaced_variables == expected.unreplaced_variables
+            assert analysis.word_count() == expected.word_count()
+            for section in expected.sections:
+                assert analysis.section_length(section) == expected.section_length(section)
+                assert analysis.section_word_count(section) == expected.section_word_count(section)
+            assert BMADValidator.validate_stream(self._pieces(self.CONTENT, size)) == \
+                BMADValidator.validate(self.CONTENT)
+
+    def test_decodes_bytes_split_inside_characters(self):
+        """Test UTF-8 byte chunks may split multi-byte characters."""
+        from io import BytesIO
+        from forge.services.stream_analysis import StreamingAnalysis
+
+        content = '## Your Role\nCafé owner — naïve ☕ user.\n'
+        data = content.encode('utf-8')
+        analysis = StreamingAnalysis.from_stream([data[i:i + 1] for i in range(len(data))])
+        assert analysis.length == len(content)
+        assert analysis.word_count() == len(content.split())
+
+        StreamingAnalysis.READ_SIZE, read_size = 5, StreamingAnalysis.READ_SIZE
+        try:
+            assert StreamingAnalysis.from_stream(BytesIO(data)).word_count() == analysis.word_count()
+        finally:
+            StreamingAnalysis.READ_SIZE = read_size
+
+    def test_long_lines_are_processed_in_pieces(self, monkeypatch):
+        """Test lines over MAX_LINE_LENGTH keep their words, keywords and variables."""
+        from forge.services.stream_analysis import StreamingAnalysis
+
+        monkeypatch.setattr(StreamingAnalysis, 'MAX_LINE_LENGTH', 32)
+        line = ' '.join(['word'] * 40) + ' return {{FORMAT}} as structured output'
+        content = f'## Output Requirements\n{line}\n'
+        analysis = StreamingAnalysis.from_stream(
+            self._pieces(content, 5), keywords=BMADValidator.STREAM_KEYWORDS
+        )
+
+        assert analysis.word_count() == len(content.split())
+        assert analysis.unreplaced_variables == ['FORMAT']
+        assert analysis.keywords_in(BMADValidator.FORMAT_KEYWORDS, '## Output Requirements') == {
+            'return', 'format', 'structure', 'output',
+        }
+        assert analysis.section_length('## Output Requirements') == len(line)
+
+    def test_metadata_validation_matches_in_memory(self, sample_template_content):
+        """Test validate_stream() with metadata gives the in-memory result."""
+        from forge.services.bmad_validator import MetadataAwareValidator
+
+        document = self.CONTENT.replace('{{LANGUAGE}}', 'Python')
+        for size in (1, 16, len(document)):
+            assert MetadataAwareValidator.validate_stream(
+                self._pieces(document, size), sample_template_content
+            ) == MetadataAwareValidator.validate_with_metadata(document, sample_template_content)
+
+    def test_untracked_keywords_raise(self):
+        """Test keywords must be registered before streaming."""
+        from forge.services.stream_analysis import StreamingAnalysis
+
+        analysis = StreamingAnalysis.from_stream(['## Output Requirements\nJSON\n'])
+        with pytest.raises(KeyError):
+            analysis.keywords_in(['json'], '## Output Requirements')
+
+
+class TestValidationPlan:
+    """Tests for validation plans compiled from template metadata."""
+
+    def test_plan_is_compiled_once_per_template(self, sample_template_content):
+        """Test the plan is cached on the compiled template and mirrors its metadata."""
+        from forge.services.template_parser import TemplateParser
+
+        compiled = TemplateParser.compile(sample_template_content)
+        plan = compiled.validation_plan
+
+        assert compiled.validation_plan is plan
+        assert [rule.name for rule in plan.rules] == [
+            name.replace('## ', '') for name in compiled.section_metadata
+        ]
+        for rule in plan.rules:
+            assert plan.keywords[rule.name] == rule.keywords
+
+    def test_document_sections_are_counted_without_rescanning(self, monkeypatch):
+        """Test section statistics come from the single document scan."""
+        from forge.services.document_analysis import DocumentAnalysis
+        from forge.services.template_parser import TemplateParser
+
+        analysis = DocumentAnalysis(TestDocumentAnalysis.CONTENT)
+        monkeypatch.setattr(TemplateParser, 'scan_variables', None)
+
+        role = analysis.section('Your Role', ['developer', 'python'])
+        assert role.word_count == 10  # Including the Detail subsection
+        assert role.found_keywords == {'developer'}
+        assert role.unreplaced_variables == ['LANGUAGE']
+        assert role.length == len(analysis.section_text('## Your Role'))
+        assert analysis.section('Input').unreplaced_variables == ['LANGUAGE', 'NAME']
+        assert analysis.section('Detail').word_count == 4
+        assert analysis.section('Missing') is None
+
+    def test_validation_does_not_build_section_stats(self, sample_template_content, monkeypatch):
+        """Test the plan feeds precomputed statistics to every section rule."""
+        from forge.services import section_stats
+        from forge.services.bmad_validator import MetadataAwareValidator
+        from forge.services.template_parser import TemplateParser
+
+        compiled = TemplateParser.compile(sample_template_content)
+        document = TestStreamingAnalysis.CONTENT
+        expected = MetadataAwareValidator._validate_with_metadata(document, compiled)
+
+        def fail(*args, **kwargs):
+            raise AssertionError('section text was rescanned')
+
+        monkeypatch.setattr(section_stats, 'SectionStats', fail)
+        assert MetadataAwareValidator._validate_with_metadata(document, compiled) == expected
+        assert expected.variable_results
+
+
+class TestFrontmatterParser:
+    """Tests for frontmatter extraction and the restricted-schema fast path."""
+
+    DOCUMENT = '''name: demo
+version: 1.0
+roles:
+  - pm
+  - analyst
+sections:
+  "Your Role":
+    required: true
+    min_words: 20
+    keywords_required: ["product", 'user''s']
+    examples:
+      - "Act as a \\"PM\\""
+  Input:
+    structured_fields:
+      - name: scope
+        options: [Small, Medium, ~]
+      - name: notes
+        required: off
+variables:
+  NAME:
+    validation: "^[A-Z][a-z0-9\\\\s]*$"
+    default:
+'''
+
+    def test_split_stops_at_closing_delimiter(self):
+        """Test the frontmatter block is split from the body without touching the rest."""
+        from forge.services.frontmatter import FrontmatterParser
+
+        assert FrontmatterParser.split('---\na: 1\n  ---  \nBody\n---\nMore') == ('a: 1\n', 'Body\n---\nMore')
+        assert FrontmatterParser.split('---\na: 1\nBody') is None
+        assert FrontmatterParser.split('# Title\n---\n') is None
+
+    def test_parse_simple_matches_yaml(self):
+        """Test the fast path produces exactly what yaml.safe_load produces."""
+        import yaml
+        from forge.services.frontmatter import FrontmatterParser
+
+        assert FrontmatterParser.parse_simple(self.DOCUMENT) == yaml.safe_load(self.DOCUMENT)
+        assert FrontmatterParser.parse_simple('# only a comment\n') is None
+
+    def test_unsupported_syntax_falls_back_to_yaml(self):
+        """Test YAML outside the restricted schema is parsed by the full loader."""
+        import yaml
+        from forge.services.frontmatter import FrontmatterParser, UnsupportedSyntax
+
+        for text in ('text: |\n  block\n', 'when: 2024-01-01\n', 'a: &x 1\nb: *x\n', 'mode: 0755\n'):
+            with pytest.raises(UnsupportedSyntax):
+                FrontmatterParser.parse_simple(text)
+            assert FrontmatterParser.load(text) == yaml.safe_load(text)
+
+        with pytest.raises(yaml.YAMLError):
+            FrontmatterParser.load('a: [1, 2\n')
+
+    def test_shipped_templates_take_fast_path(self):
+        """Test every bundled template parses on the fast path, identically to YAML."""
+        import glob
+        import os
+        import yaml
+        from forge.services.frontmatter import FrontmatterParser
+
+        template_root = os.path.join(os.path.dirname(__file__), '..', 'forge', 'templates')
+        paths = glob.glob(os.path.join(template_root, '**', '*.md'), recursive=True)
+        assert paths
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                split = FrontmatterParser.split(f.read())
+            if split is not None:
+                assert FrontmatterParser.parse_simple(split[0]) == yaml.safe_load(split[0]), path
+
+
+class TestValidationCache:
+    """Tests for the content-hash keyed validation result cache."""
+
+    CONTENT = """## Your Role
+You are a developer.
+## Input
+The {{PROJECT}} repository.
+## Output Requirements
+Return a Markdown report.
+"""
+
+    def test_repeated_validation_hits_local_cache(self):
+        """Test identical content is validated once and hits return private copies."""
+        from forge.services.validation_cache import ValidationCache
+
+        ValidationCache.clear()
+        first = BMADValidator.validate(self.CONTENT)
+        first.notes.append('mutated by caller')
+        second = BMADValidator.validate(self.CONTENT)
+
+        stats = ValidationCache.stats()
+        assert (stats['misses'], stats['hits']) == (1, 1)
+        assert 'mutated by caller' not in second.notes
+        assert second.unreplaced_variables == ['PROJECT']
+
+    def test_incremental_section_validation_bypasses_cache(self, monkeypatch):
+        """Test validations given live SectionStats neither hash the section nor touch the cache."""
+        from forge.services import DocumentGenerator
+        from forge.services.section_stats import SectionStats
+        from forge.services.validation_cache import ValidationCache
+
+        content = 'You are a senior developer writing {{PROJECT}} code.'
+        stats = SectionStats(content, DocumentGenerator.section_keywords('Your Role', None))
+        monkeypatch.setattr(
+            ValidationCache, 'get_or_compute', lambda *args, **kwargs: pytest.fail('cache used')
+        )
+
+        result = DocumentGenerator.validate_section_with_metadata(
+            'Your Role', content, self.CONTENT, stats=stats
+        )
+        assert result.unreplaced_variables == ('PROJECT',)
+
+    def test_keys_separate_validators_versions_and_templates(self):
+        """Test the key changes with validator, version, template hash and content."""
+        from forge.services.validation_cache import ValidationCache
+
+        key = ValidationCache.make_key('bmad', 1, 'text')
+
+        assert ValidationCache.make_key('compliance', 1, 'text') != key
+        assert ValidationCache.make_key('bmad', 2, 'text') != key
+        assert ValidationCache.make_key('bmad', 1, 'text', template_hash='abc') != key
+        assert ValidationCache.make_key('bmad', 1, 'text ') != key
+
+    def test_shared_cache_serves_other_processes(self, monkeypatch):
+        """Test a result stored in the Django cache is found after the local LRU is emptied."""
+        from django.test import override_settings
+        from forge.services import DocumentGenerator
+        from forge.services.validation_cache import ValidationCache
+
+        locmem = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        with override_settings(CACHES=locmem):
+            ValidationCache.clear()
+            expected = DocumentGenerator.validate_document_compliance(self.CONTENT)
+            ValidationCache.clear()
+            calls = []
+            monkeypatch.setattr(
+                DocumentGenerator, '_validate_document_compliance',
+                classmethod(lambda cls, content: calls.append(content)),
+            )
+            assert DocumentGenerator.validate_document_compliance(self.CONTENT) == expected
+
+        assert calls == []
+        assert ValidationCache.stats()['shared_hits'] == 1
+
+    def test_disabled_cache_always_validates(self):
+        """Test VALIDATION_CACHE_ENABLED=False bypasses both cache levels."""
+        from django.test import override_settings
+        from forge.services.validation_cache import ValidationCache
+
+        ValidationCache.clear()
+        with override_settings(VALIDATION_CACHE_ENABLED=False):
+            BMADValidator.validate(self.CONTENT)
+            BMADValidator.validate(self.CONTENT)
+
+        assert ValidationCache.stats()['hits'] == 0
+
+
+class TestTemplateLinter:
+    """Tests for TemplateLinter."""
+
+    def test_lint_clean_template(self, sample_template_content):
+        """Test a well-formed template lints clean."""
+        result = TemplateLinter.lint(sample_template_content)
+
+        assert result.status == 'ok'
+        assert result.errors == ()
+        assert result.warnings == ()
+
+    def test_lint_reports_frontmatter_and_pattern_problems(self, invalid_template_content):
+        """Test structure, frontmatter and pattern problems are reported by severity."""
+        broken_yaml = '---\nvariables: [unclosed\n---\n' + invalid_template_content
+        patterns = (
+            '---\nvariables:\n  SLUG:\n    validation: "^(a|aa)+$"\n'
+            "  WORDS:\n    validation: '^(\\w+\\s?){1,50}$'\n"
+            '  CODE:\n    validation: "[unclosed"\n---\n## Your Role\n{{SLUG}} {{WORDS}} {{CODE}}\n'
+        )
+
+        structure = TemplateLinter.lint(invalid_template_content)
+        frontmatter = TemplateLinter.lint(broken_yaml)
+        scalar = TemplateLinter.lint('---\njust text\n---\n## Your Role\n')
+        result = TemplateLinter.lint(patterns)
+
+        assert structure.status == 'error'
+        assert structure.errors[0].startswith('Missing required sections')
+        assert any(e.startswith('Frontmatter is not valid YAML') for e in frontmatter.errors)
+        assert 'Frontmatter is not a mapping; its metadata is ignored' in scalar.errors
+        assert any("variable 'CODE' does not compile" in e for e in result.errors)
+        assert result.warnings == (
+            "Validation pattern of variable 'SLUG' has alternation inside a quantifier",
+            "Validation pattern of variable 'WORDS' has nested quantifiers",
+        )
+
+    def test_lint_many_in_pool_matches_in_process(self, sample_template_content, invalid_template_content):
+        """Test pooled linting returns the in-process results in input order."""
+        contents = [sample_template_content, invalid_template_content] * TemplateLinter.MIN_PARALLEL_BATCH
+
+        pooled = TemplateLinter.lint_many(contents, workers=2)
+
+        assert pooled == TemplateLinter.lint_many(contents, workers=1)
+        assert [r.status for r in pooled[:2]] == ['ok', 'error']
+
+
+class TestTypeaheadIndex:
+    """Tests for the in-process typeahead index."""
+
+    @pytest.fixture
+    def index(self):
+        return TypeaheadIndex([
+            TypeaheadEntry(1, 'Product Requirements', 'Capture scope for a release', ('pm',), 'planning', ('product_name',)),
+            TypeaheadEntry(2, 'Architecture Overview', 'System design for the product', ('architect',), 'solutioning', ('service_list',)),
+            TypeaheadEntry(3, 'Story Draft', 'Implementation notes', ('sm', 'developer'), 'development', ('story_id',)),
+        ])
+
+    def test_prefixes_and_typos_match(self, index):
+        """Test partly typed and slightly misspelled words find templates."""
+        assert [e.id for e in index.search('arch')] == [2]
+        assert [e.id for e in index.search('architecure')] == [2]
+        assert index.search('zzz') == []
+        assert index.search('  ') == []
+
+    def test_title_matches_rank_above_description_matches(self, index):
+        """Test the field a match comes from weighs into its rank."""
+        assert [e.id for e in index.search('product')] == [1, 2]
+
+    def test_roles_variables_and_filters(self, index):
+        """Test roles and variable names are indexed and filters apply in memory."""
+        assert [e.id for e in index.search('story')] == [3]
+        assert [e.id for e in index.search('service')] == [2]
+        assert [e.id for e in index.search('developer')] == [3]
+        assert index.search('product', role='architect')[0].id == 2
+        assert index.search('product', workflow_phase='development') == []
+        assert len(index.search('product', limit=1)) == 1
+
+
+class TestOutputStore:
+    """Tests for the chunked output encoding."""
+
+    def test_split_at_sections_and_size_limit(self, monkeypatch):
+        """Test outputs split before headings, long sections at line breaks, losslessly."""
+        from forge.services.output_store import OutputStore
+        text = 'Intro\n## Your Role\nDev\n### Detail\nx\n#hashtag stays\n'
+
+        assert OutputStore.split(text) == ['Intro\n', '## Your Role\nDev\n', '### Detail\nx\n#hashtag stays\n']
+        assert OutputStore.split('') == []
+
+        monkeypatch.setattr(OutputStore, 'MAX_CHUNK_CHARS', 8)
+        assert OutputStore.split('line one\nline two\n') == ['line one', '\n', 'line two', '\n']
+        assert ''.join(OutputStore.split('abc\ndefghijklmnop')) == 'abc\ndefghijklmnop'
+
+    def test_encode_compresses_only_when_smaller(self):
+        """Test chunks are compressed when it pays off and decode to the original text."""
+        from forge.services.output_store import OutputStore
+        repetitive = 'Provide a comprehensive plan. ' * 40
+        short = 'é'
+
+        packed = OutputStore.encode(repetitive)
+        raw = OutputStore.encode(short)
+
+        assert packed.compressed and len(packed.data) < packed.size
+        assert not raw.compressed and raw.size == 2
+        assert OutputStore.decode(packed.data, packed.compressed) == repetitive
+        assert OutputStore.decode(raw.data, raw.compressed) == short
+        assert packed.digest == OutputStore.encode(repetitive).digest
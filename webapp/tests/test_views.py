@@ -7,7 +7,7 @@ from django.urls import reverse
 from django.test import override_settings
 from django.core.management import call_command
 from io import StringIO
-from forge.models import Template, GeneratedPrompt
+from forge.models import Template, TemplateHealth, GeneratedPrompt
 
 
 @pytest.mark.django_db
@@ -46,6 +46,25 @@ class TestTemplateListView:
         
         assert response.status_code == 200
     
+    def test_template_list_loads_catalogue_columns_only(self, client):
+        """Test list pages defer template bodies and show the precomputed summary."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        Template.objects.create(
+            title='Large Template',
+            content='## Your Role\nYou review {{code}}.\n' + 'filler ' * 5000,
+            agent_role='developer',
+            workflow_phase='development',
+        )
+
+        for name in ('forge:template_list', 'forge:generate_document_select'):
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(reverse(name))
+            content = response.content.decode()
+            assert '1 variable, 5006 words' in content
+            assert 'You review {{code}}. filler' in content
+            assert not any('"content"' in q['sql'] for q in queries.captured_queries)
+
     def test_template_list_with_templates(self, client):
         """Test template list shows templates."""
         Template.objects.create(
@@ -102,6 +121,33 @@ class TestTemplateListView:
         
         assert 'Authentication Template' in content
     
+    def test_template_search_is_ranked_and_follows_changes(self, client):
+        """Test full-text search ranks title matches first and tracks saves and deletes."""
+        body = Template.objects.create(
+            title='Deployment Checklist',
+            content='Review the kubernetes manifests.',
+            agent_role='developer',
+            workflow_phase='development',
+        )
+        title = Template.objects.create(
+            title='Kubernetes Rollout',
+            content='Plan the rollout.',
+            agent_role='architect',
+            workflow_phase='planning',
+        )
+        url = reverse('forge:template_list')
+
+        assert list(client.get(url + '?search=kubernetes').context['templates']) == [title, body]
+        assert list(client.get(url + '?search=kube+manifest').context['templates']) == [body]
+        assert list(client.get(url + '?search="*"').context['templates']) == []
+
+        body.content = 'Nothing relevant.'
+        body.save()
+        title.delete()
+        assert list(client.get(url + '?search=kubernetes').context['templates']) == []
+        response = client.get(reverse('forge:generate_document_select') + '?search=relevant')
+        assert list(response.context['templates']) == [body]
+
     def test_template_filter_by_role_with_multi_roles(self, client):
         """Test filtering templates by role when templates have multiple roles."""
         # Create a template with multiple roles where 'architect' is secondary
@@ -256,6 +302,104 @@ class TestDashboardMultiRoles:
         assert templates_by_role.get('architect', 0) >= 1
 
 
+@pytest.mark.django_db
+class TestDashboardStats:
+    """Tests for the materialized dashboard statistics."""
+
+    def test_counters_follow_template_and_prompt_changes(self, client, django_assert_num_queries):
+        """Saves and deletes adjust the counters the dashboard shows."""
+        from forge.services.dashboard_stats import DashboardStats
+        multi = Template.objects.create(
+            title='Multi', content='test', agent_role='developer',
+            agent_roles=['developer', 'architect'], workflow_phase='development',
+        )
+        analyst = Template.objects.create(
+            title='Analyst', content='test', agent_role='analyst', workflow_phase='planning',
+        )
+        GeneratedPrompt.objects.create(template=analyst, input_data={}, final_output='one')
+        GeneratedPrompt.objects.create(template=multi, input_data={}, final_output='two')
+        multi.agent_roles = ['developer', 'qa']
+        multi.save()
+        analyst.is_active = False
+        analyst.save()
+
+        context = client.get(reverse('forge:dashboard')).context
+        assert context['total_templates'] == 1
+        assert context['templates_by_role'] == {'developer': 1, 'qa': 1}
+        assert context['templates_by_phase'] == {'development': 1}
+        assert context['total_prompts'] == 2
+        assert [p.template.title for p in context['recent_prompts']] == ['Multi', 'Analyst']
+
+        multi.delete()
+        with django_assert_num_queries(3):
+            snapshot = DashboardStats.build()
+        assert snapshot['total_templates'] == 0
+        assert snapshot['templates_by_role'] == {}
+        assert snapshot['total_prompts'] == 1
+        assert snapshot['recent_templates'] == []
+
+    def test_cascading_deletes_adjust_counters_once(self):
+        """Deleting a template with many prompts updates each counter once, not per prompt."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from forge.services.dashboard_stats import DashboardStats
+
+        def counter_updates(queries):
+            return [q for q in queries if q['sql'].startswith('UPDATE') and 'dashboardstat' in q['sql']]
+
+        keep = Template.objects.create(
+            title='Keep', content='test', agent_role='analyst', workflow_phase='planning',
+        )
+        doomed = Template.objects.create(
+            title='Doomed', content='test', agent_role='developer', workflow_phase='development',
+        )
+        for i in range(6):
+            GeneratedPrompt.objects.create(template=doomed, input_data={}, final_output=f'out {i}')
+            GeneratedPrompt.objects.create(template=keep, input_data={}, final_output=f'out {i}')
+
+        with CaptureQueriesContext(connection) as queries:
+            doomed.delete()
+        # prompts total, active templates, the phase and the role
+        assert len(counter_updates(queries)) == 4
+
+        with CaptureQueriesContext(connection) as queries:
+            GeneratedPrompt.objects.filter(template=keep).delete()
+        assert len(counter_updates(queries)) == 1
+
+        snapshot = DashboardStats.build()
+        assert (snapshot['total_templates'], snapshot['total_prompts']) == (1, 0)
+        assert snapshot['templates_by_role'] == {'analyst': 1}
+
+    def test_snapshot_is_cached_until_a_change(self, django_assert_num_queries, django_capture_on_commit_callbacks):
+        """The snapshot is served from the cache and dropped when data changes."""
+        from forge.services.dashboard_stats import DashboardStats
+        cache = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        with override_settings(CACHES=cache):
+            DashboardStats.get()
+            with django_assert_num_queries(0):
+                assert DashboardStats.get()['total_templates'] == 0
+            with django_capture_on_commit_callbacks(execute=True):
+                Template.objects.create(
+                    title='Dev', content='test', agent_role='developer', workflow_phase='development',
+                )
+            assert DashboardStats.get()['total_templates'] == 1
+
+    def test_recount_command_repairs_drift(self):
+        """Changes that bypass signals are corrected by a recount."""
+        Template.objects.create(
+            title='Dev', content='test', agent_role='developer', workflow_phase='development',
+        )
+        Template.objects.update(workflow_phase='planning')
+        out = StringIO()
+
+        call_command('recount_dashboard_stats', stdout=out)
+
+        from forge.services.dashboard_stats import DashboardStats
+        assert DashboardStats.build()['templates_by_phase'] == {'planning': 1}
+        assert 'Active templates: 1' in out.getvalue()
+        assert 'Phases: planning 1' in out.getvalue()
+
+
 @pytest.mark.django_db
 class TestPromptFormView:
     """Tests for the prompt generation form view."""
@@ -335,6 +479,23 @@ class TestPromptResultView:
         content = response.content.decode()
         
         assert 'Invalid' in content or 'Needs Review' in content
+    
+    def test_prompt_result_renders_from_snapshot(self, client, monkeypatch):
+        """Test the result page reads the stored report instead of re-validating."""
+        from forge.services import BMADValidator
+        
+        template = Template.objects.create(
+            title='Test', content='test', agent_role='developer', workflow_phase='development',
+        )
+        prompt = GeneratedPrompt.objects.create(
+            template=template, input_data={}, final_output='Text with {{topic}}',
+        )
+        monkeypatch.setattr(BMADValidator, 'validate', classmethod(lambda cls, content: 1 / 0))
+        
+        response = client.get(reverse('forge:prompt_result', args=[prompt.id]))
+        
+        assert response.status_code == 200
+        assert response.context['validation_details'].unreplaced_variables == ['topic']
 
 
 @pytest.mark.django_db
@@ -378,6 +539,52 @@ class TestPromptHistoryView:
         content = response.content.decode()
         
         assert 'Test' in content
+    def test_history_pages_by_cursor_with_status_filter(self, client):
+        """Test cursors walk the filtered history both ways without counting rows."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from django.utils import timezone
+        template = Template.objects.create(
+            title='Test', content='test', agent_role='developer', workflow_phase='development',
+        )
+        GeneratedPrompt.objects.bulk_create(
+            GeneratedPrompt(template=template, input_data={}, is_valid=i % 3 != 0)
+            for i in range(60)
+        )
+        # Ties on created_at are broken by id
+        GeneratedPrompt.objects.filter(pk__lte=GeneratedPrompt.objects.order_by('pk')[30].pk).update(
+            created_at=timezone.now()
+        )
+        expected = list(
+            GeneratedPrompt.objects.filter(is_valid=True).order_by('-created_at', '-id').values_list('pk', flat=True)
+        )
+        url = reverse('forge:prompt_history')
+
+        seen, pages, params = [], [], {'status': 'valid'}
+        while True:
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url, params)
+            page = response.context['page_obj']
+            seen.extend(p.pk for p in page)
+            pages.append(page)
+            assert not any('COUNT(' in q['sql'] for q in queries.captured_queries)
+            # Template bodies are never read just to show titles
+            assert not any('"forge_template"."content"' in q['sql'] for q in queries.captured_queries)
+            assert not any('parsed_structure' in q['sql'] for q in queries.captured_queries)
+            if not page.has_next():
+                break
+            params = {'status': 'valid', 'cursor': page.next_cursor}
+
+        assert seen == expected
+        assert [len(p) for p in pages] == [20, 20]
+        assert 'status=valid' in response.content.decode()
+
+        back = client.get(url, {'status': 'valid', 'cursor': pages[-1].previous_cursor}).context['page_obj']
+        assert [p.pk for p in back] == expected[:20]
+        assert not back.has_previous()
+        last = client.get(url, {'status': 'valid', 'cursor': pages[0].last_cursor}).context['page_obj']
+        assert [p.pk for p in last] == expected[-20:]
+        assert client.get(url, {'cursor': 'not-a-cursor'}).status_code == 404
 
 
 @pytest.mark.django_db
@@ -404,6 +611,66 @@ class TestGenerateDocumentSelectView:
         content = response.content.decode()
         
         assert 'Test Template' in content
+    
+    def test_generate_document_select_pages_by_cursor(self, client):
+        """Test the template list pages in list order by cursor and keeps numbered search pages."""
+        for i in range(15):
+            Template.objects.create(
+                title=f'Template {i:02d}', content='test',
+                agent_role='developer' if i % 2 else 'analyst', workflow_phase='development',
+            )
+        expected = list(
+            Template.objects.order_by('agent_role', 'workflow_phase', 'title', 'id').values_list('title', flat=True)
+        )
+        url = reverse('forge:generate_document_select')
+
+        first = client.get(url).context['page_obj']
+        second = client.get(url, {'cursor': first.next_cursor}).context['page_obj']
+
+        assert [t.title for t in first] + [t.title for t in second] == expected
+        assert not second.has_next()
+        assert client.get(url, {'search': 'template'}).context['page_obj'].number == 1
+
+
+@pytest.mark.django_db
+class TestTemplateTypeahead:
+    """Tests for the typeahead template lookup endpoint."""
+
+    def test_typeahead_answers_without_queries(self, client, django_assert_num_queries):
+        """Test matches are served from the in-process index."""
+        from forge.services.typeahead import TypeaheadIndex
+        template = Template.objects.create(
+            title='Architecture Overview', content='## Your Role\n{{service_list}}',
+            agent_role='architect', workflow_phase='solutioning',
+        )
+        Template.objects.create(
+            title='Retired Architecture', content='test', agent_role='architect',
+            workflow_phase='solutioning', is_active=False,
+        )
+        TypeaheadIndex.refresh()
+
+        with django_assert_num_queries(0):
+            response = client.get(reverse('forge:template_typeahead'), {'q': 'archi', 'limit': '5'})
+
+        data = response.json()
+        assert data['query'] == 'archi'
+        assert [r['title'] for r in data['results']] == ['Architecture Overview']
+        assert data['results'][0]['wizard_url'] == reverse('forge:generate_document_wizard', args=[template.pk])
+        assert client.get(reverse('forge:template_typeahead'), {'q': 'archi', 'agent_role': 'pm'}).json()['results'] == []
+        assert client.get(reverse('forge:template_typeahead'), {'q': 'archi', 'limit': 'x'}).status_code == 400
+
+    def test_typeahead_index_follows_template_changes(self, client, django_capture_on_commit_callbacks):
+        """Test saved templates appear once the index is rebuilt after commit."""
+        from forge.services.typeahead import TypeaheadIndex
+        TypeaheadIndex.refresh()
+        with django_capture_on_commit_callbacks(execute=True):
+            Template.objects.create(
+                title='Deployment Runbook', content='test', agent_role='devops', workflow_phase='development',
+            )
+
+        response = client.get(reverse('forge:template_typeahead'), {'q': 'runbo'})
+
+        assert [r['title'] for r in response.json()['results']] == ['Deployment Runbook']
 
 
 @pytest.mark.django_db
@@ -482,6 +749,85 @@ class TestGenerateDocumentWizardView:
         assert response.status_code == 302
         assert GeneratedPrompt.objects.filter(template=template).exists()
 
+    def test_realtime_validation_accepts_edit_deltas(self, client):
+        """Test the validate endpoint applies deltas against the stored copy."""
+        import json
+        from unittest.mock import ANY
+
+        template = Template.objects.create(
+            title='Realtime Template',
+            content='## Your Role\nYou are a developer.\n\n## Input\nTask description.',
+            agent_role='developer',
+            workflow_phase='development',
+        )
+        url = reverse('forge:validate_section_realtime', args=[template.id])
+
+        first = client.post(url, json.dumps({
+            'section_name': 'Your Role',
+            'content': 'You are a {{role}}.\nShort.',
+        }), content_type='application/json').json()
+        assert first['unreplaced_variables'] == ['role']
+        assert first['word_count'] == 5
+
+        second = client.post(url, json.dumps({
+            'section_name': 'Your Role',
+            'delta': {'start': 10, 'end': 18, 'text': 'senior expert'},
+            'revision': first['revision'],
+            'length': len('You are a senior expert.\nShort.'),
+        }), content_type='application/json').json()
+        assert second['revision'] == first['revision'] + 1
+        assert second['unreplaced_variables'] == []
+        assert second['word_count'] == 6
+        # Only the revision and a cache token are kept in the session
+        index = client.session['section_validation']
+        assert index == {f'{template.id}:Your Role': {'revision': second['revision'], 'token': ANY}}
+
+        stale = client.post(url, json.dumps({
+            'section_name': 'Your Role',
+            'delta': {'start': 0, 'end': 0, 'text': 'x'},
+            'revision': first['revision'],
+        }), content_type='application/json')
+        assert stale.status_code == 409
+        assert stale.json()['resync'] is True
+
+    def test_validate_document_streams_uploads_bodies_and_stored_prompts(self, client):
+        """Test the validate-document endpoint accepts every document source."""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        template = Template.objects.create(
+            title='Validate Document Template',
+            content='## Your Role\nYou are a developer.\n\n## Input\nTask description.',
+            agent_role='developer',
+            workflow_phase='development',
+        )
+        url = reverse('forge:validate_document', args=[template.id])
+        document = (
+            '## Your Role\nYou are a senior developer.\n\n'
+            '## Input\nRefactor the {{module}} module.\n\n'
+            '## Output Requirements\nReturn a unified diff in markdown format.\n'
+        )
+
+        uploaded = client.post(url, {
+            'document': SimpleUploadedFile('doc.md', document.encode(), 'text/markdown'),
+        }).json()
+        assert uploaded['bmad']['unreplaced_variables'] == ['module']
+        assert uploaded['bmad']['missing_sections'] == []
+        assert uploaded['metadata']['variable_results'][0]['variable_name'] == 'module'
+        assert uploaded['characters'] == len(document)
+
+        raw = client.post(url, document, content_type='text/markdown').json()
+        assert raw == uploaded
+
+        prompt = GeneratedPrompt.objects.create(
+            template=template, input_data={}, final_output=document
+        )
+        stored = client.post(f'{url}?prompt={prompt.id}').json()
+        assert stored == uploaded
+
+        assert client.post(url, {'other': 'x'}).status_code == 400
+        assert client.post(f'{url}?prompt=abc').status_code == 400
+        assert client.get(url).status_code == 405
+
 
 @pytest.mark.django_db
 class TestHealthCheckView:
@@ -506,6 +852,13 @@ class TestHealthCheckView:
         assert 'app' in data
         assert 'version' in data
 
+    def test_health_check_reports_validation_cache_counters(self, client):
+        """Health check exposes the validation cache hit/miss counters."""
+        response = client.get(reverse('forge:health_check'))
+
+        stats = response.json()['validation_cache']
+        assert {'hits', 'misses', 'shared_hits', 'shared_misses'} <= set(stats)
+
     @override_settings(
         DEBUG=True,
         CACHES={
@@ -569,3 +922,230 @@ class TestHealthCheckManagementCommand:
         assert exc_info.value.code == 0
         output = out.getvalue()
         assert 'Cache: OK' in output
+
+
+@pytest.mark.django_db
+class TestRevalidatePromptsCommand:
+    """Tests for the revalidate_prompts management command."""
+
+    VALID_OUTPUT = "## Your Role\nDeveloper\n\n## Input\nTask\n\n## Output Requirements\nFormat"
+
+    def create_prompts(self):
+        developer = Template.objects.create(
+            title='Dev', content='test', agent_role='developer', workflow_phase='development',
+        )
+        analyst = Template.objects.create(
+            title='Analyst', content='test', agent_role='analyst', workflow_phase='planning',
+        )
+        stale = GeneratedPrompt.objects.create(
+            template=developer, input_data={}, final_output=self.VALID_OUTPUT, is_valid=False,
+            validation_notes=['Outdated note'],
+        )
+        invalid = GeneratedPrompt.objects.create(
+            template=developer, input_data={}, final_output='Just some text', is_valid=True,
+        )
+        other = GeneratedPrompt.objects.create(
+            template=analyst, input_data={}, final_output='Just some text', is_valid=True,
+        )
+        return stale, invalid, other
+
+    def test_revalidates_and_writes_changed_rows(self):
+        """Stored results are replaced with the current validation outcome."""
+        stale, invalid, other = self.create_prompts()
+        out = StringIO()
+
+        call_command('revalidate_prompts', '--workers', '1', '--batch-size', '2', stdout=out)
+
+        for prompt in (stale, invalid, other):
+            prompt.refresh_from_db()
+        assert stale.is_valid is True
+        assert invalid.is_valid is False
+        assert other.is_valid is False
+        assert invalid.validation_notes
+        output = out.getvalue()
+        assert 'Re-validated 3 prompt(s)' in output
+        assert 'Changed: 3' in output
+
+    def test_filters_and_resume(self, tmp_path):
+        """Role filters, dry runs and checkpoints limit the rows processed."""
+        stale, invalid, other = self.create_prompts()
+
+        out = StringIO()
+        call_command('revalidate_prompts', '--workers', '1', '--role', 'analyst', '--dry-run', stdout=out)
+        other.refresh_from_db()
+        assert other.is_valid is True
+        assert 'Re-validated 1 prompt(s)' in out.getvalue()
+
+        checkpoint = tmp_path / 'revalidate.ckpt'
+        checkpoint.write_text(str(stale.pk))
+        out = StringIO()
+        call_command(
+            'revalidate_prompts', '--workers', '1', '--checkpoint-file', str(checkpoint), stdout=out
+        )
+        stale.refresh_from_db()
+        invalid.refresh_from_db()
+        assert stale.is_valid is False
+        assert invalid.is_valid is False
+        assert checkpoint.read_text() == str(other.pk)
+        assert 'Re-validated 2 prompt(s)' in out.getvalue()
+
+
+@pytest.mark.django_db
+class TestLintTemplatesCommand:
+    """Tests for the lint_templates management command and template health display."""
+
+    def test_lint_templates_stores_health_shown_in_list(self, client):
+        """Health records are written once per content and shown on the template list."""
+        Template.objects.create(
+            title='Broken Template', content='No sections here', agent_role='analyst', workflow_phase='planning',
+        )
+        out = StringIO()
+
+        call_command('lint_templates', '--workers', '1', '--verbose', stdout=out)
+
+        output = out.getvalue()
+        assert 'Linted 1 template(s)' in output
+        assert 'Errors: 1' in output
+        assert 'Error: Missing required sections' in output
+        assert TemplateHealth.objects.get().status == 'error'
+        response = client.get(reverse('forge:template_list'))
+        assert '1 lint error' in response.content.decode()
+
+        out = StringIO()
+        call_command('lint_templates', '--workers', '1', stdout=out)
+        assert 'Linted 0 template(s)' in out.getvalue()
+        assert '(1 unchanged, skipped)' in out.getvalue()
+
+
+@pytest.mark.django_db
+class TestRebuildSearchIndexCommand:
+    """Tests for the rebuild_search_index management command."""
+
+    def test_rebuild_picks_up_changes_that_bypassed_signals(self):
+        """Bulk updates are searchable after a rebuild."""
+        from forge.services.template_search import TemplateSearch
+        Template.objects.create(
+            title='Dev', content='test', agent_role='developer', workflow_phase='development',
+        )
+        Template.objects.update(content='observability runbook')
+        out = StringIO()
+
+        assert not TemplateSearch.search(Template.objects.all(), 'runbook').exists()
+        call_command('rebuild_search_index', stdout=out)
+
+        assert TemplateSearch.search(Template.objects.all(), 'runbook').count() == 1
+        assert 'Rebuilt the SQLite FTS5 search index' in out.getvalue()
+
+
+
+@pytest.mark.django_db
+class TestOutputStorageReportCommand:
+    """Tests for the output_storage_report management command."""
+
+    def test_report_and_delete_unused(self, client):
+        """Shared sections are counted once and unused chunks can be deleted."""
+        template = Template.objects.create(
+            title='Dev', content='test', agent_role='developer', workflow_phase='development',
+        )
+        scaffold = '## Output Requirements\n' + 'Format the output using Markdown.\n' * 100
+        prompts = [
+            GeneratedPrompt.objects.create(
+                template=template, input_data={}, final_output=f'## Your Role\n{name}\n\n{scaffold}'
+            )
+            for name in ('Alice', 'Bob', 'Carol')
+        ]
+        response = client.get(reverse('forge:download_prompt', args=[prompts[0].pk]))
+        assert response.content.decode() == prompts[0].final_output
+
+        prompts[0].delete()
+        out = StringIO()
+        call_command('output_storage_report', '--delete-unused', stdout=out)
+
+        output = out.getvalue()
+        assert 'Deleted 1 unused chunk(s)' in output
+        assert 'Prompts: 2, chunks: 4, distinct chunks: 3' in output
+        assert 'Saved: ' in output
+
+
+@pytest.mark.django_db
+class TestArchivePromptsCommand:
+    """Tests for the archive_prompts management command."""
+
+    def create_prompts(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        template = Template.objects.create(
+            title='Dev', content='test', agent_role='developer', workflow_phase='development',
+        )
+        prompts = [
+            GeneratedPrompt.objects.create(
+                template=template, input_data={'n': i}, final_output=f'## Your Role\nOutput {i}\n',
+                is_valid=i % 2 == 0,
+            )
+            for i in range(5)
+        ]
+        old = [p.pk for p in prompts[:3]]
+        GeneratedPrompt.objects.filter(pk__in=old).update(created_at=timezone.now() - timedelta(days=400))
+        return prompts, old
+
+    def test_archives_old_prompts_and_keeps_them_viewable(self, client):
+        """Old prompts move to the archive and are still found by id and in the history."""
+        from forge.models import ArchivedPrompt, OutputBlob, TemplateRole
+        from forge.services.dashboard_stats import DashboardStats
+        prompts, old = self.create_prompts()
+        out = StringIO()
+
+        call_command('archive_prompts', '--days', '30', '--batch-size', '2', stdout=out)
+
+        assert 'Archived 3 prompt(s)' in out.getvalue()
+        assert 'in 2 batch(es)' in out.getvalue()
+        assert sorted(ArchivedPrompt.objects.values_list('pk', flat=True)) == old
+        assert not GeneratedPrompt.objects.filter(pk__in=old).exists()
+        assert OutputBlob.objects.count() == 2
+        assert DashboardStats.build()['total_prompts'] == 5
+        counts = DashboardStats.count(Template, TemplateRole, GeneratedPrompt, ArchivedPrompt)
+        assert counts[('prompts', 'total')] == 5
+
+        result = client.get(reverse('forge:prompt_result', args=[old[0]]))
+        assert result.status_code == 200
+        assert 'Output 0' in result.content.decode()
+        assert 'Archived' in result.content.decode()
+        download = client.get(reverse('forge:download_prompt', args=[old[1]]))
+        assert download.content.decode() == '## Your Role\nOutput 1\n'
+        validate_url = reverse('forge:validate_document', args=[prompts[0].template_id])
+        validated = client.post(f'{validate_url}?prompt={old[1]}')
+        assert validated.status_code == 200
+        assert validated.json()['characters'] == len('## Your Role\nOutput 1\n')
+
+        history = client.get(reverse('forge:prompt_history')).context['page_obj']
+        assert [p.pk for p in history] == [prompts[4].pk, prompts[3].pk] + old[::-1]
+        assert [p.is_archived for p in history] == [False, False, True, True, True]
+        valid = client.get(reverse('forge:prompt_history'), {'status': 'valid'}).context['page_obj']
+        assert [p.pk for p in valid] == [prompts[4].pk, old[2], old[0]]
+
+    def test_archiving_nets_out_prompt_counters(self):
+        """Archiving does not adjust the dashboard counters row by row."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from forge.services.dashboard_stats import DashboardStats
+        from forge.services.prompt_archive import PromptArchive
+        self.create_prompts()
+        before = DashboardStats.build()['total_prompts']
+
+        with CaptureQueriesContext(connection) as queries:
+            PromptArchive.archive(PromptArchive.cutoff(30))
+
+        assert not [q for q in queries if 'dashboardstat' in q['sql'].lower()]
+        assert DashboardStats.build()['total_prompts'] == before == 5
+
+    def test_dry_run_changes_nothing(self):
+        """A dry run only reports how many prompts are due."""
+        from forge.models import ArchivedPrompt
+        self.create_prompts()
+        out = StringIO()
+
+        call_command('archive_prompts', '--days', '30', '--dry-run', stdout=out)
+
+        assert '3 prompt(s) created before' in out.getvalue()
+        assert ArchivedPrompt.objects.count() == 0
+        assert GeneratedPrompt.objects.count() == 5